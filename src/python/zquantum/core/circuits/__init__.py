@@ -33,6 +33,10 @@ Examples:
     Binding parameters::
         circuit = circuit.bind({sympy.Symbol("theta"): -np.pi / 5})
 
+    Binding parameters many times, e.g. in optimization loops::
+        compiled_circuit = circuit.compile([sympy.Symbol("theta")])
+        circuit = compiled_circuit.bind(np.array([-np.pi / 5]))
+
     Iterating over circuit contents::
         for gate_op in circuit.operations:
             name = gate_op.gate.name
@@ -132,12 +136,14 @@ from ._builtin_gates import (
     Z,
     builtin_gate_by_name,
 )
-from ._circuit import Circuit, split_circuit
+from ._circuit import Circuit, CompiledCircuit, split_circuit
 from ._compatibility import new_circuit_from_old_circuit
+from ._fusion import GateFusionReport, fuse_gates
 from ._gates import (
     ControlledGate,
     CustomGateDefinition,
     Dagger,
+    FusedGate,
     Gate,
     GateOperation,
     MatrixFactoryGate,
@@ -4,12 +4,29 @@
 import operator
 from functools import reduce, singledispatch
 from itertools import groupby
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 import numpy as np
 import sympy
+from scipy.sparse.linalg import LinearOperator
 
 from . import _gates, _operations
+from ._simulation import BatchedOperation, _apply_operations_to_tensor
+from ._state_vector_tools import _to_state_tensor
+
+# Number of basis states simulated at once when computing unitaries of circuits.
+UNITARY_COLUMNS_BATCH_SIZE = 1024
 
 
 def _circuit_size_by_operations(operations):
@@ -120,13 +137,61 @@ class Circuit:
 
         For performance reasons, this method will construct numpy matrix if circuit does
         not have free parameters, and a sympy matrix otherwise.
+
+        Numpy matrices are computed without multiplying any 2^N x 2^N matrices.
+        Instead, the circuit is simulated on batches of basis states, whose final
+        states form consecutive columns of the unitary.
         """
-        # The `reversed` iterator reflects the fact the matrices are multiplied
-        # when composing linear operations (i.e. first operation is the rightmost).
-        lifted_matrices = [
-            op.lifted_matrix(self.n_qubits) for op in reversed(self.operations)
-        ]
-        return reduce(operator.matmul, lifted_matrices)
+        if self.free_symbols:
+            # The `reversed` iterator reflects the fact the matrices are multiplied
+            # when composing linear operations (i.e. first operation is the
+            # rightmost).
+            lifted_matrices = [
+                op.lifted_matrix(self.n_qubits) for op in reversed(self.operations)
+            ]
+            return reduce(operator.matmul, lifted_matrices)
+
+        dimension = 2**self.n_qubits
+        unitary = np.empty((dimension, dimension), dtype=complex)
+        for start in range(0, dimension, UNITARY_COLUMNS_BATCH_SIZE):
+            stop = min(start + UNITARY_COLUMNS_BATCH_SIZE, dimension)
+            basis_states = np.zeros((dimension, stop - start), dtype=complex)
+            basis_states[start:stop] = np.eye(stop - start)
+            unitary[:, start:stop] = self._apply_to_columns(basis_states)
+        return unitary
+
+    def to_linear_operator(self) -> LinearOperator:
+        """Create a linear operator applying this circuit to vectors on demand.
+
+        Contrary to `to_unitary`, the matrix of the circuit is never formed, which
+        makes the returned operator suitable for iterative methods that need only
+        matrix-vector products.
+
+        Raises:
+            ValueError: if the circuit has free symbols.
+        """
+        if self.free_symbols:
+            raise ValueError(
+                "Only circuits without free symbols can be converted to linear "
+                f"operators. Free symbols: {self.free_symbols}."
+            )
+        dimension = 2**self.n_qubits
+        return LinearOperator(
+            shape=(dimension, dimension),
+            dtype=complex,
+            matvec=lambda vector: self._apply_to_columns(
+                np.reshape(vector, (dimension, 1))
+            ),
+            matmat=self._apply_to_columns,
+        )
+
+    def _apply_to_columns(self, matrix: np.ndarray) -> np.ndarray:
+        tensor = np.array(matrix, dtype=complex).reshape(
+            (2,) * self.n_qubits + (matrix.shape[1],)
+        )
+        return _apply_operations_to_tensor(
+            self.operations, tensor, self.n_qubits
+        ).reshape(matrix.shape)
 
     def bind(self, symbols_map: Dict[sympy.Symbol, Any]):
         """Create a copy of the current circuit with the parameters of each gate bound
@@ -140,6 +205,17 @@ class Circuit:
             n_qubits=self.n_qubits,
         )
 
+    def compile(self, symbols_order: Sequence[sympy.Symbol]) -> "CompiledCircuit":
+        """Compile this circuit for fast evaluation with many parameter vectors.
+
+        Args:
+            symbols_order: symbols corresponding to consecutive entries of parameter
+                vectors that will be passed to the compiled circuit.
+        Returns:
+            Compiled circuit, see `CompiledCircuit` for details.
+        """
+        return CompiledCircuit(self, symbols_order)
+
     def __repr__(self):
         return (
             f"{type(self).__name__}"
@@ -148,6 +224,198 @@ class Circuit:
         )
 
 
+class CompiledCircuit:
+    """Parametrized circuit prepared for evaluation with numeric parameter vectors.
+
+    Parameters of all operations are compiled into a single numeric function once,
+    hence binding parameters doesn't involve any substitution of symbols in sympy
+    expressions. Additionally, numeric matrices of gates without free symbols are
+    computed upfront, and reused each time the compiled circuit is applied to a
+    state vector.
+
+    Use `Circuit.compile` to create instances of this class.
+
+    Args:
+        circuit: circuit to compile.
+        symbols_order: symbols corresponding to consecutive entries of parameter
+            vectors. Operations depending on symbols not present in `symbols_order`
+            are partially bound using usual symbol substitution.
+
+    Attributes:
+        circuit: circuit that has been compiled.
+        symbols: see `symbols_order` in Args.
+    """
+
+    def __init__(self, circuit: Circuit, symbols_order: Sequence[sympy.Symbol]):
+        self.circuit = circuit
+        self.symbols = tuple(symbols_order)
+
+        known_symbols = set(self.symbols)
+        self._compiled_indices: List[int] = []
+        self._partially_bound_indices: List[int] = []
+        for index, operation in enumerate(circuit.operations):
+            free_symbols = set(operation.free_symbols)
+            if not free_symbols:
+                continue
+            elif free_symbols <= known_symbols:
+                self._compiled_indices.append(index)
+            else:
+                self._partially_bound_indices.append(index)
+
+        self._evaluate_params = sympy.lambdify(
+            self.symbols,
+            [
+                list(circuit.operations[index].params)
+                for index in self._compiled_indices
+            ],
+            modules="numpy",
+        )
+        self._constant_matrices = {
+            index: _gates._gate_controlled_matrix_numpy(operation.gate)
+            for index, operation in enumerate(circuit.operations)
+            if isinstance(operation, _gates.GateOperation)
+            and not operation.free_symbols
+        }
+
+    def _bound_operations(self, parameters: np.ndarray) -> List[_operations.Operation]:
+        if len(parameters) != len(self.symbols):
+            raise ValueError(
+                f"Compiled circuit expects {len(self.symbols)} parameters, "
+                f"got {len(parameters)}."
+            )
+        operations = list(self.circuit.operations)
+
+        for index, params in zip(
+            self._compiled_indices, self._evaluate_params(*parameters)
+        ):
+            # All symbols in compiled params are known, hence conversion can't fail.
+            numeric_params = cast(
+                Tuple[_operations.Parameter, ...],
+                _gates._numeric_params(tuple(params)),
+            )
+            operations[index] = operations[index].replace_params(numeric_params)
+
+        if self._partially_bound_indices:
+            symbols_map = dict(zip(self.symbols, parameters))
+            for index in self._partially_bound_indices:
+                operations[index] = operations[index].bind(symbols_map)
+
+        return operations
+
+    def bind(self, parameters: np.ndarray) -> Circuit:
+        """Create circuit with parameters bound to given values.
+
+        The result is the same as of binding the original circuit with a symbols map
+        constructed from `self.symbols` and `parameters`, but computing it is
+        considerably faster.
+        """
+        return Circuit(
+            self._bound_operations(parameters), n_qubits=self.circuit.n_qubits
+        )
+
+    def apply(self, parameters: np.ndarray, amplitude_vector) -> np.ndarray:
+        """Apply this circuit, with given parameters, to an amplitude vector.
+
+        Args:
+            parameters: values of `self.symbols`.
+            amplitude_vector: numeric amplitudes of the initial state.
+        Returns:
+            Amplitudes of the final state.
+        """
+        if self._partially_bound_indices:
+            raise ValueError(
+                "Compiled circuit depending on symbols not present in symbols order "
+                "cannot be applied to amplitude vectors."
+            )
+        num_qubits = len(amplitude_vector).bit_length() - 1
+        tensor = _to_state_tensor(amplitude_vector, num_qubits)
+        operations = self._bound_operations(parameters)
+        _apply_operations_to_tensor(
+            operations,
+            tensor,
+            num_qubits,
+            [self._constant_matrices.get(index) for index in range(len(operations))],
+        )
+
+        return tensor.reshape(-1)
+
+    def apply_batch(
+        self, parameters_matrix: np.ndarray, amplitude_vector
+    ) -> np.ndarray:
+        """Apply this circuit, with many parameter vectors, to an amplitude vector.
+
+        All the states are evolved together, as columns of a single 2^N x K block of
+        amplitudes. Gates without free symbols are applied to the whole block at
+        once, while parametrized gates are applied using stacked matrices, one
+        per parameter vector.
+
+        Args:
+            parameters_matrix: K x P array, whose rows are values of `self.symbols`.
+            amplitude_vector: numeric amplitudes of the initial state, shared by all
+                parameter vectors.
+        Returns:
+            K x 2^N array, whose k-th row contains amplitudes of the final state
+            for k-th parameter vector.
+        """
+        if self._partially_bound_indices:
+            raise ValueError(
+                "Compiled circuit depending on symbols not present in symbols order "
+                "cannot be applied to amplitude vectors."
+            )
+        parameters_matrix = np.asarray(parameters_matrix)
+        if parameters_matrix.ndim != 2 or parameters_matrix.shape[1] != len(
+            self.symbols
+        ):
+            raise ValueError(
+                f"Compiled circuit expects parameters matrix with {len(self.symbols)} "
+                f"columns, got array of shape {parameters_matrix.shape}."
+            )
+        batch_size = parameters_matrix.shape[0]
+        num_qubits = len(amplitude_vector).bit_length() - 1
+        tensor = np.repeat(
+            np.asarray(amplitude_vector, dtype=complex)[:, np.newaxis],
+            batch_size,
+            axis=1,
+        ).reshape((2,) * num_qubits + (batch_size,))
+
+        # Params of each compiled operation, evaluated for all parameter vectors at
+        # once. Params not depending on any symbol evaluate to scalars, hence they
+        # have to be broadcast.
+        batch_params = {
+            index: np.broadcast_arrays(
+                *(np.broadcast_to(value, (batch_size,)) for value in params)
+            )
+            for index, params in zip(
+                self._compiled_indices, self._evaluate_params(*parameters_matrix.T)
+            )
+        }
+
+        operations: List[Union[_operations.Operation, BatchedOperation]] = [
+            [
+                operation.replace_params(
+                    cast(
+                        Tuple[_operations.Parameter, ...],
+                        _gates._numeric_params(
+                            tuple(param[k] for param in batch_params[index])
+                        ),
+                    )
+                )
+                for k in range(batch_size)
+            ]
+            if index in batch_params
+            else operation
+            for index, operation in enumerate(self.circuit.operations)
+        ]
+        _apply_operations_to_tensor(
+            operations,
+            tensor,
+            num_qubits,
+            [self._constant_matrices.get(index) for index in range(len(operations))],
+        )
+
+        return np.ascontiguousarray(tensor.reshape(-1, batch_size).T)
+
+
 @singledispatch
 def _append_to_circuit(other, circuit: Circuit):
     raise NotImplementedError()
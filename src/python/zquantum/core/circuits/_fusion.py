@@ -0,0 +1,128 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Gate fusion, i.e. merging runs of gates acting on few qubits into single gates."""
+from typing import List, NamedTuple, Set, Tuple
+
+from ._circuit import Circuit
+from ._gates import FusedGate, GateOperation
+from ._operations import Operation
+
+
+class GateFusionReport(NamedTuple):
+    """Summary of gate fusion performed on a circuit.
+
+    Attributes:
+        original_number_of_operations: number of operations in the original circuit.
+        fused_number_of_operations: number of operations in the fused circuit.
+        number_of_fused_gates: number of fused gates in the fused circuit. Each of
+            them replaces at least two operations of the original circuit.
+    """
+
+    original_number_of_operations: int
+    fused_number_of_operations: int
+    number_of_fused_gates: int
+
+
+class _Block:
+    """Sequence of operations to be fused, together with qubits they act on."""
+
+    def __init__(self, operations: List[GateOperation], qubits: Set[int]):
+        self.operations = operations
+        self.qubits = qubits
+
+    def to_operation(self) -> Operation:
+        if len(self.operations) == 1:
+            return self.operations[0]
+
+        qubits = sorted(self.qubits)
+        local_indices = {qubit: index for index, qubit in enumerate(qubits)}
+        return FusedGate(
+            tuple(
+                operation.gate(
+                    *[local_indices[qubit] for qubit in operation.qubit_indices]
+                )
+                for operation in self.operations
+            ),
+            len(qubits),
+        )(*qubits)
+
+
+def _is_fusable(operation: Operation, max_num_qubits: int) -> bool:
+    return (
+        isinstance(operation, GateOperation)
+        and not operation.free_symbols
+        and len(operation.qubit_indices) <= max_num_qubits
+    )
+
+
+def fuse_gates(
+    circuit: Circuit, max_num_qubits: int = 2
+) -> Tuple[Circuit, GateFusionReport]:
+    """Greedily merge consecutive gates acting on few qubits into fused gates.
+
+    The circuit is traversed in order, and each gate without free symbols is appended
+    to a block of gates acting on the qubits it touches, as long as the total number
+    of qubits in the block doesn't exceed `max_num_qubits`. Otherwise, blocks
+    touching the gate are closed and the gate starts a new block. Operations that
+    cannot be fused (e.g. the ones with free symbols) close all the blocks acting
+    on their qubits. Each closed block comprising more than one operation is
+    replaced by a single operation of `FusedGate`.
+
+    Args:
+        circuit: circuit to fuse.
+        max_num_qubits: maximum number of qubits a fused gate can act on.
+    Returns:
+        Tuple (fused circuit, report), where fused circuit is equivalent to
+        the original one.
+    """
+    if max_num_qubits < 1:
+        raise ValueError(
+            f"Fused gates have to act on at least one qubit, got {max_num_qubits}."
+        )
+
+    fused_operations: List[Operation] = []
+    open_blocks: List[_Block] = []
+    number_of_fused_gates = 0
+
+    def _close(blocks: List[_Block]):
+        nonlocal number_of_fused_gates
+        for block in blocks:
+            fused_operations.append(block.to_operation())
+            number_of_fused_gates += len(block.operations) > 1
+            open_blocks.remove(block)
+
+    for operation in circuit.operations:
+        qubits = set(getattr(operation, "qubit_indices", range(circuit.n_qubits)))
+        touching_blocks = [block for block in open_blocks if block.qubits & qubits]
+
+        if not _is_fusable(operation, max_num_qubits):
+            _close(touching_blocks)
+            fused_operations.append(operation)
+            continue
+
+        merged_qubits = qubits.union(*(block.qubits for block in touching_blocks))
+        if len(merged_qubits) <= max_num_qubits:
+            # Open blocks act on disjoint sets of qubits, so operations comprising
+            # them commute and can be concatenated in any order.
+            merged_block = _Block(
+                [op for block in touching_blocks for op in block.operations]
+                + [operation],
+                merged_qubits,
+            )
+            for block in touching_blocks:
+                open_blocks.remove(block)
+        else:
+            _close(touching_blocks)
+            merged_block = _Block([operation], qubits)
+
+        open_blocks.append(merged_block)
+
+    _close(list(open_blocks))
+
+    fused_circuit = Circuit(fused_operations, n_qubits=circuit.n_qubits)
+    return fused_circuit, GateFusionReport(
+        original_number_of_operations=len(circuit.operations),
+        fused_number_of_operations=len(fused_operations),
+        number_of_fused_gates=number_of_fused_gates,
+    )
@@ -3,15 +3,34 @@
 ################################################################################
 """Data structures for ZQuantum gates."""
 import math
-from dataclasses import dataclass, replace
-from typing import Callable, Dict, Iterable, Tuple, Union
+from dataclasses import dataclass, field, replace
+from numbers import Number
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    SupportsComplex,
+    Tuple,
+    Union,
+    cast,
+)
 
 import numpy as np
 import sympy
 from typing_extensions import Protocol, runtime_checkable
 from zquantum.core.typing import ParameterizedVector
 
+from . import _numpy_matrices
 from ._operations import Parameter, get_free_symbols, sub_symbols
+from ._state_vector_tools import (
+    _apply_controlled_permutation_numpy,
+    _apply_diagonal_numpy,
+    _apply_matrix_numpy,
+    _apply_matrix_to_tensor,
+    _is_numeric,
+)
 from ._unitary_tools import _lift_matrix_numpy, _lift_matrix_sympy
 
 
@@ -124,7 +143,9 @@ class GateOperation:
         return (
             _lift_matrix_sympy(self.gate.matrix, self.qubit_indices, num_qubits)
             if self.gate.free_symbols
-            else _lift_matrix_numpy(self.gate.matrix, self.qubit_indices, num_qubits)
+            else _lift_matrix_numpy(
+                _gate_matrix_numpy(self.gate), self.qubit_indices, num_qubits
+            )
         )
 
     def apply(self, amplitude_vector: ParameterizedVector) -> ParameterizedVector:
@@ -135,7 +156,26 @@ class GateOperation:
                 f"vector of length {len(amplitude_vector)} was provided."
             )
 
-        return self.lifted_matrix(int(num_qubits)) @ amplitude_vector
+        # Symbolic gates and symbolic states can only be handled by lifting gate matrix
+        # to the whole system. Otherwise, we contract the matrix only with axes of
+        # the qubits it acts on, which is exponentially cheaper.
+        if self.gate.free_symbols or not _is_numeric(amplitude_vector):
+            return self.lifted_matrix(int(num_qubits)) @ amplitude_vector
+
+        diagonal = _gate_diagonal_numpy(self.gate)
+        if diagonal is not None:
+            return _apply_diagonal_numpy(diagonal, self.qubit_indices, amplitude_vector)
+
+        permutation = _gate_controlled_permutation(self.gate)
+        if permutation is not None:
+            return _apply_controlled_permutation_numpy(
+                *permutation, self.qubit_indices, amplitude_vector
+            )
+
+        num_control_qubits, matrix = _gate_controlled_matrix_numpy(self.gate)
+        return _apply_matrix_numpy(
+            matrix, self.qubit_indices, amplitude_vector, num_control_qubits
+        )
 
     @property
     def free_symbols(self) -> Iterable[sympy.Symbol]:
@@ -334,6 +374,206 @@ class Dagger(Gate):
         return self.wrapped_gate
 
 
+FUSED_GATE_NAME = "Fused"
+
+
+@dataclass(frozen=True)
+class FusedGate:
+    """Gate equivalent to a sequence of gate operations without free symbols.
+
+    Fused gates are produced by gate fusion (see `zquantum.core.circuits.fuse_gates`)
+    and their purpose is to reduce number of passes over the state vector during
+    simulation. The numeric matrix of a fused gate is computed once, during its
+    construction.
+
+    Note that fused gates cannot be serialized.
+
+    Args:
+        wrapped_operations: operations comprising this gate. Their qubit indices
+            refer to the qubits of the fused gate, i.e. have to be smaller than
+            `num_qubits`.
+        num_qubits: number of qubits this gate acts on.
+    """
+
+    wrapped_operations: Tuple[GateOperation, ...]
+    num_qubits: int
+    numeric_matrix: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if any(operation.free_symbols for operation in self.wrapped_operations):
+            raise ValueError("Only operations without free symbols can be fused.")
+
+        tensor = np.eye(2**self.num_qubits, dtype=complex).reshape(
+            (2,) * self.num_qubits + (2**self.num_qubits,)
+        )
+        for operation in self.wrapped_operations:
+            num_control_qubits, matrix = _gate_controlled_matrix_numpy(operation.gate)
+            _apply_matrix_to_tensor(
+                matrix, operation.qubit_indices, tensor, num_control_qubits
+            )
+        numeric_matrix = tensor.reshape(2**self.num_qubits, 2**self.num_qubits)
+        numeric_matrix.flags.writeable = False
+        object.__setattr__(self, "numeric_matrix", numeric_matrix)
+
+    @property
+    def name(self):
+        return FUSED_GATE_NAME
+
+    @property
+    def params(self) -> Tuple[Parameter, ...]:
+        return ()
+
+    @property
+    def matrix(self) -> sympy.Matrix:
+        return sympy.Matrix(self.numeric_matrix)
+
+    def controlled(self, num_control_qubits: int) -> Gate:
+        return ControlledGate(self, num_control_qubits)
+
+    @property
+    def dagger(self) -> "FusedGate":
+        return FusedGate(
+            tuple(
+                operation.gate.dagger(*operation.qubit_indices)
+                for operation in reversed(self.wrapped_operations)
+            ),
+            self.num_qubits,
+        )
+
+    def bind(self, symbols_map) -> "FusedGate":
+        return self
+
+    def replace_params(self, new_params: Tuple[Parameter, ...]) -> "FusedGate":
+        if new_params:
+            raise ValueError("Fused gates don't have any parameters.")
+        return self
+
+    # See the comment in MatrixFactoryGate on why we don't inherit from Gate.
+    @property
+    def free_symbols(self) -> Iterable[sympy.Symbol]:
+        return []
+
+    __call__ = Gate.__call__
+
+
+def _numeric_params(params: Tuple[Parameter, ...]) -> Optional[Tuple[complex, ...]]:
+    """Convert parameters to plain Python numbers, or return None if it's impossible.
+
+    Real parameters are converted to floats, and complex ones to complex numbers, so
+    that they can be used as cache keys regardless of their original type.
+    """
+    result: List[complex] = []
+    for param in params:
+        try:
+            value = complex(cast(SupportsComplex, param))
+        except TypeError:
+            return None
+        result.append(value.real if value.imag == 0 else value)
+    return tuple(result)
+
+
+def _gate_matrix_numpy(gate: Gate) -> np.ndarray:
+    """Compute numpy matrix of a gate without free symbols.
+
+    Matrices of builtin gates (also when wrapped in ControlledGate or Dagger) are
+    computed without constructing sympy matrices, and are cached. Matrices of
+    other gates are obtained by converting `gate.matrix`.
+    """
+    if isinstance(gate, ControlledGate):
+        return _numpy_matrices.controlled_matrix(
+            _gate_matrix_numpy(gate.wrapped_gate), gate.num_control_qubits
+        )
+    elif isinstance(gate, Dagger):
+        return _gate_matrix_numpy(gate.wrapped_gate).conj().T
+    elif isinstance(gate, FusedGate):
+        return gate.numeric_matrix
+    elif isinstance(
+        gate, MatrixFactoryGate
+    ) and _numpy_matrices.is_builtin_matrix_factory(gate.name, gate.matrix_factory):
+        params = _numeric_params(gate.params)
+        if params is not None:
+            return _numpy_matrices.builtin_gate_matrix(gate.name, params)
+
+    return np.array(gate.matrix, dtype=complex)
+
+
+def _gate_controlled_matrix_numpy(gate: Gate) -> Tuple[int, np.ndarray]:
+    """Split a gate without free symbols into its controls and the controlled matrix.
+
+    Applying only the controlled matrix to the subspace in which all control qubits
+    are set to 1 avoids constructing matrix of the whole ControlledGate, most of
+    which is the identity.
+
+    Returns:
+        Tuple (number of control qubits, numpy matrix of the controlled gate). For
+        gates other than ControlledGate, the number of control qubits is 0 and
+        the matrix is the same as the one returned by `_gate_matrix_numpy`.
+    """
+    if isinstance(gate, ControlledGate):
+        num_control_qubits, matrix = _gate_controlled_matrix_numpy(gate.wrapped_gate)
+        return num_control_qubits + gate.num_control_qubits, matrix
+    return 0, _gate_matrix_numpy(gate)
+
+
+def _gate_diagonal_numpy(gate: Gate) -> Optional[np.ndarray]:
+    """Compute diagonal of numpy matrix of a gate known to be diagonal.
+
+    Returns:
+        Diagonal of the gate's matrix, or None if the gate has free symbols or is not
+        known to be diagonal. Currently, the known diagonal gates are the builtin ones
+        listed in `_numpy_matrices.DIAGONAL_GATE_NAMES`, optionally wrapped in
+        ControlledGate or Dagger.
+    """
+    if isinstance(gate, ControlledGate):
+        wrapped_diagonal = _gate_diagonal_numpy(gate.wrapped_gate)
+        if wrapped_diagonal is None:
+            return None
+        identity_size = len(wrapped_diagonal) * (2**gate.num_control_qubits - 1)
+        return np.concatenate([np.ones(identity_size, dtype=complex), wrapped_diagonal])
+    elif isinstance(gate, Dagger):
+        wrapped_diagonal = _gate_diagonal_numpy(gate.wrapped_gate)
+        return None if wrapped_diagonal is None else wrapped_diagonal.conj()
+    elif (
+        isinstance(gate, MatrixFactoryGate)
+        and gate.name in _numpy_matrices.DIAGONAL_GATE_NAMES
+        and _numpy_matrices.is_builtin_matrix_factory(gate.name, gate.matrix_factory)
+    ):
+        params = _numeric_params(gate.params)
+        if params is not None:
+            return _numpy_matrices.builtin_gate_diagonal(gate.name, params)
+
+    return None
+
+
+# Builtin gates permuting amplitudes, mapped to (target gate, number of controls).
+_PERMUTATION_GATES = {"X": ("X", 0), "CNOT": ("X", 1), "SWAP": ("SWAP", 0)}
+
+
+def _gate_controlled_permutation(gate: Gate) -> Optional[Tuple[str, int]]:
+    """Classify a gate as controlled X or controlled SWAP.
+
+    Returns:
+        Tuple (name of target gate, i.e. "X" or "SWAP", number of control qubits)
+        if the gate is X, CNOT or SWAP, optionally wrapped in ControlledGate or
+        Dagger, and None otherwise.
+    """
+    if isinstance(gate, ControlledGate):
+        wrapped = _gate_controlled_permutation(gate.wrapped_gate)
+        return (
+            None
+            if wrapped is None
+            else (wrapped[0], wrapped[1] + gate.num_control_qubits)
+        )
+    elif isinstance(gate, Dagger):
+        # All the supported permutations are involutions.
+        return _gate_controlled_permutation(gate.wrapped_gate)
+    elif isinstance(gate, MatrixFactoryGate) and gate.name in _PERMUTATION_GATES:
+        if _numpy_matrices.is_builtin_matrix_factory(gate.name, gate.matrix_factory):
+            return _PERMUTATION_GATES[gate.name]
+
+    return None
+
+
 def _n_qubits(matrix):
     n_qubits = math.floor(math.log2(matrix.shape[0]))
     if 2**n_qubits != matrix.shape[0] or 2**n_qubits != matrix.shape[1]:
@@ -0,0 +1,244 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Numpy counterparts of predefined gate matrices from `_matrices` module.
+
+Constructing sympy matrices is costly, and it is unnecessary when all gate parameters
+are bound to numbers. The functions defined here mirror the ones from `_matrices`, but
+produce complex numpy arrays instead.
+
+Matrices of built-in gates are additionally cached by (gate name, parameters). Use
+`builtin_gate_matrix.cache_info()` to inspect number of cache hits and misses.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from . import _matrices
+
+# Maximum number of matrices stored in the cache of builtin gate matrices.
+MATRIX_CACHE_SIZE = 4096
+
+# --- non-parametric gates ---
+
+
+def x_matrix():
+    return np.array([[0, 1], [1, 0]], dtype=complex)
+
+
+def y_matrix():
+    return np.array([[0, -1j], [1j, 0]], dtype=complex)
+
+
+def z_matrix():
+    return np.array([[1, 0], [0, -1]], dtype=complex)
+
+
+def h_matrix():
+    return np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+
+
+def i_matrix():
+    return np.eye(2, dtype=complex)
+
+
+def s_matrix():
+    return np.array([[1, 0], [0, 1j]], dtype=complex)
+
+
+def t_matrix():
+    return np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex)
+
+
+# --- gates with a single param ---
+
+
+def rx_matrix(angle):
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return np.array([[cos, -1j * sin], [-1j * sin, cos]], dtype=complex)
+
+
+def ry_matrix(angle):
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return np.array([[cos, -sin], [sin, cos]], dtype=complex)
+
+
+def rz_matrix(angle):
+    return np.diag([np.exp(-0.5j * angle), np.exp(0.5j * angle)])
+
+
+def rh_matrix(angle):
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    phase_factor = cos + 1j * sin
+    return phase_factor * np.array(
+        [
+            [cos - 1j / np.sqrt(2) * sin, -1j / np.sqrt(2) * sin],
+            [-1j / np.sqrt(2) * sin, cos + 1j / np.sqrt(2) * sin],
+        ],
+        dtype=complex,
+    )
+
+
+def phase_matrix(angle):
+    return np.diag([1, np.exp(1j * angle)])
+
+
+def u3_matrix(theta, phi, lambda_):
+    cos, sin = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array(
+        [
+            [cos, -np.exp(1j * lambda_) * sin],
+            [np.exp(1j * phi) * sin, np.exp(1j * (phi + lambda_)) * cos],
+        ],
+        dtype=complex,
+    )
+
+
+# --- non-parametric two qubit gates ---
+
+
+def cnot_matrix():
+    return np.array(
+        [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex
+    )
+
+
+def cz_matrix():
+    return np.diag([1, 1, 1, -1]).astype(complex)
+
+
+def swap_matrix():
+    return np.array(
+        [[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex
+    )
+
+
+def iswap_matrix():
+    return np.array(
+        [[1, 0, 0, 0], [0, 0, 1j, 0], [0, 1j, 0, 0], [0, 0, 0, 1]], dtype=complex
+    )
+
+
+# --- parametric two qubit gates ---
+
+
+def cphase_matrix(angle):
+    return np.diag([1, 1, 1, np.exp(1j * angle)])
+
+
+def xx_matrix(angle):
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return np.array(
+        [
+            [cos, 0, 0, -1j * sin],
+            [0, cos, -1j * sin, 0],
+            [0, -1j * sin, cos, 0],
+            [-1j * sin, 0, 0, cos],
+        ],
+        dtype=complex,
+    )
+
+
+def yy_matrix(angle):
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return np.array(
+        [
+            [cos, 0, 0, 1j * sin],
+            [0, cos, -1j * sin, 0],
+            [0, -1j * sin, cos, 0],
+            [1j * sin, 0, 0, cos],
+        ],
+        dtype=complex,
+    )
+
+
+def zz_matrix(angle):
+    minus, plus = np.exp(-0.5j * angle), np.exp(0.5j * angle)
+    return np.diag([minus, plus, plus, minus])
+
+
+def xy_matrix(angle):
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return np.array(
+        [
+            [1, 0, 0, 0],
+            [0, cos, 1j * sin, 0],
+            [0, 1j * sin, cos, 0],
+            [0, 0, 0, 1],
+        ],
+        dtype=complex,
+    )
+
+
+# --- matrices of gates wrapping other gates ---
+
+
+def controlled_matrix(matrix: np.ndarray, num_control_qubits: int) -> np.ndarray:
+    """Numpy counterpart of `ControlledGate.matrix`."""
+    size = matrix.shape[0] * 2**num_control_qubits
+    result = np.eye(size, dtype=complex)
+    result[-matrix.shape[0] :, -matrix.shape[0] :] = matrix
+    return result
+
+
+# Mapping name of builtin gate -> (sympy matrix factory, numpy matrix factory).
+BUILTIN_MATRIX_FACTORIES: Dict[str, Tuple[Callable, Callable]] = {
+    "X": (_matrices.x_matrix, x_matrix),
+    "Y": (_matrices.y_matrix, y_matrix),
+    "Z": (_matrices.z_matrix, z_matrix),
+    "H": (_matrices.h_matrix, h_matrix),
+    "I": (_matrices.i_matrix, i_matrix),
+    "S": (_matrices.s_matrix, s_matrix),
+    "T": (_matrices.t_matrix, t_matrix),
+    "RX": (_matrices.rx_matrix, rx_matrix),
+    "RY": (_matrices.ry_matrix, ry_matrix),
+    "RZ": (_matrices.rz_matrix, rz_matrix),
+    "RH": (_matrices.rh_matrix, rh_matrix),
+    "PHASE": (_matrices.phase_matrix, phase_matrix),
+    "U3": (_matrices.u3_matrix, u3_matrix),
+    "CNOT": (_matrices.cnot_matrix, cnot_matrix),
+    "CZ": (_matrices.cz_matrix, cz_matrix),
+    "SWAP": (_matrices.swap_matrix, swap_matrix),
+    "ISWAP": (_matrices.iswap_matrix, iswap_matrix),
+    "CPHASE": (_matrices.cphase_matrix, cphase_matrix),
+    "XX": (_matrices.xx_matrix, xx_matrix),
+    "YY": (_matrices.yy_matrix, yy_matrix),
+    "ZZ": (_matrices.zz_matrix, zz_matrix),
+    "XY": (_matrices.xy_matrix, xy_matrix),
+}
+
+
+# Names of builtin gates whose matrices are diagonal for all values of parameters.
+DIAGONAL_GATE_NAMES = frozenset(
+    {"I", "Z", "S", "T", "RZ", "PHASE", "CZ", "CPHASE", "ZZ"}
+)
+
+
+def is_builtin_matrix_factory(name: str, matrix_factory: Callable) -> bool:
+    """Check if given matrix factory is the one used by builtin gate with given name.
+
+    Note that comparing only names is not enough, because users are free to define
+    custom gates with names of the builtin ones.
+    """
+    return (
+        name in BUILTIN_MATRIX_FACTORIES
+        and BUILTIN_MATRIX_FACTORIES[name][0] is matrix_factory
+    )
+
+
+@lru_cache(maxsize=MATRIX_CACHE_SIZE)
+def builtin_gate_matrix(name: str, params: Tuple[complex, ...]) -> np.ndarray:
+    """Numpy matrix of builtin gate with given name and numeric parameters.
+
+    The returned arrays are cached and shared between callers, hence they are
+    marked as read-only.
+    """
+    matrix = np.asarray(BUILTIN_MATRIX_FACTORIES[name][1](*params), dtype=complex)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def builtin_gate_diagonal(name: str, params: Tuple[complex, ...]) -> np.ndarray:
+    """Diagonal of numpy matrix of builtin gate with name from DIAGONAL_GATE_NAMES."""
+    return np.diagonal(builtin_gate_matrix(name, params))
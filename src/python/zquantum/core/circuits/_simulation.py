@@ -0,0 +1,251 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Applying sequences of operations to numeric state vectors.
+
+Operations are applied to the state tensor (see `_state_vector_tools`) one by one,
+except for the diagonal and permutation ones. Each run of consecutive diagonal
+operations (e.g. RZ, CPHASE, ZZ or MultiPhaseOperation) is first merged into a single
+phase tensor acting on the union of their qubits, which is then multiplied
+elementwise with the state.
+Similarly, runs of consecutive gates permuting amplitudes (e.g. ladders of CNOTs)
+are composed by applying them to a tensor of amplitude indices, after which the
+state is permuted with a single gather.
+
+Apart from the usual operations, sequences passed to `_apply_operations_to_tensor`
+can contain batched operations, i.e. sequences of operations of the same kind,
+acting on the same qubits, one per state in a batch enumerated by the last axis of
+the state tensor.
+"""
+from typing import List, Optional, Sequence, Tuple, Union, cast
+
+import numpy as np
+from zquantum.core.typing import ParameterizedVector
+
+from . import _gates
+from ._operations import Operation
+from ._state_vector_tools import (
+    PhaseTensor,
+    _apply_controlled_permutation_to_tensor,
+    _apply_matrices_to_batch_tensor,
+    _apply_matrix_to_tensor,
+    _apply_phase_tensor,
+    _diagonal_to_phase_tensor,
+    _is_numeric,
+    _merge_phase_tensors,
+    _to_state_tensor,
+)
+from ._wavefunction_operations import MultiPhaseOperation
+
+BatchedOperation = Sequence[Operation]
+
+# Number of control qubits and matrix of the controlled gate.
+ControlledMatrix = Tuple[int, np.ndarray]
+
+# Controlled permutation: (target gate name, number of control qubits, qubit indices).
+Permutation = Tuple[str, int, Tuple[int, ...]]
+
+
+def _is_batched(operation) -> bool:
+    return isinstance(operation, (list, tuple))
+
+
+def _operation_diagonal(
+    operation: Operation, num_qubits: int
+) -> Optional[Tuple[np.ndarray, Tuple[int, ...]]]:
+    """Diagonal of matrix of a diagonal operation, and qubits it acts on."""
+    if isinstance(operation, _gates.GateOperation):
+        diagonal = _gates._gate_diagonal_numpy(operation.gate)
+        return None if diagonal is None else (diagonal, operation.qubit_indices)
+    elif (
+        isinstance(operation, MultiPhaseOperation)
+        and len(operation.params) == 2**num_qubits
+    ):
+        try:
+            return (
+                np.exp(1j * np.asarray(operation.params, dtype=float)),
+                operation.qubit_indices,
+            )
+        except TypeError:
+            return None
+    return None
+
+
+def _phase_tensor(
+    operation: Union[Operation, BatchedOperation], num_qubits: int, batch_ndim: int
+) -> Optional[PhaseTensor]:
+    if _is_batched(operation):
+        diagonals = [
+            _operation_diagonal(op, num_qubits)
+            for op in cast(BatchedOperation, operation)
+        ]
+        if any(diagonal is None for diagonal in diagonals):
+            return None
+        batch_diagonals = cast(List[Tuple[np.ndarray, Tuple[int, ...]]], diagonals)
+        return _diagonal_to_phase_tensor(
+            np.stack([diagonal for diagonal, _ in batch_diagonals], axis=-1),
+            batch_diagonals[0][1],
+        )
+
+    diagonal_and_qubits = _operation_diagonal(cast(Operation, operation), num_qubits)
+    if diagonal_and_qubits is None:
+        return None
+    diagonal, qubit_indices = diagonal_and_qubits
+    return _diagonal_to_phase_tensor(
+        diagonal.reshape(diagonal.shape + (1,) * batch_ndim), qubit_indices
+    )
+
+
+def _permutation(
+    operation: Union[Operation, BatchedOperation]
+) -> Optional[Permutation]:
+    if isinstance(operation, _gates.GateOperation):
+        permutation = _gates._gate_controlled_permutation(operation.gate)
+        if permutation is not None:
+            return (*permutation, operation.qubit_indices)
+    return None
+
+
+def _apply_permutations_to_tensor(
+    permutations: Sequence[Permutation], tensor: np.ndarray, num_qubits: int
+):
+    if len(permutations) == 1:
+        _apply_controlled_permutation_to_tensor(*permutations[0], tensor)
+        return
+
+    # Composing permutations on indices moves 4-byte integers instead of complex
+    # amplitudes (possibly many of them per index, if the state is batched).
+    indices = np.arange(2**num_qubits, dtype=np.int32).reshape((2,) * num_qubits)
+    for permutation in permutations:
+        _apply_controlled_permutation_to_tensor(*permutation, indices)
+    columns = tensor.reshape(2**num_qubits, -1)
+    tensor[...] = columns[indices.reshape(-1)].reshape(tensor.shape)
+
+
+def _apply_operation_by_columns(
+    operation: Union[Operation, BatchedOperation],
+    tensor: np.ndarray,
+    num_qubits: int,
+):
+    columns = tensor.reshape(2**num_qubits, -1)
+    for k in range(columns.shape[1]):
+        column_operation = (
+            cast(BatchedOperation, operation)[k]
+            if _is_batched(operation)
+            else cast(Operation, operation)
+        )
+        columns[:, k] = column_operation.apply(columns[:, k])
+    tensor[...] = columns.reshape(tensor.shape)
+
+
+def _apply_operations_to_tensor(
+    operations: Sequence[Union[Operation, BatchedOperation]],
+    tensor: np.ndarray,
+    num_qubits: int,
+    matrices: Optional[Sequence[Optional[ControlledMatrix]]] = None,
+) -> np.ndarray:
+    """Apply sequence of operations with numeric parameters to a state tensor, in place.
+
+    Args:
+        operations: operations to apply, possibly batched.
+        tensor: state tensor of N qubits, possibly with additional trailing axes.
+        num_qubits: number of qubits N.
+        matrices: optional precomputed matrices of operations, in the form returned
+            by `_gates._gate_controlled_matrix_numpy`. Matrices of gate operations
+            for which None is provided are computed on the fly.
+    Returns:
+        `tensor`, after modification.
+    """
+    batch_ndim = tensor.ndim - num_qubits
+    pending_phase_tensor: Optional[PhaseTensor] = None
+    pending_permutations: List[Permutation] = []
+
+    def _flush_phase_tensor():
+        nonlocal pending_phase_tensor
+        if pending_phase_tensor is not None:
+            _apply_phase_tensor(pending_phase_tensor, tensor, num_qubits)
+            pending_phase_tensor = None
+
+    def _flush_permutations():
+        if pending_permutations:
+            _apply_permutations_to_tensor(pending_permutations, tensor, num_qubits)
+            pending_permutations.clear()
+
+    for index, operation in enumerate(operations):
+        phase_tensor = _phase_tensor(operation, num_qubits, batch_ndim)
+        if phase_tensor is not None:
+            _flush_permutations()
+            pending_phase_tensor = (
+                phase_tensor
+                if pending_phase_tensor is None
+                else _merge_phase_tensors(pending_phase_tensor, phase_tensor)
+            )
+            continue
+
+        _flush_phase_tensor()
+
+        permutation = _permutation(operation)
+        if permutation is not None:
+            pending_permutations.append(permutation)
+            continue
+
+        _flush_permutations()
+
+        if _is_batched(operation) and isinstance(
+            cast(BatchedOperation, operation)[0], _gates.GateOperation
+        ):
+            gate_operations = cast(Sequence[_gates.GateOperation], operation)
+            controlled_matrices = [
+                _gates._gate_controlled_matrix_numpy(op.gate) for op in gate_operations
+            ]
+            _apply_matrices_to_batch_tensor(
+                np.stack([matrix for _, matrix in controlled_matrices]),
+                gate_operations[0].qubit_indices,
+                tensor,
+                controlled_matrices[0][0],
+            )
+        elif isinstance(operation, _gates.GateOperation):
+            controlled_matrix = None if matrices is None else matrices[index]
+            num_control_qubits, matrix = (
+                _gates._gate_controlled_matrix_numpy(operation.gate)
+                if controlled_matrix is None
+                else controlled_matrix
+            )
+            _apply_matrix_to_tensor(
+                matrix, operation.qubit_indices, tensor, num_control_qubits
+            )
+        else:
+            _apply_operation_by_columns(operation, tensor, num_qubits)
+
+    _flush_phase_tensor()
+    _flush_permutations()
+
+    return tensor
+
+
+def apply_operations(
+    operations: Sequence[Operation], amplitude_vector: ParameterizedVector
+) -> ParameterizedVector:
+    """Apply sequence of operations to an amplitude vector.
+
+    If the amplitude vector and all the operations are numeric, the operations are
+    applied to a single state tensor, with runs of diagonal operations merged.
+    Otherwise, this is equivalent to calling `apply` of consecutive operations.
+    """
+    if not _is_numeric(amplitude_vector) or any(
+        operation.free_symbols for operation in operations
+    ):
+        for operation in operations:
+            amplitude_vector = operation.apply(amplitude_vector)
+        return amplitude_vector
+
+    num_qubits = len(amplitude_vector).bit_length() - 1
+    if 2**num_qubits != len(amplitude_vector):
+        raise ValueError(
+            "Operations can only be applied to multi-qubit state vector but "
+            f"vector of length {len(amplitude_vector)} was provided."
+        )
+
+    return _apply_operations_to_tensor(
+        operations, _to_state_tensor(amplitude_vector, num_qubits), num_qubits
+    ).reshape(-1)
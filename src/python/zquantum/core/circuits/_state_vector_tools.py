@@ -0,0 +1,277 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Module containing utilities for applying gates directly to state vectors.
+
+Instead of lifting a gate matrix to the whole N-qubit system (which requires
+O(4^N) memory), amplitude vectors are viewed as tensors with one axis of dimension 2
+per qubit, and gate matrices are contracted only with the axes of qubits they act on.
+The cost of applying a k-qubit gate is therefore O(4^k * 2^N).
+
+Qubit ordering follows the one used in `_unitary_tools`, i.e. qubit 0 corresponds to
+the most significant bit of amplitude index, which is the first axis of the tensor.
+
+Functions in this module operating on tensors modify them in place. Tensors might
+have additional trailing axes (e.g. enumerating columns of a matrix), which are
+left untouched.
+
+Diagonal matrices are represented by phase tensors, i.e. their diagonals reshaped so
+that there is one axis per qubit they act on, in ascending order of qubit indices.
+Such tensors can be multiplied elementwise with the state tensor (or with each other)
+using broadcasting.
+
+Controlled gates are applied only to the part of the state tensor in which all
+control qubits are set to 1, which is a view obtained by indexing the control axes.
+
+Gates permuting amplitudes (controlled or not X and SWAP) are applied by swapping
+slices of the state tensor in place, without any arithmetic.
+"""
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+
+PhaseTensor = Tuple[np.ndarray, Tuple[int, ...]]
+
+
+def _is_numeric(amplitude_vector) -> bool:
+    """Check if amplitude vector comprises only numbers (i.e. no free symbols)."""
+    if isinstance(amplitude_vector, np.ndarray) and amplitude_vector.dtype != object:
+        return True
+    try:
+        np.asarray(amplitude_vector, dtype=complex)
+        return True
+    except TypeError:
+        return False
+
+
+def _to_state_tensor(amplitude_vector, num_qubits: int) -> np.ndarray:
+    """Create complex tensor with one axis per qubit holding copy of amplitudes."""
+    return np.array(amplitude_vector, dtype=complex).reshape((2,) * num_qubits)
+
+
+def _controlled_subspace(
+    tensor: np.ndarray, num_control_qubits: int, qubit_indices
+) -> Tuple[np.ndarray, List[int]]:
+    """Restrict state tensor to the subspace in which all control qubits are set to 1.
+
+    Args:
+        tensor: state tensor, possibly with trailing axes.
+        num_control_qubits: number of control qubits.
+        qubit_indices: indices of control qubits followed by indices of target qubits.
+    Returns:
+        Tuple (subspace, target axes). Subspace is a view of `tensor`, hence
+        modifying it modifies `tensor`. Target axes are the axes of the subspace
+        corresponding to the target qubits.
+    """
+    control_qubits = qubit_indices[:num_control_qubits]
+    subspace_index: List[Union[slice, int]] = [slice(None)] * tensor.ndim
+    for qubit in control_qubits:
+        subspace_index[qubit] = 1
+    return tensor[tuple(subspace_index)], [
+        qubit - sum(control < qubit for control in control_qubits)
+        for qubit in qubit_indices[num_control_qubits:]
+    ]
+
+
+def _apply_matrix_to_tensor(
+    matrix, qubit_indices, tensor: np.ndarray, num_control_qubits: int = 0
+) -> np.ndarray:
+    """Apply matrix acting on k qubits to the state tensor, in place.
+
+    Args:
+        matrix: 2^k x 2^k matrix. The first qubit in `qubit_indices` corresponds to
+            the most significant bit of matrix index.
+        qubit_indices: indices of qubits (i.e. tensor axes) matrix acts on, preceded
+            by indices of control qubits, if any.
+        tensor: state tensor, as returned by `_to_state_tensor`.
+        num_control_qubits: number of control qubits. The matrix is applied only to
+            the part of the state in which all of them are set to 1.
+    Returns:
+        `tensor`, after modification.
+    """
+    if num_control_qubits:
+        subspace, target_axes = _controlled_subspace(
+            tensor, num_control_qubits, qubit_indices
+        )
+        _apply_matrix_to_tensor(matrix, target_axes, subspace)
+        return tensor
+
+    num_gate_qubits = len(qubit_indices)
+    gate_tensor = np.reshape(matrix, (2,) * (2 * num_gate_qubits))
+    result = np.tensordot(
+        gate_tensor,
+        tensor,
+        axes=(list(range(num_gate_qubits, 2 * num_gate_qubits)), list(qubit_indices)),
+    )
+    # tensordot places output axes of the gate first, hence we have to move them
+    # back to positions of the qubits they correspond to.
+    tensor[...] = np.moveaxis(result, list(range(num_gate_qubits)), list(qubit_indices))
+    return tensor
+
+
+def _apply_matrix_numpy(
+    matrix, qubit_indices, amplitude_vector, num_control_qubits: int = 0
+) -> np.ndarray:
+    """Apply matrix acting on subsystem of N-qubit system to an amplitude vector.
+
+    This is equivalent to, but much more efficient than, multiplying the vector by
+    `_lift_matrix_numpy(matrix, qubit_indices, N)`. See `_apply_matrix_to_tensor`
+    for the meaning of `num_control_qubits`.
+    """
+    num_qubits = len(amplitude_vector).bit_length() - 1
+    tensor = _to_state_tensor(amplitude_vector, num_qubits)
+    return _apply_matrix_to_tensor(
+        np.asarray(matrix, dtype=complex), qubit_indices, tensor, num_control_qubits
+    ).reshape(-1)
+
+
+def _apply_matrices_to_batch_tensor(
+    matrices: np.ndarray,
+    qubit_indices,
+    tensor: np.ndarray,
+    num_control_qubits: int = 0,
+) -> np.ndarray:
+    """Apply different matrices to different columns of batched state tensor, in place.
+
+    Args:
+        matrices: array of shape (K, 2^k, 2^k), where K-th matrix is applied to K-th
+            state in the batch.
+        qubit_indices: indices of qubits (i.e. tensor axes) matrices act on, preceded
+            by indices of control qubits, if any.
+        tensor: batched state tensor of shape (2,) * N + (K,).
+        num_control_qubits: number of control qubits.
+    Returns:
+        `tensor`, after modification.
+    """
+    if num_control_qubits:
+        subspace, target_axes = _controlled_subspace(
+            tensor, num_control_qubits, qubit_indices
+        )
+        _apply_matrices_to_batch_tensor(matrices, target_axes, subspace)
+        return tensor
+
+    num_qubits = tensor.ndim - 1
+    num_gate_qubits = len(qubit_indices)
+    gate_tensor = np.reshape(matrices, (-1,) + (2,) * (2 * num_gate_qubits))
+
+    # Axes are labeled as follows: 0, ..., N-1 are qubit axes, N is the batch axis,
+    # and N+1, ..., N+k are output axes of the matrices.
+    batch_axis = num_qubits
+    output_axes = [num_qubits + 1 + i for i in range(num_gate_qubits)]
+    result_axes = list(range(num_qubits))
+    for qubit, output_axis in zip(qubit_indices, output_axes):
+        result_axes[qubit] = output_axis
+
+    tensor[...] = np.einsum(
+        gate_tensor,
+        [batch_axis, *output_axes, *qubit_indices],
+        tensor,
+        [*range(num_qubits), batch_axis],
+        [*result_axes, batch_axis],
+    )
+    return tensor
+
+
+def _diagonal_to_phase_tensor(diagonal: np.ndarray, qubit_indices) -> PhaseTensor:
+    """Convert diagonal of matrix acting on given qubits into a phase tensor.
+
+    Args:
+        diagonal: array of shape (2^k, ...). Trailing axes, if present, are kept
+            after the qubit axes, and can be used to enumerate states in a batch.
+        qubit_indices: indices of qubits the diagonal matrix acts on.
+    Returns:
+        Tuple (phase tensor, sorted qubit indices).
+    """
+    num_gate_qubits = len(qubit_indices)
+    diagonal = np.reshape(diagonal, (2,) * num_gate_qubits + np.shape(diagonal)[1:])
+    axes_order = [*np.argsort(qubit_indices), *range(num_gate_qubits, diagonal.ndim)]
+    return np.transpose(diagonal, axes_order), tuple(sorted(qubit_indices))
+
+
+def _expand_phase_tensor(
+    phase_tensor: PhaseTensor, target_qubits: Iterable[int]
+) -> np.ndarray:
+    phases, qubits = phase_tensor
+    return phases.reshape(
+        [2 if qubit in qubits else 1 for qubit in target_qubits]
+        + list(phases.shape[len(qubits) :])
+    )
+
+
+def _merge_phase_tensors(first: PhaseTensor, second: PhaseTensor) -> PhaseTensor:
+    """Compute phase tensor of a product of two diagonal matrices."""
+    qubits = tuple(sorted(set(first[1]) | set(second[1])))
+    return (
+        _expand_phase_tensor(first, qubits) * _expand_phase_tensor(second, qubits),
+        qubits,
+    )
+
+
+def _apply_phase_tensor(
+    phase_tensor: PhaseTensor, tensor: np.ndarray, num_qubits: int
+) -> np.ndarray:
+    """Multiply state tensor of N qubits by given phase tensor, in place."""
+    phases = _expand_phase_tensor(phase_tensor, range(num_qubits))
+    tensor *= phases.reshape(phases.shape + (1,) * (tensor.ndim - phases.ndim))
+    return tensor
+
+
+def _apply_diagonal_numpy(diagonal, qubit_indices, amplitude_vector) -> np.ndarray:
+    """Apply diagonal matrix acting on subsystem of N-qubit system to amplitude vector.
+
+    This is equivalent to `_apply_matrix_numpy(np.diag(diagonal), ...)`, but requires
+    only elementwise multiplication.
+    """
+    num_qubits = len(amplitude_vector).bit_length() - 1
+    tensor = _to_state_tensor(amplitude_vector, num_qubits)
+    return _apply_phase_tensor(
+        _diagonal_to_phase_tensor(diagonal, qubit_indices), tensor, num_qubits
+    ).reshape(-1)
+
+
+def _swap_slices(tensor: np.ndarray, first_index, second_index):
+    temp = tensor[first_index].copy()
+    tensor[first_index] = tensor[second_index]
+    tensor[second_index] = temp
+
+
+def _apply_controlled_permutation_to_tensor(
+    target_gate_name: str, num_control_qubits: int, qubit_indices, tensor: np.ndarray
+) -> np.ndarray:
+    """Apply controlled X or SWAP to the state tensor, in place.
+
+    Args:
+        target_gate_name: either "X" or "SWAP".
+        num_control_qubits: number of control qubits, possibly 0.
+        qubit_indices: indices of control qubits followed by indices of qubits the
+            target gate acts on.
+        tensor: state tensor, possibly with trailing axes.
+    Returns:
+        `tensor`, after modification.
+    """
+    subspace, target_axes = _controlled_subspace(
+        tensor, num_control_qubits, qubit_indices
+    )
+    first_index: List[Union[slice, int]] = [slice(None)] * subspace.ndim
+    second_index: List[Union[slice, int]] = [slice(None)] * subspace.ndim
+    if target_gate_name == "X":
+        first_index[target_axes[0]], second_index[target_axes[0]] = 0, 1
+    elif target_gate_name == "SWAP":
+        first_index[target_axes[0]], first_index[target_axes[1]] = 0, 1
+        second_index[target_axes[0]], second_index[target_axes[1]] = 1, 0
+    else:
+        raise ValueError(f"Gate {target_gate_name} is not a supported permutation.")
+
+    _swap_slices(subspace, tuple(first_index), tuple(second_index))
+    return tensor
+
+
+def _apply_controlled_permutation_numpy(
+    target_gate_name: str, num_control_qubits: int, qubit_indices, amplitude_vector
+) -> np.ndarray:
+    """Apply controlled X or SWAP acting on subsystem of N-qubit system to a vector."""
+    num_qubits = len(amplitude_vector).bit_length() - 1
+    tensor = _to_state_tensor(amplitude_vector, num_qubits)
+    return _apply_controlled_permutation_to_tensor(
+        target_gate_name, num_control_qubits, qubit_indices, tensor
+    ).reshape(-1)
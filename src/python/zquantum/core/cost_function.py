@@ -361,10 +361,18 @@ def create_cost_function(
             adhere to the ParameterPreprocessor protocol.
         gradient_function: a function which returns a function used to compute the
             gradient of the cost function (see
-            zquantum.core.gradients.finite_differences_gradient for reference)
+            zquantum.core.gradients.finite_differences_gradient for reference). For
+            simulators, zquantum.core.gradients.adjoint_gradient computes exact
+            gradient at a cost comparable to a few evaluations of the function,
+            and zquantum.core.gradients.parameter_shift_gradient computes unbiased
+            gradient estimates from samples.
 
     Returns:
-        A callable CostFunction object.
+        A callable CostFunction object. Backend, estimation tasks factory,
+        estimation method and parameter preprocessors used by the function are
+        available as its attributes. Additionally, its `batch` method evaluates
+        the function at each row of a parameters matrix, estimating expectation
+        values for all the rows in a single call to the estimation method.
 
     Example use case:
         target_operator = ...
@@ -403,6 +411,47 @@ def create_cost_function(
 
         return sum_expectation_values(combined_expectation_values)
 
+    def _batch(parameters_matrix: np.ndarray) -> List[Union[float, ValueEstimate]]:
+        estimation_tasks_per_point = []
+        for parameters in parameters_matrix:
+            for preprocessor in (
+                [] if parameter_preprocessors is None else parameter_preprocessors
+            ):
+                parameters = preprocessor(parameters)
+            estimation_tasks_per_point.append(estimation_tasks_factory(parameters))
+
+        all_estimation_tasks = [
+            task
+            for estimation_tasks in estimation_tasks_per_point
+            for task in estimation_tasks
+        ]
+        expectation_values_list = estimation_method(backend, all_estimation_tasks)
+
+        values: List[Union[float, ValueEstimate]] = []
+        start = 0
+        for estimation_tasks in estimation_tasks_per_point:
+            stop = start + len(estimation_tasks)
+            values.append(
+                sum_expectation_values(
+                    expectation_values_to_real(
+                        concatenate_expectation_values(
+                            expectation_values_list[start:stop]
+                        )
+                    )
+                )
+            )
+            start = stop
+        return values
+
+    _cost_function.batch = _batch  # type: ignore
+
+    # Exposed for gradients that need more than values of the cost function, e.g.
+    # zquantum.core.gradients.adjoint_gradient.
+    _cost_function.backend = backend  # type: ignore
+    _cost_function.estimation_method = estimation_method  # type: ignore
+    _cost_function.estimation_tasks_factory = estimation_tasks_factory  # type: ignore
+    _cost_function.parameter_preprocessors = parameter_preprocessors  # type: ignore
+
     return function_with_gradient(_cost_function, gradient_function(_cost_function))
 
 
@@ -451,12 +500,25 @@ def expectation_value_estimation_tasks_factory(
     circuit_symbols = _get_sorted_set_of_circuit_symbols(
         estimation_tasks, symbols_sort_key
     )
+    # Circuits are compiled once, so that producing tasks for given parameters
+    # doesn't require substituting symbols in every gate of every circuit.
+    compiled_circuits = [
+        task.circuit.compile(circuit_symbols) for task in estimation_tasks
+    ]
 
     def _tasks_factory(parameters: np.ndarray) -> List[EstimationTask]:
-        symbols_map = create_symbols_map(circuit_symbols, parameters)
-        return evaluate_estimation_circuits(
-            estimation_tasks, [symbols_map for _ in estimation_tasks]
-        )
+        return [
+            EstimationTask(
+                operator=task.operator,
+                circuit=compiled_circuit.bind(parameters),
+                number_of_shots=task.number_of_shots,
+            )
+            for task, compiled_circuit in zip(estimation_tasks, compiled_circuits)
+        ]
+
+    # Parametrized tasks are exposed for gradients differentiating circuits.
+    _tasks_factory.estimation_tasks = estimation_tasks  # type: ignore
+    _tasks_factory.circuit_symbols = circuit_symbols  # type: ignore
 
     return _tasks_factory
 
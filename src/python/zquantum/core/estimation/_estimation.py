@@ -9,9 +9,15 @@ from zquantum.core.openfermion import IsingOperator, QubitOperator
 
 from ..circuits import RX, RY, Circuit
 from ..hamiltonian import estimate_nmeas_for_frames, group_comeasureable_terms_greedy
+from ..interfaces.async_backend import AsyncQuantumBackend
 from ..interfaces.backend import QuantumBackend, QuantumSimulator
 from ..interfaces.estimation import EstimationTask
-from ..measurement import ExpectationValues, expectation_values_to_real
+from ..measurement import (
+    ExpectationValues,
+    ExpectationValuesAccumulator,
+    Measurements,
+    expectation_values_to_real,
+)
 from ..openfermion import change_operator_type
 from ..utils import scale_and_discretize
 
@@ -295,6 +301,61 @@ def evaluate_non_measured_estimation_tasks(
     return expectation_values
 
 
+def _circuits_and_shots_to_measure(
+    estimation_tasks: List[EstimationTask],
+) -> Tuple[List[Circuit], List[int]]:
+    estimation_tasks_to_measure, *_ = split_estimation_tasks_to_measure(
+        estimation_tasks
+    )
+    return [task.circuit for task in estimation_tasks_to_measure], [
+        cast(int, task.number_of_shots) for task in estimation_tasks_to_measure
+    ]
+
+
+def _average_measurements(
+    estimation_tasks: List[EstimationTask], measurements_list: List[Measurements]
+) -> List[ExpectationValues]:
+    """Compute expectation values of estimation tasks from measurements of tasks
+    selected by `split_estimation_tasks_to_measure`."""
+    (
+        estimation_tasks_to_measure,
+        estimation_tasks_not_to_measure,
+        indices_to_measure,
+        indices_not_to_measure,
+    ) = split_estimation_tasks_to_measure(estimation_tasks)
+
+    non_measured_expectation_values_list = evaluate_non_measured_estimation_tasks(
+        estimation_tasks_not_to_measure
+    )
+
+    measured_expectation_values_list = [
+        expectation_values_to_real(
+            measurements.get_expectation_values(
+                change_operator_type(task.operator, IsingOperator)
+            )
+        )
+        for task, measurements in zip(estimation_tasks_to_measure, measurements_list)
+    ]
+
+    full_expectation_values: List[Optional[ExpectationValues]] = [
+        None
+        for _ in range(
+            len(estimation_tasks_not_to_measure) + len(estimation_tasks_to_measure)
+        )
+    ]
+
+    for ex_val, final_index in zip(
+        non_measured_expectation_values_list, indices_not_to_measure
+    ):
+        full_expectation_values[final_index] = ex_val
+    for ex_val, final_index in zip(
+        measured_expectation_values_list, indices_to_measure
+    ):
+        full_expectation_values[final_index] = ex_val
+
+    return cast(List[ExpectationValues], full_expectation_values)
+
+
 def estimate_expectation_values_by_averaging(
     backend: QuantumBackend,
     estimation_tasks: List[EstimationTask],
@@ -308,6 +369,117 @@ def estimate_expectation_values_by_averaging(
         backend: backend used for executing circuits
         estimation_tasks: list of estimation tasks
     """
+    circuits, shots_per_circuit = _circuits_and_shots_to_measure(estimation_tasks)
+    measurements_list = (
+        backend.run_circuitset_and_measure(circuits, shots_per_circuit)
+        if circuits
+        else []
+    )
+    return _average_measurements(estimation_tasks, measurements_list)
+
+
+async def estimate_expectation_values_by_averaging_async(
+    backend: AsyncQuantumBackend,
+    estimation_tasks: List[EstimationTask],
+) -> List[ExpectationValues]:
+    """Asynchronous counterpart of `estimate_expectation_values_by_averaging`.
+
+    All the circuits are submitted to the backend at once, so that it can execute
+    them in concurrent jobs.
+
+    Args:
+        backend: asynchronous backend used for executing circuits
+        estimation_tasks: list of estimation tasks
+    """
+    circuits, shots_per_circuit = _circuits_and_shots_to_measure(estimation_tasks)
+    measurements_list = (
+        await backend.run_circuitset_and_measure(circuits, shots_per_circuit)
+        if circuits
+        else []
+    )
+    return _average_measurements(estimation_tasks, measurements_list)
+
+
+def _standard_error_of_sum(expectation_values: ExpectationValues) -> float:
+    covariances = cast(List[np.ndarray], expectation_values.estimator_covariances)
+    return float(np.sqrt(max(np.real(np.sum(covariances[0])), 0.0)))
+
+
+def _standard_error_of_sum_with_prior(
+    expectation_values: ExpectationValues,
+    operator: IsingOperator,
+    number_of_samples: int,
+) -> float:
+    """Standard error of the sum of expectation values, with the variance of a single
+    shot estimated as if two more shots were measured, giving the smallest and the
+    largest possible value of the sum.
+
+    For a single term, this is Laplace's rule of succession applied to frequencies
+    of its +1 and -1 outcomes. In particular, the estimated error is positive even
+    if all the shots gave the same outcome.
+    """
+    constant = sum(np.real(c) for term, c in operator.terms.items() if not term)
+    half_range = sum(np.abs(c) for term, c in operator.terms.items() if term)
+    n = number_of_samples
+    mean = float(np.real(np.sum(expectation_values.values))) - constant
+    variance = n * _standard_error_of_sum(expectation_values) ** 2
+    second_moment = (n * (variance + mean**2) + 2 * half_range**2) / (n + 2)
+    smoothed_variance = second_moment - (n * mean / (n + 2)) ** 2
+    return float(np.sqrt(max(smoothed_variance, 0.0) / n))
+
+
+def estimate_expectation_values_adaptively(
+    backend: QuantumBackend,
+    estimation_tasks: List[EstimationTask],
+    target_precision: float,
+    pilot_number_of_shots: int = 100,
+    max_number_of_rounds: int = 10,
+) -> List[ExpectationValues]:
+    """Estimate expectation values, spending only as many shots as needed to reach
+    the target precision.
+
+    Circuits are executed in rounds. In the first one, each task is measured with
+    a pilot number of shots. Afterwards, the standard error of the sum of
+    expectation values of each task is estimated from the measurements collected
+    so far, and the tasks whose error is larger than `target_precision` are
+    measured again, with the number of shots estimated to be sufficient to reach
+    the target. The number of shots of each task serves as its budget, i.e. it is
+    never exceeded. All the tasks measured in a given round are submitted to the
+    backend with a single call to `run_circuitset_and_measure`.
+
+    The variance of a single shot is estimated as if two additional shots gave the
+    smallest and the largest possible value of the sum (for a single term, this is
+    Laplace's rule of succession). Hence, tasks whose shots all gave the same
+    outcome, e.g. ones measuring near-eigenstates, are not considered precise
+    enough just because their empirical variance is zero.
+
+    Shots are allocated to each task based only on its own measurements, hence
+    the expectation values estimated for a task don't depend on other tasks. Note
+    that the target is the precision of each task, not of their total: if the
+    errors of N tasks are independent, the standard error of the sum of all their
+    expectation values grows roughly as sqrt(N) * target_precision.
+
+    Args:
+        backend: backend used for executing circuits
+        estimation_tasks: list of estimation tasks. Their number_of_shots is the
+            maximum number of shots that can be spent on them.
+        target_precision: target standard error of the sum of expectation values
+            of each task.
+        pilot_number_of_shots: number of shots used for each task in the first
+            round.
+        max_number_of_rounds: maximum number of times each task is measured.
+    """
+    if target_precision <= 0:
+        raise ValueError("target_precision must be positive.")
+    if pilot_number_of_shots <= 0 or max_number_of_rounds <= 0:
+        raise ValueError(
+            "pilot_number_of_shots and max_number_of_rounds must be positive."
+        )
+    if any(task.number_of_shots is None for task in estimation_tasks):
+        raise ValueError(
+            "Adaptive estimation requires number of shots of each task to be "
+            "specified, as it is used as the budget for the task."
+        )
 
     (
         estimation_tasks_to_measure,
@@ -316,47 +488,56 @@ def estimate_expectation_values_by_averaging(
         indices_not_to_measure,
     ) = split_estimation_tasks_to_measure(estimation_tasks)
 
-    non_measured_expectation_values_list = evaluate_non_measured_estimation_tasks(
-        estimation_tasks_not_to_measure
-    )
+    operators = [
+        change_operator_type(task.operator, IsingOperator)
+        for task in estimation_tasks_to_measure
+    ]
+    accumulators = [ExpectationValuesAccumulator(operator) for operator in operators]
+    budgets = [cast(int, task.number_of_shots) for task in estimation_tasks_to_measure]
+    shots_in_next_round = [min(pilot_number_of_shots, budget) for budget in budgets]
+
+    for _ in range(max_number_of_rounds):
+        active_indices = [i for i, shots in enumerate(shots_in_next_round) if shots]
+        if not active_indices:
+            break
 
-    if estimation_tasks_to_measure == []:
-        measured_expectation_values_list = []
-    else:
-        circuits, operators, shots_per_circuit = zip(
-            *[
-                (e.circuit, e.operator, e.number_of_shots)
-                for e in estimation_tasks_to_measure
-            ]
-        )
         measurements_list = backend.run_circuitset_and_measure(
-            circuits, shots_per_circuit
+            [estimation_tasks_to_measure[i].circuit for i in active_indices],
+            [shots_in_next_round[i] for i in active_indices],
         )
 
-        measured_expectation_values_list = [
-            expectation_values_to_real(
-                measurements.get_expectation_values(
-                    change_operator_type(frame_operator, IsingOperator)
-                )
+        for i, measurements in zip(active_indices, measurements_list):
+            accumulator = accumulators[i]
+            accumulator.add_measurements(measurements)
+            number_of_samples = accumulator.number_of_samples
+
+            standard_error = _standard_error_of_sum_with_prior(
+                accumulator.get_expectation_values(
+                    use_bessel_correction=number_of_samples > 1
+                ),
+                operators[i],
+                number_of_samples,
+            )
+            # Standard error decreases as 1/sqrt(number of samples).
+            required_number_of_samples = int(
+                np.ceil(number_of_samples * (standard_error / target_precision) ** 2)
+            )
+            shots_in_next_round[i] = max(
+                min(required_number_of_samples, budgets[i]) - number_of_samples, 0
             )
-            for frame_operator, measurements in zip(operators, measurements_list)
-        ]
 
     full_expectation_values: List[Optional[ExpectationValues]] = [
-        None
-        for _ in range(
-            len(estimation_tasks_not_to_measure) + len(estimation_tasks_to_measure)
-        )
+        None for _ in estimation_tasks
     ]
-
     for ex_val, final_index in zip(
-        non_measured_expectation_values_list, indices_not_to_measure
-    ):
-        full_expectation_values[final_index] = ex_val
-    for ex_val, final_index in zip(
-        measured_expectation_values_list, indices_to_measure
+        evaluate_non_measured_estimation_tasks(estimation_tasks_not_to_measure),
+        indices_not_to_measure,
     ):
         full_expectation_values[final_index] = ex_val
+    for accumulator, final_index in zip(accumulators, indices_to_measure):
+        full_expectation_values[final_index] = expectation_values_to_real(
+            accumulator.get_expectation_values()
+        )
 
     return cast(List[ExpectationValues], full_expectation_values)
 
@@ -367,14 +548,14 @@ def calculate_exact_expectation_values(
 ) -> List[ExpectationValues]:
     """Calculates exact expectation values using built-in method of a provided backend.
 
+    Circuits of all the tasks are simulated together, so that their common prefixes
+    are simulated only once.
+
     Args:
         backend: backend used for executing circuits
         estimation_tasks: list of estimation tasks
     """
-    expectation_values_list = [
-        backend.get_exact_expectation_values(
-            estimation_task.circuit, estimation_task.operator
-        )
-        for estimation_task in estimation_tasks
-    ]
-    return expectation_values_list
+    return backend.get_exact_expectation_values_for_circuitset(
+        [estimation_task.circuit for estimation_task in estimation_tasks],
+        [estimation_task.operator for estimation_task in estimation_tasks],
+    )
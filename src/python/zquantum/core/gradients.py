@@ -1,13 +1,33 @@
 ################################################################################
-# © Copyright 2020-2021 Zapata Computing Inc.
+# © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
 """Module with definitions of gradient."""
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
 import numpy as np
+import sympy
+
+from .circuits import Circuit, GateOperation
+from .circuits._gates import ControlledGate, Dagger, Gate, MatrixFactoryGate
+from .circuits._numpy_matrices import (
+    is_builtin_matrix_factory,
+    x_matrix,
+    y_matrix,
+    z_matrix,
+)
+from .circuits._simulation import _apply_operations_to_tensor
+from .circuits._state_vector_tools import _apply_matrix_numpy
+from .interfaces.backend import QuantumSimulator
+from .interfaces.estimation import EstimationTask
+from .openfermion import SymbolicOperator, apply_qubit_operator
 
 
 def finite_differences_gradient(function, finite_diff_step_size=1e-5):
     """Create a (central) finite differences gradient for a given function.
 
+    If the function has `batch` method (e.g. one created by `create_cost_function`),
+    all the shifted parameter vectors are evaluated in a single call to it.
+
     Args:
         function: callable accepting 1-D numpy arrays and returning float.
         finite_diff_step_size: finite difference size used to estimate gradient.
@@ -15,8 +35,18 @@ def finite_differences_gradient(function, finite_diff_step_size=1e-5):
         A function that returns a gradient estimation using central finite
         differences method.
     """
+    batch = getattr(function, "batch", None)
 
     def _gradient(parameters):
+        if batch is not None:
+            shifts = np.eye(len(parameters)) * finite_diff_step_size
+            # Rows are ordered as consecutive calls made when not batching.
+            parameters_matrix = np.stack(
+                [parameters + shifts, parameters - shifts], axis=1
+            ).reshape(2 * len(parameters), len(parameters))
+            values = np.asarray(batch(parameters_matrix), dtype=float)
+            return (values[::2] - values[1::2]) / (2 * finite_diff_step_size)
+
         gradient = np.array([])
         for idx in range(len(parameters)):
             values_plus = parameters.astype(float)
@@ -31,3 +61,463 @@ def finite_differences_gradient(function, finite_diff_step_size=1e-5):
         return gradient
 
     return _gradient
+
+
+# Builtin gates U(t) whose derivative is dU/dt = c * G @ U(t), as (c, G).
+_GATE_GENERATORS: Dict[str, Tuple[complex, np.ndarray]] = {
+    "RX": (-0.5j, x_matrix()),
+    "RY": (-0.5j, y_matrix()),
+    "RZ": (-0.5j, z_matrix()),
+    "PHASE": (1j, np.diag([0, 1]).astype(complex)),
+    "CPHASE": (1j, np.diag([0, 0, 0, 1]).astype(complex)),
+    "XX": (-0.5j, np.kron(x_matrix(), x_matrix())),
+    "YY": (-0.5j, np.kron(y_matrix(), y_matrix())),
+    "ZZ": (-0.5j, np.kron(z_matrix(), z_matrix())),
+    "XY": (
+        0.5j,
+        (np.kron(x_matrix(), x_matrix()) + np.kron(y_matrix(), y_matrix())) / 2,
+    ),
+}
+
+
+def _gate_generator(gate: Gate) -> Optional[Tuple[complex, np.ndarray]]:
+    """Find (c, G) such that derivative of gate's matrix is c * G @ matrix.
+
+    Generators commute with matrices of gates they generate, hence generator of
+    Dagger(U) is (conj(c), G), and controlled gates are generated by G acting on the
+    subspace in which all the control qubits are set.
+    """
+    if isinstance(gate, MatrixFactoryGate):
+        if gate.name in _GATE_GENERATORS and is_builtin_matrix_factory(
+            gate.name, gate.matrix_factory
+        ):
+            return _GATE_GENERATORS[gate.name]
+        return None
+    elif isinstance(gate, ControlledGate):
+        generator = _gate_generator(gate.wrapped_gate)
+        if generator is None:
+            return None
+        coefficient, wrapped_matrix = generator
+        matrix = np.zeros((2**gate.num_qubits,) * 2, dtype=complex)
+        matrix[-len(wrapped_matrix) :, -len(wrapped_matrix) :] = wrapped_matrix
+        return coefficient, matrix
+    elif isinstance(gate, Dagger):
+        generator = _gate_generator(gate.wrapped_gate)
+        if generator is None:
+            return None
+        return np.conj(generator[0]), generator[1]
+    return None
+
+
+def _gate_derivative_factories(gate: Gate) -> List[Callable[..., np.ndarray]]:
+    """Functions mapping gate params to derivatives of its matrix wrt each param."""
+    dummies = [sympy.Symbol(f"p_{i}", real=True) for i in range(len(gate.params))]
+    matrix = gate.replace_params(tuple(dummies)).matrix
+    return [
+        sympy.lambdify(dummies, matrix.diff(dummy), modules="numpy")
+        for dummy in dummies
+    ]
+
+
+def _param_derivatives(
+    circuit: Circuit, parametric_indices: Sequence[int], symbols: Sequence[sympy.Symbol]
+) -> Tuple[List[Tuple[int, int, int]], Callable[..., List[float]]]:
+    """Prepare chain rule: derivatives of symbolic gate params wrt circuit symbols.
+
+    Returns:
+        List of (operation index, param index, symbol index) triples, and a function
+        mapping values of symbols to derivatives corresponding to these triples.
+    """
+    indices: List[Tuple[int, int, int]] = []
+    expressions = []
+    for index in parametric_indices:
+        for param_index, param in enumerate(circuit.operations[index].params):
+            if not isinstance(param, sympy.Expr):
+                continue
+            for symbol_index, symbol in enumerate(symbols):
+                if symbol in param.free_symbols:
+                    indices.append((index, param_index, symbol_index))
+                    expressions.append(param.diff(symbol))
+    return indices, sympy.lambdify(symbols, expressions, modules="numpy")
+
+
+class _AdjointDifferentiator:
+    """Computes gradient of <psi(params)|H|psi(params)> for a single circuit."""
+
+    def __init__(
+        self,
+        circuit: Circuit,
+        operator: SymbolicOperator,
+        symbols: Sequence[sympy.Symbol],
+    ):
+        for operation in circuit.operations:
+            if not isinstance(operation, GateOperation):
+                raise ValueError(
+                    "Adjoint gradient supports only circuits comprising gates, got "
+                    f"{operation}."
+                )
+
+        self.compiled_circuit = circuit.compile(symbols)
+        self.n_symbols = len(symbols)
+
+        # Cost functions use real parts of expectation values, which are
+        # expectation values of the hermitian part of the operator.
+        self.operator = type(operator)()
+        self.operator.terms = {
+            term: np.real(complex(coefficient))
+            for term, coefficient in operator.terms.items()
+        }
+
+        self.parametric_indices = [
+            index
+            for index, operation in enumerate(circuit.operations)
+            if operation.free_symbols
+        ]
+        self.generators = {
+            index: _gate_generator(circuit.operations[index].gate)
+            for index in self.parametric_indices
+        }
+        self.derivative_factories = {
+            index: _gate_derivative_factories(circuit.operations[index].gate)
+            for index in self.parametric_indices
+            if self.generators[index] is None
+        }
+
+        (
+            self.param_derivative_indices,
+            self._evaluate_param_derivatives,
+        ) = _param_derivatives(circuit, self.parametric_indices, symbols)
+
+    def gradient(self, backend: QuantumSimulator, parameters: np.ndarray) -> np.ndarray:
+        circuit = self.compiled_circuit.bind(parameters)
+        n_qubits = circuit.n_qubits
+        gradient = np.zeros(self.n_symbols)
+        if not self.parametric_indices:
+            return gradient
+
+        state = np.asarray(backend.get_wavefunction(circuit).amplitudes, dtype=complex)
+        # The state and the costate H|psi> are propagated backwards together, as
+        # columns of a single tensor.
+        columns = np.stack([state, apply_qubit_operator(self.operator, state)], axis=1)
+        tensor = columns.reshape((2,) * n_qubits + (2,))
+
+        param_gradients: Dict[Tuple[int, int], float] = {}
+        next_index = len(circuit.operations)
+        for index in reversed(self.parametric_indices):
+            # Undo all the operations following the current one.
+            _apply_operations_to_tensor(
+                [
+                    operation.gate.dagger(*operation.qubit_indices)
+                    for operation in reversed(
+                        circuit.operations[index + 1 : next_index]
+                    )
+                ],
+                tensor,
+                n_qubits,
+            )
+            next_index = index
+            operation = circuit.operations[index]
+            state, costate = columns[:, 0], columns[:, 1]
+
+            generator = self.generators[index]
+            if generator is not None:
+                coefficient, matrix = generator
+                # dU|psi_before> = c G U|psi_before> = c G |psi_after>
+                derivative = _apply_matrix_numpy(matrix, operation.qubit_indices, state)
+                param_gradients[index, 0] = 2 * np.real(
+                    coefficient * np.vdot(costate, derivative)
+                )
+                _apply_operations_to_tensor(
+                    [operation.gate.dagger(*operation.qubit_indices)], tensor, n_qubits
+                )
+            else:
+                # The costate has to be taken after the operation, and the state
+                # before it.
+                costate = costate.copy()
+                _apply_operations_to_tensor(
+                    [operation.gate.dagger(*operation.qubit_indices)], tensor, n_qubits
+                )
+                state = columns[:, 0]
+                for param_index, factory in enumerate(self.derivative_factories[index]):
+                    derivative = _apply_matrix_numpy(
+                        np.asarray(factory(*operation.params), dtype=complex),
+                        operation.qubit_indices,
+                        state,
+                    )
+                    param_gradients[index, param_index] = 2 * np.real(
+                        np.vdot(costate, derivative)
+                    )
+
+        for (index, param_index, symbol_index), param_derivative in zip(
+            self.param_derivative_indices,
+            self._evaluate_param_derivatives(*parameters),
+        ):
+            gradient[symbol_index] += (
+                param_gradients[index, param_index] * param_derivative
+            )
+
+        return gradient
+
+
+def adjoint_gradient(function) -> Callable[[np.ndarray], np.ndarray]:
+    """Create gradient of a simulator-backed cost function using the adjoint method.
+
+    The function has to be created by `create_cost_function` with a QuantumSimulator
+    backend, no parameter preprocessors, and estimation tasks factory exposing the
+    parametrized tasks it binds (e.g. one created by
+    `expectation_value_estimation_tasks_factory`). The gradient is the exact
+    derivative of the sum of expectation values of the tasks' operators, regardless
+    of the estimation method used by the function.
+
+    For each task, the final state |psi> is simulated once, and all the derivatives
+    are obtained in a single backward sweep, in which |psi> and H|psi> are
+    propagated through the inverses of consecutive gates. Builtin rotation gates
+    are differentiated using their generators, other gates using derivatives of
+    their matrices. Derivatives wrt gate params are combined with derivatives of
+    symbolic expressions of these params to obtain the gradient wrt parameters.
+
+    Args:
+        function: cost function to be differentiated.
+    Returns:
+        A function computing gradient of `function`.
+    """
+    backend = getattr(function, "backend", None)
+    tasks_factory = getattr(function, "estimation_tasks_factory", None)
+    estimation_tasks = getattr(tasks_factory, "estimation_tasks", None)
+    symbols = getattr(tasks_factory, "circuit_symbols", None)
+
+    if not isinstance(backend, QuantumSimulator):
+        raise ValueError("Adjoint gradient requires a QuantumSimulator backend.")
+    if estimation_tasks is None or symbols is None:
+        raise ValueError(
+            "Adjoint gradient requires an estimation tasks factory exposing "
+            "parametrized estimation tasks and their symbols."
+        )
+    if getattr(function, "parameter_preprocessors", None):
+        raise ValueError("Adjoint gradient doesn't support parameter preprocessors.")
+
+    differentiators = [
+        _AdjointDifferentiator(task.circuit, task.operator, symbols)
+        for task in estimation_tasks
+    ]
+
+    def _gradient(parameters: np.ndarray) -> np.ndarray:
+        return np.sum(
+            [
+                differentiator.gradient(backend, parameters)
+                for differentiator in differentiators
+            ],
+            axis=0,
+        )
+
+    return _gradient
+
+
+def _shift_rule(gate: Gate) -> Optional[List[Tuple[float, float]]]:
+    """Find shifts s_i and coefficients c_i such that derivative of any expectation
+    value f wrt gate's param is sum_i c_i * (f(t + s_i) - f(t - s_i)).
+
+    Expectation values are trigonometric polynomials in t, with frequencies being
+    differences between eigenvalues of the gate's hermitian generator. Two-term rule
+    is used for a single frequency, and the rules with equidistant shifts for
+    multiple equidistant frequencies (e.g. four-term rule for XY gate).
+    """
+    generator = _gate_generator(gate)
+    if generator is None:
+        return None
+    coefficient, matrix = generator
+    # U(t) = exp(c t G) = exp(-i t H) with hermitian H = i c G.
+    eigenvalues = np.linalg.eigvalsh(1j * coefficient * matrix)
+    differences = np.round(np.abs(np.subtract.outer(eigenvalues, eigenvalues)), 9)
+    frequencies = np.unique(differences[differences > 0])
+    if len(frequencies) == 0:
+        return None
+
+    base_frequency = frequencies[-1] / len(frequencies)
+    if not np.allclose(
+        frequencies, base_frequency * np.arange(1, len(frequencies) + 1)
+    ):
+        return None
+    shifts = (
+        (2 * np.arange(1, len(frequencies) + 1) - 1)
+        * np.pi
+        / (2 * len(frequencies) * base_frequency)
+    )
+    # f(t + s) - f(t - s) = sum_w 2 sin(w s) / w * (w-component of df/dt)
+    coefficients = np.linalg.solve(
+        2 * np.sin(np.outer(frequencies, shifts)) / frequencies[:, None],
+        np.ones(len(frequencies)),
+    )
+    return list(zip(shifts.tolist(), coefficients.tolist()))
+
+
+class _ParameterShiftDifferentiator:
+    """Generates shifted tasks for a single task and combines their results."""
+
+    def __init__(self, task: EstimationTask, symbols: Sequence[sympy.Symbol]):
+        circuit = task.circuit
+        self.task = task
+        self.compiled_circuit = circuit.compile(symbols)
+        self.n_symbols = len(symbols)
+        self.parametric_indices = [
+            index
+            for index, operation in enumerate(circuit.operations)
+            if operation.free_symbols
+        ]
+
+        self.shift_rules = {}
+        for index in self.parametric_indices:
+            operation = circuit.operations[index]
+            shift_rule = (
+                _shift_rule(operation.gate)
+                if isinstance(operation, GateOperation)
+                else None
+            )
+            if shift_rule is None:
+                raise ValueError(
+                    "Parameter-shift gradient supports only builtin rotation gates "
+                    "and their controlled and daggered versions, got "
+                    f"{operation}."
+                )
+            self.shift_rules[index] = shift_rule
+
+        (
+            self.param_derivative_indices,
+            self._evaluate_param_derivatives,
+        ) = _param_derivatives(circuit, self.parametric_indices, symbols)
+
+    def shifted_tasks(self, parameters: np.ndarray) -> List[EstimationTask]:
+        """Tasks whose values are needed for the gradient, in order expected by
+        `gradient`."""
+        operations = self.compiled_circuit.bind(parameters).operations
+        tasks = []
+        for index in self.parametric_indices:
+            operation = operations[index]
+            value = float(np.real(operation.params[0]))
+            for shift, _ in self.shift_rules[index]:
+                for shifted_value in (value + shift, value - shift):
+                    shifted_operations = list(operations)
+                    shifted_operations[index] = operation.replace_params(
+                        (shifted_value,)
+                    )
+                    tasks.append(
+                        EstimationTask(
+                            self.task.operator,
+                            Circuit(shifted_operations, self.task.circuit.n_qubits),
+                            self.task.number_of_shots,
+                        )
+                    )
+        return tasks
+
+    def gradient(self, parameters: np.ndarray, values: Sequence[float]) -> np.ndarray:
+        gradient = np.zeros(self.n_symbols)
+        param_gradients: Dict[Tuple[int, int], float] = {}
+        values_iterator = iter(values)
+        for index in self.parametric_indices:
+            param_gradients[index, 0] = sum(
+                coefficient * (next(values_iterator) - next(values_iterator))
+                for _, coefficient in self.shift_rules[index]
+            )
+
+        for (index, param_index, symbol_index), param_derivative in zip(
+            self.param_derivative_indices,
+            self._evaluate_param_derivatives(*parameters),
+        ):
+            gradient[symbol_index] += (
+                param_gradients[index, param_index] * param_derivative
+            )
+        return gradient
+
+
+def _circuit_key(circuit: Circuit) -> Hashable:
+    try:
+        key: Hashable = (circuit.n_qubits, tuple(circuit.operations))
+        hash(key)
+    except TypeError:
+        key = id(circuit)
+    return key
+
+
+def parameter_shift_gradient(function) -> Callable[[np.ndarray], np.ndarray]:
+    """Create gradient of a cost function using parameter-shift rules.
+
+    The function has to be created by `create_cost_function` with no parameter
+    preprocessors and estimation tasks factory exposing the parametrized tasks it
+    binds (e.g. one created by `expectation_value_estimation_tasks_factory`).
+    Parametrized gates of the tasks' circuits have to be builtin rotation gates
+    (RX, RY, RZ, PHASE, CPHASE, XX, YY, ZZ or XY), possibly controlled or daggered.
+
+    Contrary to finite differences, the gradient is an unbiased estimator of the
+    exact one when expectation values are estimated from samples. Derivative wrt
+    each gate param is a combination of values of the function with this param
+    shifted by finite amounts: two-term rule is used for gates whose expectation
+    values have a single frequency, and four-term rule for the remaining ones (XY
+    and controlled rotations). All the shifted tasks are generated upfront,
+    identical ones are deduplicated, and they are estimated with the function's
+    estimation method in a single call, hence circuits are submitted to the backend
+    in a single `run_circuitset_and_measure` call.
+
+    Args:
+        function: cost function to be differentiated.
+    Returns:
+        A function computing gradient of `function`.
+    """
+    backend = getattr(function, "backend", None)
+    estimation_method = getattr(function, "estimation_method", None)
+    tasks_factory = getattr(function, "estimation_tasks_factory", None)
+    estimation_tasks = getattr(tasks_factory, "estimation_tasks", None)
+    symbols = getattr(tasks_factory, "circuit_symbols", None)
+
+    if backend is None or estimation_method is None:
+        raise ValueError(
+            "Parameter-shift gradient requires a function exposing its backend "
+            "and estimation method."
+        )
+    if estimation_tasks is None or symbols is None:
+        raise ValueError(
+            "Parameter-shift gradient requires an estimation tasks factory exposing "
+            "parametrized estimation tasks and their symbols."
+        )
+    if getattr(function, "parameter_preprocessors", None):
+        raise ValueError(
+            "Parameter-shift gradient doesn't support parameter preprocessors."
+        )
+
+    differentiators = [
+        _ParameterShiftDifferentiator(task, symbols) for task in estimation_tasks
+    ]
+
+    def _gradient(parameters: np.ndarray) -> np.ndarray:
+        unique_tasks: List[EstimationTask] = []
+        unique_task_indices: Dict[Any, int] = {}
+        indices_per_differentiator = []
+        for differentiator in differentiators:
+            indices = []
+            for task in differentiator.shifted_tasks(parameters):
+                key = (
+                    id(task.operator),
+                    task.number_of_shots,
+                    _circuit_key(task.circuit),
+                )
+                if key not in unique_task_indices:
+                    unique_task_indices[key] = len(unique_tasks)
+                    unique_tasks.append(task)
+                indices.append(unique_task_indices[key])
+            indices_per_differentiator.append(indices)
+
+        expectation_values_list = (
+            estimation_method(backend, unique_tasks) if unique_tasks else []
+        )
+        values = [
+            float(np.sum(np.real(expectation_values.values)))
+            for expectation_values in expectation_values_list
+        ]
+
+        gradient = np.zeros(len(symbols))
+        for differentiator, indices in zip(differentiators, indices_per_differentiator):
+            gradient += differentiator.gradient(
+                parameters, [values[index] for index in indices]
+            )
+        return gradient
+
+    return _gradient
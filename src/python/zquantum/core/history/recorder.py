@@ -3,7 +3,7 @@
 ################################################################################
 """Main implementation of the recorder."""
 import copy
-from typing import Any, Callable, Dict, Generic, List, NamedTuple, TypeVar
+from typing import Any, Callable, Dict, Generic, List, NamedTuple, Sequence, TypeVar
 
 from typing_extensions import overload
 
@@ -112,6 +112,32 @@ class SimpleRecorder(Generic[S, T]):
         self.call_number += 1
         return return_value
 
+    def batch(self, params_matrix: Sequence[S]) -> List[T]:
+        """Evaluate the target function at each row of params matrix, saving calls
+        as if they were made one after another.
+
+        If the target function has `batch` method, all the rows are evaluated in a
+        single call to it.
+
+        Args:
+            params_matrix: arguments to be passed to the target function.
+
+        Returns:
+            List of values returned by the target function.
+        """
+        target_batch = getattr(self.target, "batch", None)
+        if target_batch is None:
+            return [self(params) for params in params_matrix]
+
+        return_values = list(target_batch(params_matrix))
+        for params, return_value in zip(params_matrix, return_values):
+            if self.predicate(return_value, params, self.call_number):
+                self.history.append(
+                    HistoryEntry(self.call_number, copy.copy(params), return_value)
+                )
+            self.call_number += 1
+        return return_values
+
     def __getattr__(self, item):
         return getattr(self.target, item)
 
@@ -164,6 +190,31 @@ class ArtifactRecorder(Generic[S, T]):
         self.call_number += 1
         return return_value
 
+    def batch(self, params_matrix: Sequence[S]) -> List[T]:
+        """Evaluate the target function at each row of params matrix.
+
+        Calls are saved as in `SimpleRecorder.batch`. Batched evaluations of the
+        target function can't store artifacts, hence they are saved with empty
+        artifact collections.
+        """
+        target_batch = getattr(self.target, "batch", None)
+        if target_batch is None:
+            return [self(params) for params in params_matrix]
+
+        return_values = list(target_batch(params_matrix))
+        for params, return_value in zip(params_matrix, return_values):
+            if self.predicate(return_value, params, self.call_number):
+                self.history.append(
+                    HistoryEntryWithArtifacts(
+                        self.call_number,
+                        copy.copy(params),
+                        return_value,
+                        ArtifactCollection(),
+                    )
+                )
+            self.call_number += 1
+        return return_values
+
     def __getattr__(self, name):
         return getattr(self.target, name)
 
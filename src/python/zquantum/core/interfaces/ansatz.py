@@ -9,9 +9,8 @@ import numpy as np
 import sympy
 from overrides import EnforceOverrides
 
-from ..circuits import Circuit, natural_key_revlex
+from ..circuits import Circuit, CompiledCircuit, natural_key_revlex
 from ..typing import SupportsLessThan
-from ..utils import create_symbols_map
 from .ansatz_utils import ansatz_property
 
 SymbolsSortKey = Callable[[sympy.Symbol], SupportsLessThan]
@@ -84,15 +83,28 @@ class Ansatz(ABC, EnforceOverrides):
         if params is None:
             raise Exception("Parameters can't be None for executable circuit.")
         if self.supports_parametrized_circuits:
-            symbols = sorted(
-                self.parametrized_circuit.free_symbols, key=self.symbols_sort_key
-            )
-            symbols_map = create_symbols_map(symbols, params)
-            executable_circuit = self.parametrized_circuit.bind(symbols_map)
-            return executable_circuit
+            return self.compiled_circuit.bind(params)
         else:
             return self._generate_circuit(params)
 
+    @property
+    def compiled_circuit(self) -> CompiledCircuit:
+        """Returns compiled parametrized circuit if given ansatz supports it.
+
+        The circuit is compiled with symbols ordered according to `symbols_sort_key`,
+        and recompiled only if the parametrized circuit changes.
+        """
+        circuit = self.parametrized_circuit
+        compiled_circuit: Optional[CompiledCircuit] = getattr(
+            self, "_compiled_circuit", None
+        )
+        if compiled_circuit is None or compiled_circuit.circuit is not circuit:
+            compiled_circuit = circuit.compile(
+                sorted(circuit.free_symbols, key=self.symbols_sort_key)
+            )
+            self._compiled_circuit = compiled_circuit
+        return compiled_circuit
+
     @property
     def symbols_sort_key(self) -> SymbolsSortKey:
         return natural_key_revlex
@@ -0,0 +1,196 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Asynchronous counterpart of QuantumBackend interface.
+
+Remote devices spend most of the time of each job in queues. Submitting several
+jobs at once and awaiting them concurrently allows to overlap this latency. Existing
+backends can be used asynchronously by wrapping them in `SyncBackendAdapter`, and
+`LocalAsyncSimulator` mimics a remote device with local simulator and artificial
+latency.
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from typing_extensions import Protocol
+
+from ..circuits import Circuit
+from ..measurement import Measurements
+from .backend import QuantumBackend, QuantumSimulator
+
+T = TypeVar("T")
+
+
+def _call_with_lock(lock: threading.Lock, function: Callable[..., T], *args) -> T:
+    with lock:
+        return function(*args)
+
+
+class AsyncQuantumBackend(Protocol):
+    """Protocol of backends executing circuits asynchronously."""
+
+    async def run_circuitset_and_measure(
+        self, circuits: Sequence[Circuit], n_samples: Sequence[int]
+    ) -> List[Measurements]:
+        """Run a set of circuits and measure a certain number of bitstrings.
+
+        Args:
+            circuits: The circuits to execute.
+            n_samples: The number of samples to collect for each circuit.
+        """
+
+
+class SyncBackendAdapter:
+    """Asynchronous backend executing jobs on a synchronous one.
+
+    Circuits passed to `run_circuitset_and_measure` are split into jobs of at most
+    `batch_size` circuits, and each job is run by the wrapped backend in a pool of
+    workers. At most `max_concurrent_jobs` jobs are executed at the same time.
+
+    Simulators aren't thread-safe (e.g. their counters of circuits and jobs run, or
+    `last_gate_fusion_report` of SymbolicSimulator), and gain little from running
+    in concurrent threads. Hence, if the wrapped backend is a QuantumSimulator and
+    jobs are executed in threads, calls to the simulator are serialized. Calls to
+    other backends run concurrently, so their state has to be thread-safe.
+
+    Args:
+        backend: the backend to be wrapped.
+        max_concurrent_jobs: maximum number of jobs executed concurrently.
+        batch_size: maximum number of circuits in a single job. Defaults to the
+            `batch_size` of the wrapped backend if it supports batching, and to 1
+            otherwise.
+        executor: pool of workers executing jobs. Defaults to a pool of
+            `max_concurrent_jobs` threads. Note that if a process pool is used, the
+            counters of circuits and jobs run are not updated in the wrapped
+            backend, since jobs are run by its copies in worker processes.
+
+    Attributes:
+        backend: See Args.
+        max_concurrent_jobs: See Args.
+        batch_size: See Args.
+    """
+
+    def __init__(
+        self,
+        backend: QuantumBackend,
+        max_concurrent_jobs: int = 4,
+        batch_size: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be positive.")
+        if batch_size is None:
+            batch_size = backend.batch_size if backend.supports_batching else 1
+        if batch_size is None or batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+
+        self.backend = backend
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.batch_size = batch_size
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_concurrent_jobs)
+            if executor is None
+            else executor
+        )
+        self._lock: Optional[threading.Lock] = (
+            threading.Lock()
+            if isinstance(backend, QuantumSimulator)
+            and not isinstance(self._executor, ProcessPoolExecutor)
+            else None
+        )
+
+    async def _execute_job(
+        self, circuits: Sequence[Circuit], n_samples: Sequence[int]
+    ) -> List[Measurements]:
+        job: Callable[..., List[Measurements]] = (
+            self.backend.run_circuitset_and_measure
+            if self._lock is None
+            else partial(
+                _call_with_lock, self._lock, self.backend.run_circuitset_and_measure
+            )
+        )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, job, circuits, n_samples
+        )
+
+    async def _submit_job(
+        self,
+        semaphore: asyncio.Semaphore,
+        circuits: Sequence[Circuit],
+        n_samples: Sequence[int],
+    ) -> List[Measurements]:
+        async with semaphore:
+            return await self._execute_job(circuits, n_samples)
+
+    async def run_circuitset_and_measure(
+        self, circuits: Sequence[Circuit], n_samples: Sequence[int]
+    ) -> List[Measurements]:
+        """Run a set of circuits and measure a certain number of bitstrings.
+
+        Args:
+            circuits: The circuits to execute.
+            n_samples: The number of samples to collect for each circuit.
+        """
+        circuits, n_samples = list(circuits), list(n_samples)
+        semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        jobs_results = await asyncio.gather(
+            *(
+                self._submit_job(
+                    semaphore,
+                    circuits[start : start + self.batch_size],
+                    n_samples[start : start + self.batch_size],
+                )
+                for start in range(0, len(circuits), self.batch_size)
+            )
+        )
+        return [measurements for result in jobs_results for measurements in result]
+
+    def shutdown(self):
+        """Release resources of the pool of workers executing jobs."""
+        self._executor.shutdown()
+
+
+class LocalAsyncSimulator(SyncBackendAdapter):
+    """Local stand-in for a remote device, executing jobs on a simulator.
+
+    Each job waits for `latency` seconds before it is executed, mimicking time
+    spent in a queue of a remote device. The job occupies one of the
+    `max_concurrent_jobs` slots also while waiting.
+
+    Args:
+        simulator: simulator executing circuits.
+        latency: number of seconds each job waits before being executed.
+        max_concurrent_jobs: maximum number of jobs executed concurrently.
+        batch_size: maximum number of circuits in a single job.
+        use_processes: whether to execute jobs in a pool of processes instead of
+            threads. The simulator has to be picklable in such case.
+    """
+
+    def __init__(
+        self,
+        simulator: QuantumSimulator,
+        latency: float = 0.0,
+        max_concurrent_jobs: int = 4,
+        batch_size: Optional[int] = None,
+        use_processes: bool = False,
+    ):
+        if latency < 0:
+            raise ValueError("latency can't be negative.")
+        super().__init__(
+            simulator,
+            max_concurrent_jobs,
+            batch_size,
+            ProcessPoolExecutor(max_workers=max_concurrent_jobs)
+            if use_processes
+            else None,
+        )
+        self.latency = latency
+
+    async def _execute_job(
+        self, circuits: Sequence[Circuit], n_samples: Sequence[int]
+    ) -> List[Measurements]:
+        await asyncio.sleep(self.latency)
+        return await super()._execute_job(circuits, n_samples)
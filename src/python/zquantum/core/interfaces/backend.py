@@ -2,22 +2,44 @@
 # © Copyright 2020-2022 Zapata Computing Inc.
 ################################################################################
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Sequence, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union, cast
 
 import numpy as np
+from sympy import Symbol
 from zquantum.core.bitstring_distribution import BitstringDistribution
 from zquantum.core.openfermion import IsingOperator, QubitOperator, SymbolicOperator
 from zquantum.core.wavefunction import Wavefunction
 
-from ..circuits import Circuit, GateOperation, Operation
+from ..circuits import (
+    Circuit,
+    ControlledGate,
+    Dagger,
+    Gate,
+    GateOperation,
+    MatrixFactoryGate,
+    Operation,
+    circuit_from_dict,
+    to_dict,
+)
 from ..circuits._circuit import split_circuit
+from ..circuits._gates import _numeric_params
 from ..circuits.layouts import CircuitConnectivity
 from ..distribution import (
     MeasurementOutcomeDistribution,
     create_bitstring_distribution_from_probability_distribution,
 )
-from ..measurement import ExpectationValues, Measurements, expectation_values_to_real
-from ..openfermion import change_operator_type, get_expectation_value
+from ..measurement import (
+    ExpectationValues,
+    Measurements,
+    expectation_values_to_real,
+    sample_packed_outcomes_from_wavefunction,
+)
+from ..openfermion import (
+    change_operator_type,
+    get_expectation_value,
+    get_expectation_values_of_terms,
+)
 
 # Note that in particular Wavefunction is a StateVector. However, for performance
 # reasons QuantumSimulator uses numpy arrays internally.
@@ -152,8 +174,29 @@ class QuantumSimulator(QuantumBackend):
     natively supported operation AND concrete implementation does not change
     counting methodology, each simulated circuit corresponds to an increase
     of both those numbers by one.
+
+    Setting `n_workers` enables parallel mode of `run_circuitset_and_measure`,
+    in which circuits are distributed over a pool of `n_workers` processes. In
+    this mode, samples of i-th circuit are drawn from a random number generator
+    seeded with i-th child of `SeedSequence(seed)`, hence the results are
+    reproducible and don't depend on the number of workers.
+
+    Simulators sampling measurements from exact wavefunctions (as indicated by
+    `samples_from_exact_wavefunction`) simulate common prefixes of circuits passed
+    to `run_circuitset_and_measure` only once, see `get_wavefunctions`.
+
+    Attributes:
+        n_workers: number of processes used by `run_circuitset_and_measure`, or
+            None if circuits are run sequentially, one by one.
+        samples_from_exact_wavefunction: whether `run_circuit_and_measure` is
+            equivalent to sampling from the wavefunction returned by
+            `get_wavefunction`, which is not the case e.g. for noisy simulators.
     """
 
+    n_workers: Optional[int] = None
+    samples_from_exact_wavefunction: bool = False
+    _seed: Optional[int] = None
+
     @abstractmethod
     def __init__(
         self,
@@ -186,6 +229,111 @@ class QuantumSimulator(QuantumBackend):
         """
         return isinstance(operation, GateOperation)
 
+    def _run_circuit_and_measure_with_seed(
+        self,
+        circuit: Circuit,
+        n_samples: int,
+        seed: Union[None, int, np.random.SeedSequence],
+    ) -> Measurements:
+        """Run a circuit and sample measurements using generator seeded with `seed`.
+
+        The default implementation samples from the exact wavefunction, hence it can
+        only be used by simulators with `samples_from_exact_wavefunction` set.
+        Other simulators (e.g. ones modelling noise) have to override it to support
+        parallel mode.
+        """
+        if not self.samples_from_exact_wavefunction:
+            raise NotImplementedError(
+                f"{type(self).__name__} doesn't sample from exact wavefunctions, "
+                "hence it has to override _run_circuit_and_measure_with_seed to run "
+                "circuits in parallel mode."
+            )
+        return self._sample_wavefunction(
+            self.get_wavefunction(circuit), n_samples, seed
+        )
+
+    def _sample_wavefunction(
+        self,
+        wavefunction: Wavefunction,
+        n_samples: int,
+        seed: Union[None, int, np.random.SeedSequence],
+    ) -> Measurements:
+        if wavefunction.free_symbols:
+            raise ValueError(
+                "Cannot sample from wavefunction with symbolic parameters."
+            )
+
+        return Measurements.from_packed_outcomes(
+            sample_packed_outcomes_from_wavefunction(wavefunction, n_samples, seed),
+            wavefunction.n_qubits,
+        )
+
+    def run_circuitset_and_measure(
+        self, circuits: Sequence[Circuit], n_samples: Sequence[int]
+    ) -> List[Measurements]:
+        """Run a set of circuits and measure a certain number of bitstrings.
+
+        If `n_workers` is set, circuits are run in parallel (see class docstring).
+        Otherwise, this is the same as `QuantumBackend.run_circuitset_and_measure`,
+        except that simulators sampling from exact wavefunctions simulate common
+        prefixes of circuits only once.
+
+        Args:
+            circuits: The circuits to execute.
+            n_samples: The number of samples to collect for each circuit.
+        """
+        if self.n_workers is not None and self.n_workers < 1:
+            raise ValueError("Number of workers has to be positive.")
+
+        seeds: Sequence[Union[None, int, np.random.SeedSequence]] = (
+            [self._seed] * len(circuits)
+            if self.n_workers is None
+            else np.random.SeedSequence(self._seed).spawn(len(circuits))
+        )
+
+        if self.samples_from_exact_wavefunction and (
+            self.n_workers is None or self.n_workers == 1 or len(circuits) <= 1
+        ):
+            return [
+                self._sample_wavefunction(wavefunction, n, seed)
+                for wavefunction, n, seed in zip(
+                    self.get_wavefunctions(circuits), n_samples, seeds
+                )
+            ]
+
+        if self.n_workers is None:
+            return super().run_circuitset_and_measure(circuits, n_samples)
+
+        if self.n_workers == 1 or len(circuits) <= 1:
+            return [
+                self._run_circuit_and_measure_with_seed(circuit, n, seed)
+                for circuit, n, seed in zip(circuits, n_samples, seeds)
+            ]
+
+        n_workers = min(self.n_workers, len(circuits))
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_initialize_worker,
+            initargs=(self,),
+        ) as executor:
+            results = list(
+                executor.map(
+                    _run_serialized_circuit,
+                    [
+                        (to_dict(circuit), n, seed)
+                        for circuit, n, seed in zip(circuits, n_samples, seeds)
+                    ],
+                    chunksize=max(len(circuits) // (4 * n_workers), 1),
+                )
+            )
+
+        # Counters of simulators in worker processes are not shared with this one.
+        for _, number_of_circuits_run, number_of_jobs_run in results:
+            self.number_of_circuits_run += number_of_circuits_run
+            self.number_of_jobs_run += number_of_jobs_run
+
+        return [measurements for measurements, _, _ in results]
+
     def get_wavefunction(
         self, circuit: Circuit, initial_state: Optional[StateVector] = None
     ) -> Wavefunction:
@@ -203,20 +351,134 @@ class QuantumSimulator(QuantumBackend):
         else:
             state = initial_state
 
+        state, number_of_native_circuits = self._simulate(circuit, state)
+        # Native subcircuits count towards number of circuits and number of jobs run.
+        self.number_of_circuits_run += number_of_native_circuits
+        self.number_of_jobs_run += number_of_native_circuits
+        return Wavefunction(state)
+
+    def _simulate(
+        self, circuit: Circuit, initial_state: StateVector
+    ) -> Tuple[StateVector, int]:
+        """Simulate circuit without updating counters.
+
+        Returns:
+            Tuple (final state, number of native subcircuits run).
+        """
+        state = initial_state
+        number_of_native_circuits = 0
         for is_supported, subcircuit in split_circuit(
             circuit, self.is_natively_supported
         ):
             # Native subcircuits are passed through to the underlying simulator.
-            # They also count towards number of circuits and number of jobs run.
             if is_supported:
-                self.number_of_circuits_run += 1
-                self.number_of_jobs_run += 1
+                number_of_native_circuits += 1
                 state = self._get_wavefunction_from_native_circuit(subcircuit, state)
             else:
                 for operation in subcircuit.operations:
                     state = operation.apply(state)
+        return state, number_of_native_circuits
 
-        return Wavefunction(state)
+    def get_wavefunctions(self, circuits: Sequence[Circuit]) -> List[Wavefunction]:
+        """Returns wavefunctions produced by each circuit from a set.
+
+        Operations shared by circuits are simulated only once. For instance, if all
+        the circuits comprise the same ansatz followed by different measurement
+        basis changes, the ansatz is simulated once and its final state is used as
+        an initial state of simulation of each suffix. Each circuit counts once
+        towards `number_of_circuits_run` and `number_of_jobs_run`.
+
+        Simulators overriding `get_wavefunction` simulate each circuit separately
+        using the overridden method.
+
+        Args:
+            circuits: quantum circuits to be executed.
+        Returns:
+            List of wavefunctions, i-th of them produced by i-th circuit.
+        """
+        if type(self).get_wavefunction is not QuantumSimulator.get_wavefunction:
+            return [self.get_wavefunction(circuit) for circuit in circuits]
+
+        states: List[Optional[StateVector]] = [None] * len(circuits)
+        for n_qubits in set(circuit.n_qubits for circuit in circuits):
+            initial_state = np.zeros(2**n_qubits)
+            initial_state[0] = 1
+            self._simulate_prefix_tree(
+                _PrefixNode.from_circuits(circuits, n_qubits),
+                initial_state,
+                n_qubits,
+                states,
+            )
+
+        self.number_of_circuits_run += len(circuits)
+        self.number_of_jobs_run += len(circuits)
+        return [Wavefunction(cast(StateVector, state)) for state in states]
+
+    def _simulate_prefix_tree(
+        self,
+        root: "_PrefixNode",
+        initial_state: StateVector,
+        n_qubits: int,
+        states: List[Optional[StateVector]],
+    ):
+        # Nodes are visited depth first, so that only states at branching points
+        # are stored at any given time.
+        stack = [(root, initial_state)]
+        while stack:
+            node, state = stack.pop()
+            for circuit_index in node.circuit_indices:
+                states[circuit_index] = np.array(state, copy=True)
+
+            children = list(node.children.values())
+            for i, child in enumerate(children):
+                # Only the root of the tree has no operation.
+                operations = [cast(Operation, child.operation)]
+                # Chains of nodes without branching are simulated in one go.
+                while len(child.children) == 1 and not child.circuit_indices:
+                    child = next(iter(child.children.values()))
+                    operations.append(cast(Operation, child.operation))
+
+                # The last child can take over the state of its parent.
+                child_initial_state = (
+                    state if i == len(children) - 1 else np.array(state, copy=True)
+                )
+                stack.append(
+                    (
+                        child,
+                        self._simulate(
+                            Circuit(operations, n_qubits), child_initial_state
+                        )[0],
+                    )
+                )
+
+    def get_wavefunctions_batch(
+        self,
+        circuit: Circuit,
+        params_matrix: np.ndarray,
+        symbols_order: Optional[Sequence[Symbol]] = None,
+    ) -> List[Wavefunction]:
+        """Returns wavefunctions produced by a circuit for many parameter vectors.
+
+        The default implementation binds and simulates the circuit separately for
+        each parameter vector. Simulators capable of evolving many states at once
+        should override this method.
+
+        Args:
+            circuit: parametrized quantum circuit to be executed.
+            params_matrix: K x P array, whose rows are parameter vectors.
+            symbols_order: symbols corresponding to consecutive columns of
+              `params_matrix`. If not provided, `circuit.free_symbols` is used.
+        Returns:
+            List of K wavefunctions, k-th of them corresponding to k-th row
+            of `params_matrix`.
+        """
+        compiled_circuit = circuit.compile(
+            circuit.free_symbols if symbols_order is None else symbols_order
+        )
+        return [
+            self.get_wavefunction(compiled_circuit.bind(params))
+            for params in np.asarray(params_matrix)
+        ]
 
     def get_exact_expectation_values(
         self, circuit: Circuit, operator: SymbolicOperator
@@ -228,14 +490,37 @@ class QuantumSimulator(QuantumBackend):
             circuit: quantum circuit to be executed.
             operator: Operator for which we calculate the expectation value.
         """
-        wavefunction = self.get_wavefunction(circuit)
-        if isinstance(operator, IsingOperator):
-            operator = change_operator_type(operator, QubitOperator)
-        expectation_values = ExpectationValues(
-            np.array([get_expectation_value(term, wavefunction) for term in operator])
-        )
-        expectation_values = expectation_values_to_real(expectation_values)
-        return expectation_values
+        return _exact_expectation_values(self.get_wavefunction(circuit), operator)
+
+    def get_exact_expectation_values_for_circuitset(
+        self, circuits: Sequence[Circuit], operators: Sequence[SymbolicOperator]
+    ) -> List[ExpectationValues]:
+        """Calculates the expectation values for given operators, based on the exact
+        quantum states produced by corresponding circuits.
+
+        Common prefixes of circuits are simulated once, see `get_wavefunctions`.
+        Simulators overriding `get_exact_expectation_values` evaluate each circuit
+        separately using the overridden method.
+
+        Args:
+            circuits: quantum circuits to be executed.
+            operators: operators for which we calculate the expectation values,
+                i-th of them is evaluated on the state produced by i-th circuit.
+        """
+        if (
+            type(self).get_exact_expectation_values
+            is not QuantumSimulator.get_exact_expectation_values
+        ):
+            return [
+                self.get_exact_expectation_values(circuit, operator)
+                for circuit, operator in zip(circuits, operators)
+            ]
+        return [
+            _exact_expectation_values(wavefunction, operator)
+            for wavefunction, operator in zip(
+                self.get_wavefunctions(circuits), operators
+            )
+        ]
 
     def get_measurement_outcome_distribution(
         self, circuit: Circuit, n_samples: Optional[int] = None
@@ -279,3 +564,109 @@ class QuantumSimulator(QuantumBackend):
                 circuit, n_samples
             ).distribution_dict
         )
+
+
+def _exact_expectation_values(
+    wavefunction: Wavefunction, operator: SymbolicOperator
+) -> ExpectationValues:
+    if wavefunction.free_symbols:
+        if isinstance(operator, IsingOperator):
+            operator = change_operator_type(operator, QubitOperator)
+        values = np.array(
+            [get_expectation_value(term, wavefunction) for term in operator]
+        )
+    else:
+        values = get_expectation_values_of_terms(operator, wavefunction)
+    return expectation_values_to_real(ExpectationValues(values))
+
+
+class _PrefixNode:
+    """Node of a trie of circuit operations.
+
+    Path from the root to the node corresponds to a sequence of operations, and
+    `circuit_indices` lists circuits comprising exactly this sequence.
+    """
+
+    def __init__(self, operation: Optional[Operation] = None):
+        self.operation = operation
+        self.children: Dict[Any, "_PrefixNode"] = {}
+        self.circuit_indices: List[int] = []
+
+    @classmethod
+    def from_circuits(cls, circuits: Sequence[Circuit], n_qubits: int) -> "_PrefixNode":
+        """Build a trie of operations of circuits acting on given number of qubits."""
+        root = cls()
+        for index, circuit in enumerate(circuits):
+            if circuit.n_qubits != n_qubits:
+                continue
+            node = root
+            for operation in circuit.operations:
+                key = _operation_key(operation)
+                if key not in node.children:
+                    node.children[key] = cls(operation)
+                node = node.children[key]
+            node.circuit_indices.append(index)
+        return root
+
+
+def _operation_key(operation: Operation) -> Hashable:
+    """Cheap signature of an operation, used instead of comparing operations.
+
+    Comparing gates evaluates their parameters symbolically, which is far slower than
+    simulating them. Operations with symbolic parameters, or of types other than
+    GateOperation, are shared only if they are the same object.
+    """
+    if isinstance(operation, GateOperation):
+        gate_key = _gate_key(operation.gate)
+        if gate_key is not None:
+            return (gate_key, operation.qubit_indices)
+    return ("id", id(operation))
+
+
+def _gate_key(gate: Gate) -> Optional[Hashable]:
+    if isinstance(gate, MatrixFactoryGate):
+        params = _numeric_params(gate.params)
+        if params is None:
+            return None
+        return (gate.name, id(gate.matrix_factory), params)
+    if isinstance(gate, (ControlledGate, Dagger)):
+        wrapped_key = _gate_key(gate.wrapped_gate)
+        if wrapped_key is None:
+            return None
+        if isinstance(gate, ControlledGate):
+            return ("control", wrapped_key, gate.num_control_qubits)
+        return ("dagger", wrapped_key)
+    return None
+
+
+# Copy of the simulator used by a process from the pool created in parallel mode of
+# QuantumSimulator.run_circuitset_and_measure.
+_worker_simulator: Optional[QuantumSimulator] = None
+
+
+def _initialize_worker(simulator: QuantumSimulator):
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _run_serialized_circuit(
+    task: Tuple[Dict, int, np.random.SeedSequence]
+) -> Tuple[Measurements, int, int]:
+    """Run circuit serialized with `to_dict` on the simulator of this worker.
+
+    Returns:
+        Tuple (measurements, number of circuits run, number of jobs run).
+    """
+    circuit_dict, n_samples, seed = task
+    simulator = cast(QuantumSimulator, _worker_simulator)
+    number_of_circuits_run = simulator.number_of_circuits_run
+    number_of_jobs_run = simulator.number_of_jobs_run
+
+    measurements = simulator._run_circuit_and_measure_with_seed(
+        circuit_from_dict(circuit_dict), n_samples, seed
+    )
+    return (
+        measurements,
+        simulator.number_of_circuits_run - number_of_circuits_run,
+        simulator.number_of_jobs_run - number_of_jobs_run,
+    )
@@ -40,12 +40,13 @@ from typing import List
 
 import numpy as np
 import pytest
+import sympy
 from zquantum.core.interfaces.backend import QuantumSimulator
 from zquantum.core.interfaces.estimation import EstimationTask
 from zquantum.core.openfermion import QubitOperator
 from zquantum.core.wavefunction import Wavefunction
 
-from ..circuits import CNOT, Circuit, H, X, builtin_gate_by_name
+from ..circuits import CNOT, RX, RY, RZ, Circuit, H, X, builtin_gate_by_name
 from ..distribution import MeasurementOutcomeDistribution
 from ..estimation import estimate_expectation_values_by_averaging
 from ..measurement import ExpectationValues, Measurements
@@ -417,6 +418,31 @@ class QuantumSimulatorTests(QuantumBackendTests):
             wf_simulator.get_wavefunction(circuit), 0.5 * np.ones(4)
         )
 
+    def test_get_wavefunctions_batch_agrees_with_get_wavefunction(self, wf_simulator):
+        # Given
+        alpha, beta = sympy.symbols("alpha, beta")
+        circuit = Circuit(
+            [H(0), RX(alpha)(1), CNOT(0, 1), RZ(beta)(0), RY(alpha - beta)(2), H(2)]
+        )
+        params_matrix = np.array([[0.1, 0.2], [-1.5, 0.7], [np.pi, 0.0]])
+
+        # When
+        wavefunctions = wf_simulator.get_wavefunctions_batch(
+            circuit, params_matrix, symbols_order=[alpha, beta]
+        )
+
+        # Then
+        assert len(wavefunctions) == len(params_matrix)
+        for wavefunction, (alpha_value, beta_value) in zip(
+            wavefunctions, params_matrix
+        ):
+            expected_wavefunction = wf_simulator.get_wavefunction(
+                circuit.bind({alpha: alpha_value, beta: beta_value})
+            )
+            np.testing.assert_allclose(
+                wavefunction.amplitudes, expected_wavefunction.amplitudes, atol=1e-7
+            )
+
 
 class QuantumSimulatorGatesTest:
     gates_to_exclude: List[str] = []
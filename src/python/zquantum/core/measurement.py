@@ -3,16 +3,17 @@
 ################################################################################
 from __future__ import annotations
 
-import copy
 import json
-from collections import Counter
+import random
 from typing import (
     Any,
     Dict,
     Iterable,
+    Iterator,
     List,
     Optional,
     Sequence,
+    SupportsIndex,
     TextIO,
     Tuple,
     Union,
@@ -20,7 +21,13 @@ from typing import (
 )
 
 import numpy as np
-from zquantum.core.serialization import ensure_open
+from zquantum.core.serialization import (
+    check_file_format,
+    ensure_open,
+    is_binary_file,
+    load_arrays_with_header,
+    save_arrays_with_header,
+)
 from zquantum.core.typing import AnyPath, LoadSource
 from zquantum.core.wavefunction import Wavefunction
 
@@ -29,8 +36,8 @@ from .utils import (
     SCHEMA_VERSION,
     convert_array_to_dict,
     convert_dict_to_array,
-    convert_tuples_to_bitstrings,
-    sample_from_probability_distribution,
+    load_list,
+    save_list,
 )
 
 
@@ -69,12 +76,18 @@ def load_expectation_values(file: LoadSource) -> ExpectationValues:
 def load_wavefunction(file: LoadSource) -> Wavefunction:
     """Load a qubit wavefunction from a file.
 
+    Files in both JSON and npz formats can be loaded. In the latter case, the
+    amplitudes are memory-mapped instead of being read into memory.
+
     Args:
         file (str or file-like object): the name of the file, or a file-like object.
 
     Returns:
         wavefunction (zquantum.core.Wavefunction): the wavefunction object
     """
+    if is_binary_file(file):
+        _, arrays = load_arrays_with_header(cast(AnyPath, file))
+        return Wavefunction(arrays["amplitudes"])
 
     with ensure_open(file) as f:
         data = json.load(f)
@@ -83,13 +96,30 @@ def load_wavefunction(file: LoadSource) -> Wavefunction:
     return wavefunction
 
 
-def save_wavefunction(wavefunction: Wavefunction, filename: AnyPath) -> None:
+def save_wavefunction(
+    wavefunction: Wavefunction, filename: AnyPath, file_format: str = "json"
+) -> None:
     """Save a wavefunction object to a file.
 
     Args:
         wavefunction (zquantum.core.Wavefunction): the wavefunction object
         filename (str): the name of the file
+        file_format: either "json" or "npz". The latter is much more compact and
+            faster to load, but is supported only for wavefunctions without free
+            symbols.
     """
+    check_file_format(file_format)
+    if file_format == "npz":
+        if wavefunction.free_symbols:
+            raise ValueError(
+                "Wavefunctions with free symbols can only be saved as JSON."
+            )
+        save_arrays_with_header(
+            {"amplitudes": wavefunction.amplitudes},
+            {"schema": SCHEMA_VERSION + "-wavefunction"},
+            filename,
+        )
+        return
 
     data: Dict[str, Any] = {"schema": SCHEMA_VERSION + "-wavefunction"}
     data["amplitudes"] = convert_array_to_dict(wavefunction.amplitudes)
@@ -179,6 +209,146 @@ class ExpectationValues:
         return self.__dict__ == __o.__dict__
 
 
+def _outcome_probabilities(wavefunction: Wavefunction) -> np.ndarray:
+    """Compute normalized, flat array of probabilities of all measurement outcomes."""
+    probabilities = np.ravel(wavefunction.get_probabilities()).astype(float)
+    return probabilities / probabilities.sum()
+
+
+def _check_n_samples(n_samples: int):
+    if n_samples < 1:
+        raise ValueError("Must sample from wavefunction at least once.")
+
+
+def unpack_outcomes(packed_outcomes: np.ndarray, n_qubits: int) -> np.ndarray:
+    """Convert measurement outcomes packed into integers into arrays of bits.
+
+    Outcomes are packed in the same way as indices of the wavefunction amplitudes,
+    i.e. bit of qubit 0 is the most significant one.
+
+    Args:
+        packed_outcomes: 1-D array of packed outcomes.
+        n_qubits: number of measured qubits.
+    Returns:
+        Array of shape (number of outcomes, n_qubits), whose j-th column contains
+        bits measured on j-th qubit.
+    """
+    shifts = np.arange(n_qubits - 1, -1, -1, dtype=np.int64)
+    return (
+        (np.asarray(packed_outcomes, dtype=np.int64)[:, np.newaxis] >> shifts) & 1
+    ).astype(np.uint8)
+
+
+def sample_packed_outcomes_from_wavefunction(
+    wavefunction: Wavefunction,
+    n_samples: int,
+    seed: Union[None, int, np.random.SeedSequence] = None,
+) -> np.ndarray:
+    """Sample measurement outcomes from a wavefunction, packed into integers.
+
+    Sampling is performed by searching uniformly distributed numbers in the
+    cumulative distribution of outcomes, without constructing any bitstrings.
+
+    Args:
+        wavefunction: the wavefunction to sample from.
+        n_samples: the number of samples taken. Needs to be greater than 0.
+        seed: the seed of the sampler
+    Returns:
+        Array of n_samples sampled outcomes, each being an index of a basis state
+        (see `unpack_outcomes`).
+    """
+    _check_n_samples(n_samples)
+    rng = np.random.default_rng(seed)
+    cumulative_probabilities = np.cumsum(_outcome_probabilities(wavefunction))
+    outcomes = np.searchsorted(
+        cumulative_probabilities, rng.random(n_samples), side="right"
+    )
+    # Rounding errors might make the last cumulative probability slightly less than 1.
+    return np.minimum(outcomes, len(cumulative_probabilities) - 1)
+
+
+def sample_counts_from_wavefunction(
+    wavefunction: Wavefunction,
+    n_samples: int,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Sample number of occurrences of each measurement outcome from a wavefunction.
+
+    This is equivalent to, but much faster than, sampling n_samples outcomes and
+    counting them, because only one multinomial draw is needed.
+
+    Args:
+        wavefunction: the wavefunction to sample from.
+        n_samples: the number of samples taken. Needs to be greater than 0.
+        seed: the seed of the sampler
+    Returns:
+        Array of length 2^N, whose i-th entry is the number of times i-th basis
+        state was measured.
+    """
+    _check_n_samples(n_samples)
+    rng = np.random.default_rng(seed)
+    return rng.multinomial(n_samples, _outcome_probabilities(wavefunction))
+
+
+class WavefunctionSampler:
+    """Sampler of measurement outcomes reusable for many draws from the same state.
+
+    Construction of the sampler builds an alias table (Vose's method) in O(2^N)
+    time. Afterwards, each sampled outcome costs O(1), regardless of the number
+    of qubits.
+
+    Args:
+        wavefunction: the wavefunction to sample from.
+        seed: the seed of the sampler
+    """
+
+    def __init__(self, wavefunction: Wavefunction, seed: Optional[int] = None):
+        self.n_qubits = wavefunction.n_qubits
+        self._rng = np.random.default_rng(seed)
+        self._acceptance_probabilities, self._aliases = _alias_table(
+            _outcome_probabilities(wavefunction)
+        )
+
+    def sample_packed_outcomes(self, n_samples: int) -> np.ndarray:
+        """Sample outcomes packed into integers, see `unpack_outcomes`."""
+        _check_n_samples(n_samples)
+        columns = self._rng.integers(0, len(self._aliases), n_samples)
+        accepted = self._rng.random(n_samples) < self._acceptance_probabilities[columns]
+        return np.where(accepted, columns, self._aliases[columns])
+
+    def sample(self, n_samples: int) -> List[Tuple[int, ...]]:
+        """Sample outcomes in the same format as `sample_from_wavefunction`."""
+        return list(
+            map(
+                tuple,
+                unpack_outcomes(
+                    self.sample_packed_outcomes(n_samples), self.n_qubits
+                ).tolist(),
+            )
+        )
+
+
+def _alias_table(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    size = len(probabilities)
+    scaled_probabilities = (probabilities * size).tolist()
+    acceptance_probabilities = np.ones(size)
+    aliases = np.arange(size)
+
+    small = [i for i, p in enumerate(scaled_probabilities) if p < 1]
+    large = [i for i, p in enumerate(scaled_probabilities) if p >= 1]
+    while small and large:
+        small_index, large_index = small.pop(), large[-1]
+        acceptance_probabilities[small_index] = scaled_probabilities[small_index]
+        aliases[small_index] = large_index
+        scaled_probabilities[large_index] -= 1 - scaled_probabilities[small_index]
+        if scaled_probabilities[large_index] < 1:
+            small.append(large.pop())
+
+    # Entries remaining in either of the lists have (up to rounding errors)
+    # probability 1, and hence are never replaced by their aliases.
+    return acceptance_probabilities, aliases
+
+
 def sample_from_wavefunction(
     wavefunction: Wavefunction,
     n_samples: int,
@@ -194,16 +364,12 @@ def sample_from_wavefunction(
     Returns:
         List[Tuple[int]]: A list of tuples where the each tuple is a sampled bitstring.
     """
-    if n_samples < 1:
-        raise ValueError("Must sample from wavefunction at least once.")
-    rng = np.random.default_rng(seed)
-    outcomes_str, probabilities_np = zip(*wavefunction.get_outcome_probs().items())
-    probabilities = [
-        x[0] if isinstance(x, (list, np.ndarray)) else x for x in list(probabilities_np)
-    ]
-    samples_ndarray = rng.choice(a=outcomes_str, size=n_samples, p=probabilities)
-    samples = [tuple(int(y) for y in list(x)[::-1]) for x in list(samples_ndarray)]
-    return samples
+    packed_outcomes = sample_packed_outcomes_from_wavefunction(
+        wavefunction, n_samples, seed
+    )
+    return list(
+        map(tuple, unpack_outcomes(packed_outcomes, wavefunction.n_qubits).tolist())
+    )
 
 
 class Parities:
@@ -344,48 +510,29 @@ def get_parities_from_measurements(
     if not isinstance(ising_operator, IsingOperator):
         raise TypeError("Input operator not openfermion.IsingOperator")
 
-    # Count number of occurrences of bitstrings
-    bitstring_frequencies = Counter(measurements)
-    bitstrings_vector = np.array([*bitstring_frequencies.keys()])
-    bitstring_counts: np.ndarray = np.fromiter(
-        bitstring_frequencies.values(), dtype=int
-    )
-
-    # Count parity occurrences
-    values = []
-    for _, term in enumerate(ising_operator.terms):
-        marked_qubits = [op[0] for op in term]
-        parity = check_parity_of_vector(bitstrings_vector, marked_qubits)
-
-        true_parity_count: int = (parity * bitstring_counts).sum()
-        false_parity_count: int = ((1 - parity) * bitstring_counts).sum()
-        values.append([true_parity_count, false_parity_count])
-
-    # Count parity occurrences for pairwise products of operators
-    correlations = [np.zeros((len(ising_operator.terms), len(ising_operator.terms), 2))]
-    for term1_index, term1 in enumerate(ising_operator.terms):
-        for term2_index, term2 in enumerate(ising_operator.terms):
-            marked_qubits_term1 = [op[0] for op in term1]
-            marked_qubits_term2 = [op[0] for op in term2]
-
-            parity1 = check_parity_of_vector(bitstrings_vector, marked_qubits_term1)
-            parity2 = check_parity_of_vector(bitstrings_vector, marked_qubits_term2)
-
-            equal_parities = np.abs(
-                parity1 - parity2
-            )  # 0 if parities are equal, 1 otherwise
-
-            # Counts of bitstrings where parity is equal
-            correlations[0][term1_index, term2_index][0] += (
-                (1 - equal_parities) * bitstring_counts
-            ).sum()
+    outcomes, counts = _unique_outcomes(_bits_from_tuples(measurements))
+    signs = _z_term_signs(outcomes, ising_operator.terms)
 
-            # Counts of bitstrings where parity is not equal
-            correlations[0][term1_index, term2_index][1] += (
-                (equal_parities) * bitstring_counts
-            ).sum()
+    # Number of samples with even parity is (N + sum of signs) / 2, and similarly,
+    # for pairs of terms, with the product of signs indicating equal parities.
+    num_measurements = counts.sum()
+    sign_sums = counts @ signs
+    values = np.stack(
+        [(num_measurements + sign_sums) // 2, (num_measurements - sign_sums) // 2],
+        axis=1,
+    )
+    sign_products = signs.T @ (counts[:, np.newaxis] * signs)
+    correlations = [
+        np.stack(
+            [
+                (num_measurements + sign_products) / 2,
+                (num_measurements - sign_products) / 2,
+            ],
+            axis=-1,
+        )
+    ]
 
-    return Parities(np.array(values), correlations)
+    return Parities(values, correlations)
 
 
 def expectation_values_to_real(
@@ -471,6 +618,28 @@ def check_parity_of_vector(
     return (bitstring_subset.sum(axis=1) + 1) % 2
 
 
+def _z_term_signs(outcomes: np.ndarray, terms: Iterable) -> np.ndarray:
+    """Compute eigenvalues of products of Z operators for measured outcomes.
+
+    Args:
+        outcomes: array of bits with one row per outcome and one column per qubit.
+        terms: terms of IsingOperator, i.e. tuples of (qubit index, "Z") pairs.
+    Returns:
+        Array of shape (number of outcomes, number of terms), whose entry (i, j) is
+        1 if the qubits marked by j-th term have even parity in i-th outcome, and -1
+        otherwise.
+    """
+    terms = list(terms)
+    if len(outcomes) == 0:
+        return np.zeros((0, len(terms)), dtype=np.int64)
+    masks = np.zeros((len(terms), outcomes.shape[1]), dtype=np.int64)
+    for term_index, term in enumerate(terms):
+        masks[term_index, [op[0] for op in term]] = 1
+
+    parities = (outcomes.astype(np.int64) @ masks.T) % 2
+    return 1 - 2 * parities
+
+
 def _convert_bitstrings_to_vector(bitstrings: Iterable[str]) -> np.ndarray:
     """Converts bitstrings to vector so parity can be checked."""
     n_qubits = len([*bitstrings][0])
@@ -512,67 +681,261 @@ def get_expectation_value_from_frequencies(
     return expectation_values.sum().item()
 
 
-def _check_sample_elimination(
-    samples: Counter,
-    bitstring_samples: List[Tuple[int, ...]],
-    leftover_distribution: MeasurementOutcomeDistribution,
-) -> Counter:
-    """This is a function that checks that all elements in samples
-    are present in bitstring_samples. If they are not, we eliminate the
-    elements not in bitstring samples, set their probability to 0 in
-    leftover_distribution and resample the appropriate number of times.
-    Then, we re-check the new samples.
+def _is_binary(outcomes: np.ndarray) -> bool:
+    return outcomes.size == 0 or (outcomes.min() >= 0 and outcomes.max() <= 1)
+
+
+def _as_outcomes(outcomes: np.ndarray) -> np.ndarray:
+    """Store outcomes as bits if possible.
+
+    Measurement outcomes other than 0 and 1 are allowed, e.g. by
+    MeasurementOutcomeDistribution, and such outcomes are kept as integers.
+    """
+    return outcomes.astype(np.uint8) if _is_binary(outcomes) else outcomes
+
+
+def _bits_from_tuples(bitstrings: Sequence[Sequence[int]]) -> np.ndarray:
+    if len(bitstrings) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    if len(set(map(len, bitstrings))) > 1:
+        raise ValueError("All measured bitstrings have to be of the same length.")
+    return _as_outcomes(
+        np.array(bitstrings, dtype=np.int64).reshape(len(bitstrings), -1)
+    )
+
+
+def _bits_from_strings(bitstrings: Sequence[str]) -> np.ndarray:
+    if len(set(map(len, bitstrings))) > 1:
+        raise ValueError("All measured bitstrings have to be of the same length.")
+    characters = np.frombuffer("".join(bitstrings).encode(), dtype=np.uint8)
+    return (characters - ord("0")).reshape(len(bitstrings), -1)
+
+
+def _bits_to_strings(bits: np.ndarray) -> List[str]:
+    if bits.shape[1] == 0:
+        return [""] * len(bits)
+    if bits.min() < 0 or bits.max() > 9:
+        return ["".join(map(str, outcome)) for outcome in bits.tolist()]
+    characters = np.ascontiguousarray(bits + ord("0"), dtype=np.uint8)
+    return [
+        bitstring.decode() for bitstring in characters.view(f"S{bits.shape[1]}")[:, 0]
+    ]
+
+
+def _unique_outcomes(
+    bits: np.ndarray,
+    counts: Optional[np.ndarray] = None,
+    in_order_of_appearance: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find unique rows of bits array, together with their total counts.
+
     Args:
-        samples: The bitstrings to eliminate and how many times to eliminate them
-        bitstring_samples: the bitstring distribution from where the bitstrings
-                           should be removed
-        leftover_distribution: the distribution from which samples to eliminate are
-                               sampled
+        bits: array of measured bits, one row per outcome.
+        counts: number of occurrences of each row in `bits`. If not provided, each row
+            is assumed to occur once.
+        in_order_of_appearance: if True, unique outcomes are ordered by their first
+            occurrence in `bits`, otherwise they are sorted.
     Returns:
-        correct_samples: A sample object that only contains bitstrings that can actually
-                     be removed from bitstring_samples
+        Tuple (unique outcomes, counts), where unique outcomes are distinct rows of
+        `bits`.
     """
-    bitstring_counts = Counter(bitstring_samples)
+    if len(bits) == 0:
+        return bits, np.zeros(0, dtype=np.int64)
+
+    if bits.shape[1] < 64 and _is_binary(bits):
+        # Comparing integers is much faster than comparing rows of arrays.
+        weights = np.left_shift(1, np.arange(bits.shape[1] - 1, -1, -1, dtype=np.int64))
+        packed_outcomes = bits.astype(np.int64) @ weights
+        unique_packed_outcomes, first_indices, inverse = np.unique(
+            packed_outcomes, return_index=True, return_inverse=True
+        )
+        unique_bits = unpack_outcomes(unique_packed_outcomes, bits.shape[1])
+    else:
+        unique_bits, first_indices, inverse = np.unique(
+            bits, axis=0, return_index=True, return_inverse=True
+        )
 
-    nresamples = 1  # Initializing so that the loop starts
-    corrected_leftover_distribution = MeasurementOutcomeDistribution(
-        leftover_distribution.distribution_dict
-    )
-    correct_samples = samples.copy()
-    while nresamples != 0:
-        new_samples = None
-        nresamples = 0
-        for sample in correct_samples:
-            bitstring = tuple([int(measurement_value) for measurement_value in sample])
-            if correct_samples[sample] > bitstring_counts[bitstring]:
-                nresamples = correct_samples[sample] - bitstring_counts[bitstring]
-                correct_samples[sample] = bitstring_counts[bitstring]
-                distribution_dict = corrected_leftover_distribution.distribution_dict
-                distribution_dict[sample] = 0
-                corrected_leftover_distribution = MeasurementOutcomeDistribution(
-                    distribution_dict, True
-                )
-                new_samples = sample_from_probability_distribution(
-                    corrected_leftover_distribution.distribution_dict, nresamples
-                )
-                correct_samples = correct_samples + new_samples
-                break
+    unique_counts = np.bincount(
+        np.ravel(inverse), weights=counts, minlength=len(unique_bits)
+    ).astype(np.int64)
+    if in_order_of_appearance:
+        order = np.argsort(first_indices)
+        return unique_bits[order], unique_counts[order]
+    return unique_bits, unique_counts
+
+
+class _BitstringsList(List[Tuple[int, ...]]):
+    """List of measured bitstrings, keeping track of modifications made to it.
+
+    The version is incremented by each method modifying the list in place, which
+    allows Measurements to reuse the array of bits converted from the list until
+    the list is changed.
+    """
+
+    version = 0
+
+    def _modified(self):
+        self.version += 1
+
+    def __setitem__(self, index, value):
+        self._modified()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._modified()
+        super().__delitem__(index)
+
+    # mypy requires __iadd__ of list subclasses to be compatible with list.__add__.
+    def __iadd__(  # type: ignore[misc, override]
+        self, other: Iterable[Tuple[int, ...]]
+    ) -> "_BitstringsList":
+        self._modified()
+        super().__iadd__(other)
+        return self
+
+    def __imul__(self, other: SupportsIndex) -> "_BitstringsList":
+        self._modified()
+        super().__imul__(other)
+        return self
+
+    def append(self, item):
+        self._modified()
+        super().append(item)
+
+    def extend(self, items):
+        self._modified()
+        super().extend(items)
+
+    def insert(self, index, item):
+        self._modified()
+        super().insert(index, item)
+
+    def pop(self, *args):
+        self._modified()
+        return super().pop(*args)
+
+    def remove(self, item):
+        self._modified()
+        super().remove(item)
+
+    def clear(self):
+        self._modified()
+        super().clear()
 
-    return correct_samples
+    def sort(self, *args, **kwargs):
+        self._modified()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._modified()
+        super().reverse()
 
 
 class Measurements:
     """A class representing measurements from a quantum circuit. The bitstrings variable
     represents the internal data structure of the Measurements class. It is expressed as
     a list of tuples wherein each tuple is a measurement and the value of the tuple at a
-    given index is the measured bit-value of the qubit (indexed from 0 -> N-1)"""
+    given index is the measured bit-value of the qubit (indexed from 0 -> N-1)
+
+    Internally, measurements are stored as an array of bits with one row per
+    measurement and one column per qubit. Measurements created from counts store
+    each distinct outcome only once, together with its number of occurrences. The
+    `bitstrings` list is constructed lazily, only if it is accessed. Once that
+    happens, the list becomes the source of truth, so that modifying it in place
+    is reflected by all other methods. The array of bits converted from the list
+    is cached until the list is modified.
+    """
 
     def __init__(self, bitstrings: Optional[List[Tuple[int, ...]]] = None):
-        if bitstrings is None:
-            self.bitstrings = []
-        else:
+        self._bitstrings: Optional[_BitstringsList] = None
+        # Bits converted from self._bitstrings, and version of the list they were
+        # converted from.
+        self._bitstrings_bits: Optional[Tuple[int, np.ndarray]] = None
+        self._outcomes = np.zeros((0, 0), dtype=np.uint8)
+        # Number of occurrences of each row of self._outcomes, or None if each row
+        # corresponds to a single measurement.
+        self._counts: Optional[np.ndarray] = None
+        if bitstrings is not None:
             self.bitstrings = bitstrings
 
+    @classmethod
+    def from_bits(cls, bits: np.ndarray):
+        """Create an instance of the Measurements class from an array of bits.
+
+        Args:
+            bits: array of shape (number of measurements, number of qubits), whose
+                j-th column contains bits measured on j-th qubit.
+        """
+        measurements = cls()
+        bits = _as_outcomes(np.asarray(bits))
+        measurements._outcomes = (
+            bits.reshape(len(bits), -1)
+            if bits.size
+            else np.zeros((0, bits.shape[1] if bits.ndim == 2 else 0), dtype=np.uint8)
+        )
+        return measurements
+
+    @classmethod
+    def from_packed_outcomes(cls, packed_outcomes: np.ndarray, n_qubits: int):
+        """Create an instance of the Measurements class from outcomes packed into
+        integers, as returned by `sample_packed_outcomes_from_wavefunction`.
+
+        Args:
+            packed_outcomes: measured outcomes, see `unpack_outcomes`.
+            n_qubits: number of measured qubits.
+        """
+        return cls.from_bits(unpack_outcomes(packed_outcomes, n_qubits))
+
+    @property
+    def bitstrings(self) -> List[Tuple[int, ...]]:
+        if self._bitstrings is None:
+            bits = self.bits
+            self._bitstrings = _BitstringsList(map(tuple, bits.tolist()))
+            self._bitstrings_bits = (self._bitstrings.version, bits)
+        return self._bitstrings
+
+    @bitstrings.setter
+    def bitstrings(self, bitstrings: List[Tuple[int, ...]]):
+        self._bitstrings = _BitstringsList(bitstrings)
+        self._bitstrings_bits = None
+
+    def _outcomes_and_counts(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self._bitstrings is not None:
+            if (
+                self._bitstrings_bits is None
+                or self._bitstrings_bits[0] != self._bitstrings.version
+            ):
+                self._bitstrings_bits = (
+                    self._bitstrings.version,
+                    _bits_from_tuples(self._bitstrings),
+                )
+            return self._bitstrings_bits[1], None
+        return self._outcomes, self._counts
+
+    @property
+    def bits(self) -> np.ndarray:
+        """Array of measured bits, with one row per measurement and one column
+        per qubit."""
+        outcomes, counts = self._outcomes_and_counts()
+        return outcomes if counts is None else np.repeat(outcomes, counts, axis=0)
+
+    @property
+    def number_of_samples(self) -> int:
+        """Total number of measurements."""
+        if self._bitstrings is not None:
+            return len(self._bitstrings)
+        return len(self._outcomes) if self._counts is None else int(self._counts.sum())
+
+    def get_unique_outcomes_and_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get distinct measured outcomes and numbers of their occurrences.
+
+        Returns:
+            Tuple (outcomes, counts), where outcomes is an array of bits with one
+            row per distinct outcome, and counts[i] is the number of times i-th
+            outcome was measured.
+        """
+        return _unique_outcomes(*self._outcomes_and_counts())
+
     @classmethod
     def from_counts(cls, counts: Dict[str, int]):
         """Create an instance of the Measurements class from a dictionary
@@ -594,91 +957,118 @@ class Measurements:
         """Create an instance of the Measurements class that exactly (or as closely as
         possible) resembles the input bitstring distribution.
 
+        The returned measurements are stored as counts of distinct outcomes, hence
+        their size doesn't depend on the number of samples.
+
         Args:
             measurement_outcome_distribution: the bitstring distribution to be sampled
             number_of_samples: the number of measurements
         """
-        distribution = copy.deepcopy(measurement_outcome_distribution.distribution_dict)
-
-        bitstring_samples = []
-        # Rounding gives the closest integer to the observed frequency
-        for state in distribution:
-            bitstring = tuple([int(measurement_value) for measurement_value in state])
-
-            bitstring_samples += [bitstring] * int(
-                round(distribution[state] * number_of_samples)
-            )
-
-        # If frequencies are inconsistent with number of samples, we may need to
-        # add or delete samples. The bitstrings to correct are chosen at random,
-        # giving more weight to those with non-integer part closest to 0.5
-        if len(bitstring_samples) != number_of_samples:
-            leftover_distribution = MeasurementOutcomeDistribution(
-                {
-                    states: 0.5
-                    - abs(0.5 - (distribution[states] * number_of_samples) % 1)
-                    for states in distribution.keys()
-                },
-                True,
-            )
-
-            samples = sample_from_probability_distribution(
-                leftover_distribution.distribution_dict,
-                abs(number_of_samples - len(bitstring_samples)),
-            )
-            if number_of_samples - len(bitstring_samples) > 0:
-                for sample in samples:
-                    bitstring_samples += [
-                        tuple([int(measurement_value) for measurement_value in sample])
-                    ] * samples[sample]
-            else:
-                # Eliminating samples: need to ensure they are present in the
-                # bitstring_samples list
-                samples = _check_sample_elimination(
-                    samples, bitstring_samples, leftover_distribution
-                )
-                for sample in samples:
-                    for _ in range(samples[sample]):
-                        bitstring_samples.remove(
-                            tuple(
-                                [int(measurement_value) for measurement_value in sample]
-                            )
-                        )
-
-        return cls(bitstring_samples)
+        distribution = measurement_outcome_distribution.distribution_dict
+        probabilities = np.fromiter(distribution.values(), dtype=float)
+        expected_counts = probabilities / probabilities.sum() * number_of_samples
+
+        # Largest remainder method: round expected counts down, and distribute the
+        # missing samples to outcomes with largest fractional parts. Ties are broken
+        # at random.
+        counts = np.floor(expected_counts).astype(np.int64)
+        remainders = expected_counts - counts
+        tie_breakers = np.random.default_rng(random.getrandbits(32)).random(len(counts))
+        order = np.lexsort((tie_breakers, -remainders))
+        counts[order[: number_of_samples - counts.sum()]] += 1
+
+        nonzero = counts > 0
+        measurements = cls()
+        measurements._outcomes = _bits_from_tuples(
+            [tuple(map(int, state)) for state in distribution]
+        )[nonzero]
+        measurements._counts = counts[nonzero]
+        return measurements
 
     @classmethod
     def load_from_file(cls, file: TextIO):
         """Load a set of measurements from file
 
+        Files in both JSON and npz formats can be loaded. In the latter case, the
+        measurements are memory-mapped instead of being read into memory.
+
         Args:
             file (str or file-like object): the name of the file, or a file-like object
         """
+        if is_binary_file(file):
+            _, arrays = load_arrays_with_header(cast(AnyPath, file))
+            return cls._from_arrays(arrays)
+
         if isinstance(file, str):
             with open(file, "r") as f:
                 data = json.load(f)
         else:
             data = json.load(file)
 
-        bitstrings = []
-        for bitstring in data["bitstrings"]:
-            bitstrings.append(tuple(bitstring))
+        return cls.from_bits(_bits_from_tuples(data["bitstrings"]))
+
+    @classmethod
+    def _from_arrays(cls, arrays: Dict[str, np.ndarray]):
+        measurements = cls()
+        measurements._outcomes = arrays["outcomes"]
+        measurements._counts = arrays.get("counts")
+        return measurements
+
+    def _to_arrays(self) -> Dict[str, np.ndarray]:
+        outcomes, counts = self._outcomes_and_counts()
+        return (
+            {"outcomes": outcomes}
+            if counts is None
+            else {
+                "outcomes": outcomes,
+                "counts": counts,
+            }
+        )
+
+    def split(self, chunk_size: int) -> Iterator[Measurements]:
+        """Split measurements into consecutive chunks.
 
-        return cls(bitstrings=bitstrings)
+        For measurements loaded from npz files the chunks are views of the
+        memory-mapped data, hence only one chunk at a time needs to be read from
+        disk. Measurements created from counts are split into chunks of at most
+        `chunk_size` distinct outcomes.
 
-    def save(self, filename: AnyPath):
-        """Serialize the Measurements object into a file in JSON format.
+        Args:
+            chunk_size: maximum number of rows of a single chunk.
+        Returns:
+            Iterator over Measurements objects comprising consecutive chunks.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size has to be positive.")
+        outcomes, counts = self._outcomes_and_counts()
+        for start in range(0, len(outcomes), chunk_size):
+            chunk = Measurements()
+            chunk._outcomes = outcomes[start : start + chunk_size]
+            if counts is not None:
+                chunk._counts = counts[start : start + chunk_size]
+            yield chunk
+
+    def save(self, filename: AnyPath, file_format: str = "json"):
+        """Serialize the Measurements object into a file.
 
         Args:
             filename (string): filename to save the data to
+            file_format: either "json" or "npz". The latter stores measurements as
+                raw arrays of bits, which is much more compact and faster to load.
         """
+        check_file_format(file_format)
+        if file_format == "npz":
+            save_arrays_with_header(
+                self._to_arrays(),
+                {"schema": SCHEMA_VERSION + "-measurements"},
+                filename,
+            )
+            return
+
         data = {
             "schema": SCHEMA_VERSION + "-measurements",
             "counts": self.get_counts(),
-            # This step is required if bistrings contain np.int8 instead of regular int.
-            "bitstrings": [
-                list(map(int, list(bitstring))) for bitstring in self.bitstrings
-            ],
+            "bitstrings": self.bits.tolist(),
         }
         with open(filename, "w") as f:
             f.write(json.dumps(data, indent=2))
@@ -690,8 +1080,10 @@ class Measurements:
             A dictionary mapping bitstrings to integers representing the number of times
             the bitstring was measured
         """
-        bitstrings = convert_tuples_to_bitstrings(self.bitstrings)
-        return dict(Counter(bitstrings))
+        outcomes, counts = _unique_outcomes(
+            *self._outcomes_and_counts(), in_order_of_appearance=True
+        )
+        return dict(zip(_bits_to_strings(outcomes), counts.tolist()))
 
     def add_counts(self, counts: Dict[str, int]):
         """Add measurements from a histogram
@@ -702,12 +1094,36 @@ class Measurements:
                 NOTE: bitstrings are also indexed from 0 -> N-1, where the "001"
                 bitstring represents a measurement of qubit 2 in the 1 state
         """
-        for bitstring in counts.keys():
-            measurement = []
-            for bitvalue in bitstring:
-                measurement.append(int(bitvalue))
+        if not counts:
+            return
+        new_outcomes = _bits_from_strings(list(counts.keys()))
+        new_counts = np.array(list(counts.values()), dtype=np.int64)
+
+        n_qubits = (
+            len(self._bitstrings[0])
+            if self._bitstrings
+            else self._outcomes.shape[1]
+            if self._bitstrings is None and self.number_of_samples > 0
+            else None
+        )
+        if n_qubits is not None and n_qubits != new_outcomes.shape[1]:
+            raise ValueError(
+                "Added bitstrings have to be of the same length as existing ones."
+            )
 
-            self.bitstrings += [tuple(measurement)] * counts[bitstring]
+        if self._bitstrings is not None:
+            self._bitstrings += list(
+                map(tuple, np.repeat(new_outcomes, new_counts, axis=0).tolist())
+            )
+        elif self.number_of_samples == 0:
+            self._outcomes, self._counts = new_outcomes, new_counts
+        elif self._counts is None:
+            self._outcomes = np.concatenate(
+                [self._outcomes, np.repeat(new_outcomes, new_counts, axis=0)]
+            )
+        else:
+            self._outcomes = np.concatenate([self._outcomes, new_outcomes])
+            self._counts = np.concatenate([self._counts, new_counts])
 
     def get_distribution(self) -> MeasurementOutcomeDistribution:
         """Get the normalized probability distribution representing the measurements
@@ -715,14 +1131,12 @@ class Measurements:
         Returns:
             distribution: bitstring distribution based on the frequency of measurements
         """
-        counts = self.get_counts()
-        num_measurements = len(self.bitstrings)
+        outcomes, counts = self.get_unique_outcomes_and_counts()
+        frequencies = counts / counts.sum() if len(counts) else counts
 
-        distribution = {}
-        for bitstring in counts.keys():
-            distribution[bitstring] = counts[bitstring] / num_measurements
-
-        return MeasurementOutcomeDistribution(distribution)
+        return MeasurementOutcomeDistribution(
+            dict(zip(map(tuple, outcomes.tolist()), frequencies.tolist()))
+        )
 
     def get_expectation_values(
         self, ising_operator, use_bessel_correction: bool = False
@@ -749,38 +1163,19 @@ class Measurements:
         if not isinstance(ising_operator, IsingOperator):
             raise TypeError("Input operator is not openfermion.IsingOperator")
 
-        # Count number of occurrences of bitstrings
-        bitstring_frequencies = self.get_counts()
-        num_measurements = len(self.bitstrings)
-
-        # Perform weighted average
-        expectation_values_list = [
-            coefficient
-            * get_expectation_value_from_frequencies(
-                [cast(int, op[0]) for op in term], bitstring_frequencies
-            )
-            for term, coefficient in ising_operator.terms.items()
-        ]
-        expectation_values = np.array(expectation_values_list)
-
-        correlations = np.zeros((len(ising_operator.terms),) * 2)
-        for i, first_term in enumerate(ising_operator.terms):
-            correlations[i, i] = ising_operator.terms[first_term] ** 2
-            for j in range(i):
-                second_term = list(ising_operator.terms.keys())[j]
-                first_term_qubits = set(op[0] for op in first_term)
-                second_term_qubits = set(op[0] for op in second_term)
-                marked_qubits = first_term_qubits.symmetric_difference(
-                    second_term_qubits
-                )
-                correlations[i, j] = (
-                    ising_operator.terms[first_term]
-                    * ising_operator.terms[second_term]
-                    * get_expectation_value_from_frequencies(
-                        marked_qubits, bitstring_frequencies
-                    )
-                )
-                correlations[j, i] = correlations[i, j]
+        outcomes, counts = self.get_unique_outcomes_and_counts()
+        num_measurements = self.number_of_samples
+        frequencies = counts / num_measurements
+        coefficients = np.array(list(ising_operator.terms.values()))
+        signs = _z_term_signs(outcomes, ising_operator.terms)
+
+        # Expectation value of a product of two terms is the expectation value of the
+        # product of Z operators on the symmetric difference of their qubits, which is
+        # exactly the product of their signs.
+        expectation_values = coefficients * (frequencies @ signs)
+        correlations = np.outer(coefficients, coefficients) * (
+            signs.T @ (frequencies[:, np.newaxis] * signs)
+        )
 
         denominator = (
             num_measurements - 1 if use_bessel_correction else num_measurements
@@ -796,6 +1191,202 @@ class Measurements:
         )
 
 
+def save_measurements_set(
+    measurements_set: Sequence[Measurements],
+    filename: AnyPath,
+    file_format: str = "json",
+) -> None:
+    """Save a list of measurements to a file.
+
+    Args:
+        measurements_set: the measurements to be saved.
+        filename: the name of the file.
+        file_format: either "json", in which case a list of bitstrings of each
+            Measurements object is saved, or "npz".
+    """
+    check_file_format(file_format)
+    if file_format == "json":
+        save_list(
+            [measurements.bits.tolist() for measurements in measurements_set],
+            filename,
+        )
+        return
+
+    save_arrays_with_header(
+        {
+            f"{name}_{index}": array
+            for index, measurements in enumerate(measurements_set)
+            for name, array in measurements._to_arrays().items()
+        },
+        {
+            "schema": SCHEMA_VERSION + "-measurements-set",
+            "length": len(measurements_set),
+        },
+        filename,
+    )
+
+
+def load_measurements_set(file: LoadSource) -> List[Measurements]:
+    """Load a list of measurements saved with `save_measurements_set`.
+
+    Args:
+        file: the name of the file, or a file-like object.
+    """
+    if not is_binary_file(file):
+        return [Measurements(list(map(tuple, bits))) for bits in load_list(file)]
+
+    header, arrays = load_arrays_with_header(cast(AnyPath, file))
+    return [
+        Measurements._from_arrays(
+            {
+                name: arrays[f"{name}_{index}"]
+                for name in ("outcomes", "counts")
+                if f"{name}_{index}" in arrays
+            }
+        )
+        for index in range(header["length"])
+    ]
+
+
+def concatenate_measurements(measurements_set: Iterable[Measurements]) -> Measurements:
+    """Concatenates a set of measurements objects.
+
+    Args:
+        measurements_set: the measurements to be concatenated. All of them have to
+            be measurements of the same number of qubits.
+    Returns:
+        Measurements comprising measurements from all the objects in
+        `measurements_set`, in the same order.
+    """
+    bits = [
+        measurements.bits
+        for measurements in measurements_set
+        if measurements.number_of_samples > 0
+    ]
+    if len(set(array.shape[1] for array in bits)) > 1:
+        raise ValueError(
+            "Only measurements of the same number of qubits can be joined."
+        )
+    return Measurements.from_bits(np.concatenate(bits)) if bits else Measurements()
+
+
+class ExpectationValuesAccumulator:
+    """Incrementally computed expectation values of terms of an IsingOperator.
+
+    Measurements can be added in batches, and only the running mean of the
+    eigenvalues of each term and the matrix of their co-moments are stored, so the
+    memory used doesn't depend on the number of measurements. Batches are merged
+    using the pairwise update of Chan et al., which is numerically stable also for
+    large numbers of samples. Accumulators built independently (e.g. in different
+    processes) can be combined with `merge`.
+
+    Args:
+        ising_operator: operator whose terms' expectation values are estimated.
+
+    Attributes:
+        number_of_samples: total number of measurements added so far.
+    """
+
+    def __init__(self, ising_operator):
+        from zquantum.core.openfermion.ops import IsingOperator
+
+        if not isinstance(ising_operator, IsingOperator):
+            raise TypeError("Input operator is not openfermion.IsingOperator")
+
+        self._terms = list(ising_operator.terms)
+        self._coefficients = np.array(list(ising_operator.terms.values()))
+        self.number_of_samples = 0
+        self._mean = np.zeros(len(self._terms))
+        self._comoments = np.zeros((len(self._terms),) * 2)
+
+    def _add_statistics(self, n_samples: int, mean: np.ndarray, comoments: np.ndarray):
+        if n_samples == 0:
+            return
+        total = self.number_of_samples + n_samples
+        delta = mean - self._mean
+        self._comoments = (
+            self._comoments
+            + comoments
+            + np.outer(delta, delta) * (self.number_of_samples * n_samples / total)
+        )
+        self._mean = self._mean + delta * (n_samples / total)
+        self.number_of_samples = total
+
+    def _add_outcomes(self, outcomes: np.ndarray, counts: np.ndarray):
+        n_samples = int(counts.sum())
+        if n_samples == 0:
+            return
+        signs = _z_term_signs(outcomes, self._terms)
+        mean = counts @ signs / n_samples
+        deviations = signs - mean
+        self._add_statistics(
+            n_samples, mean, deviations.T @ (counts[:, np.newaxis] * deviations)
+        )
+
+    def add_bits(self, bits: np.ndarray):
+        """Add measurements given as an array of bits, with one row per measurement
+        and one column per qubit."""
+        self._add_outcomes(*_unique_outcomes(np.asarray(bits, dtype=np.uint8)))
+
+    def add_counts(self, counts: Dict[str, int]):
+        """Add measurements given as a mapping of bitstrings to number of times
+        they were measured."""
+        if counts:
+            self._add_outcomes(
+                _bits_from_strings(list(counts.keys())),
+                np.array(list(counts.values()), dtype=np.int64),
+            )
+
+    def add_measurements(self, measurements: Measurements):
+        """Add all measurements from given Measurements object."""
+        self._add_outcomes(*measurements.get_unique_outcomes_and_counts())
+
+    def merge(self, other: ExpectationValuesAccumulator):
+        """Add all measurements accumulated by another accumulator of the same
+        operator."""
+        if self._terms != other._terms or not np.array_equal(
+            self._coefficients, other._coefficients
+        ):
+            raise ValueError("Only accumulators of the same operator can be merged.")
+        self._add_statistics(other.number_of_samples, other._mean, other._comoments)
+
+    def get_expectation_values(
+        self, use_bessel_correction: bool = False
+    ) -> ExpectationValues:
+        """Get the expectation values of the operator's terms estimated from
+        measurements added so far.
+
+        The result is the same as the one of `Measurements.get_expectation_values`
+        called on all the added measurements.
+
+        Args:
+            use_bessel_correction: Whether to use Bessel's correction when
+                when estimating the covariance of operators.
+
+        Returns:
+            expectation values of each term in the operator
+        """
+        if self.number_of_samples == 0:
+            raise ValueError("At least one measurement is needed to estimate values.")
+
+        coefficients_products = np.outer(self._coefficients, self._coefficients)
+        covariances = self._comoments / self.number_of_samples
+        correlations = coefficients_products * (
+            covariances + np.outer(self._mean, self._mean)
+        )
+
+        denominator = (
+            self.number_of_samples - 1
+            if use_bessel_correction
+            else self.number_of_samples
+        )
+        estimator_covariances = coefficients_products * covariances / denominator
+
+        return ExpectationValues(
+            self._coefficients * self._mean, [correlations], [estimator_covariances]
+        )
+
+
 def concatenate_expectation_values(
     expectation_values_set: Iterable[ExpectationValues],
 ) -> ExpectationValues:
@@ -67,6 +67,7 @@ from zquantum.core.openfermion.ops import (
     InteractionRDM,
     InteractionRDMError,
     IsingOperator,
+    PauliSum,
     PolynomialTensor,
     PolynomialTensorError,
     QubitOperator,
@@ -130,6 +131,9 @@ from zquantum.core.openfermion.zapata_utils import (
     evaluate_qubit_operator_list,
     reverse_qubit_order,
     get_expectation_value,
+    get_expectation_values_of_terms,
+    apply_qubit_operator,
+    get_pauli_masks,
     change_operator_type,
     get_fermion_number_operator,
     get_diagonal_component,
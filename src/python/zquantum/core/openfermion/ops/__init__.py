@@ -18,7 +18,13 @@ serve as storage of the operators.  The abstract instance objects derive from
 the PolynomialTensor.  Here we differentiate between generic storage objects and
 particular instantiations.
 """
-from .operators import FermionOperator, IsingOperator, QubitOperator, SymbolicOperator
+from .operators import (
+    FermionOperator,
+    IsingOperator,
+    PauliSum,
+    QubitOperator,
+    SymbolicOperator,
+)
 from .representations import (
     PolynomialTensor,
     PolynomialTensorError,
@@ -16,5 +16,6 @@
 
 from .fermion_operator import FermionOperator
 from .ising_operator import IsingOperator
+from .pauli_sum import PauliSum
 from .qubit_operator import QubitOperator
 from .symbolic_operator import SymbolicOperator
@@ -0,0 +1,319 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""PauliSum stores a linear combination of Pauli strings in packed arrays.
+
+In contrast to QubitOperator, whose terms are kept in a dictionary of tuples, all
+arithmetic on PauliSum is vectorized with numpy. Each term is represented in the
+symplectic form, i.e. as a pair of bit vectors (x, z), with a Pauli operator
+(x_q, z_q) acting on qubit q being I = (0, 0), X = (1, 0), Z = (0, 1) or Y = (1, 1).
+Bits of consecutive qubits are packed into uint64 words, qubit q being stored as bit
+q % 64 of word q // 64.
+"""
+import numbers
+from typing import Optional, Tuple, Type, TypeVar
+
+import numpy as np
+from zquantum.core.openfermion.config import EQ_TOLERANCE
+from zquantum.core.openfermion.ops.operators.ising_operator import IsingOperator
+from zquantum.core.openfermion.ops.operators.qubit_operator import QubitOperator
+from zquantum.core.openfermion.ops.operators.symbolic_operator import SymbolicOperator
+
+WORD_SIZE = 64
+
+_PAULI_CODES = {"X": 1, "Z": 2, "Y": 3}
+_PAULI_NAMES = {1: "X", 2: "Z", 3: "Y"}
+_POPCOUNT_TABLE = np.array([bin(byte).count("1") for byte in range(256)], np.int64)
+_POWERS_OF_I = np.array([1, 1j, -1, -1j])
+
+AnyOperator = TypeVar("AnyOperator", bound=SymbolicOperator)
+
+
+def _number_of_words(n_qubits: int) -> int:
+    return max(1, -(-n_qubits // WORD_SIZE))
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Number of bits set in each row of words (summed over the last axis)."""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1)
+
+
+def _pack_bits(bits: np.ndarray, n_words: int) -> np.ndarray:
+    """Pack (n_terms, n_qubits) boolean array into (n_terms, n_words) uint64 words."""
+    packed_bytes = np.zeros((bits.shape[0], n_words * 8), dtype=np.uint8)
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    packed_bytes[:, : packed.shape[1]] = packed
+    return packed_bytes.view("<u8").astype(np.uint64)
+
+
+def _unpack_bits(words: np.ndarray, n_qubits: int) -> np.ndarray:
+    """Inverse of `_pack_bits`."""
+    words = np.ascontiguousarray(words.astype("<u8"))
+    return np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")[
+        :, :n_qubits
+    ].astype(bool)
+
+
+class PauliSum:
+    """Linear combination of Pauli strings backed by numpy arrays.
+
+    Terms are kept without duplicates, i.e. all the arithmetic operations combine
+    coefficients of equal Pauli strings (and drop the ones that cancel out).
+    Coefficients have to be numbers, operators with symbolic coefficients should be
+    kept as QubitOperators.
+
+    Args:
+        x: (n_terms, n_words) array of uint64 words with X bits of consecutive terms.
+        z: (n_terms, n_words) array of uint64 words with Z bits of consecutive terms.
+        coefficients: coefficients of consecutive terms.
+        n_qubits: number of qubits the operator acts on. Bits of qubits beyond
+            n_qubits have to be zero.
+
+    Attributes:
+        x: See Args.
+        z: See Args.
+        coefficients: See Args.
+        n_qubits: See Args.
+    """
+
+    def __init__(
+        self, x: np.ndarray, z: np.ndarray, coefficients: np.ndarray, n_qubits: int
+    ):
+        n_words = _number_of_words(n_qubits)
+        self.x = np.asarray(x, dtype=np.uint64).reshape(-1, n_words)
+        self.z = np.asarray(z, dtype=np.uint64).reshape(-1, n_words)
+        self.coefficients = np.asarray(coefficients, dtype=complex).reshape(-1)
+        self.n_qubits = n_qubits
+
+        if not len(self.x) == len(self.z) == len(self.coefficients):
+            raise ValueError(
+                "Number of X words, Z words and coefficients has to be the same."
+            )
+
+    @classmethod
+    def from_operator(
+        cls, operator: SymbolicOperator, n_qubits: Optional[int] = None
+    ) -> "PauliSum":
+        """Create PauliSum from QubitOperator or IsingOperator.
+
+        Args:
+            operator: operator to be converted.
+            n_qubits: number of qubits the operator acts on. Defaults to the
+                highest qubit index present in the operator plus one.
+        """
+        max_index = max(
+            (qubit for term in operator.terms for qubit, _ in term), default=-1
+        )
+        if n_qubits is None:
+            n_qubits = max_index + 1
+        elif max_index >= n_qubits:
+            raise ValueError("Invalid number of qubits specified.")
+
+        codes = np.zeros((len(operator.terms), n_qubits), dtype=np.uint8)
+        for i, term in enumerate(operator.terms):
+            for qubit, pauli in term:
+                codes[i, qubit] = _PAULI_CODES[pauli]
+
+        n_words = _number_of_words(n_qubits)
+        return cls(
+            _pack_bits(codes & 1, n_words),
+            _pack_bits(codes >> 1, n_words),
+            np.array(list(operator.terms.values()), dtype=complex),
+            n_qubits,
+        )
+
+    def _to_operator(self, operator_type: Type[AnyOperator]) -> AnyOperator:
+        codes = _unpack_bits(self.x, self.n_qubits) + 2 * _unpack_bits(
+            self.z, self.n_qubits
+        ).astype(np.uint8)
+        operator = operator_type()
+        # Terms are already simplified, hence they bypass operator's parsing.
+        operator.terms = {
+            tuple(
+                (int(qubit), _PAULI_NAMES[row[qubit]]) for qubit in np.flatnonzero(row)
+            ): complex(coefficient)
+            for row, coefficient in zip(codes, self.coefficients)
+        }
+        return operator
+
+    def to_qubit_operator(self) -> QubitOperator:
+        """Convert this operator to QubitOperator."""
+        return self._to_operator(QubitOperator)
+
+    def to_ising_operator(self) -> IsingOperator:
+        """Convert this operator to IsingOperator.
+
+        Raises:
+            ValueError: if any term of this operator contains X or Y.
+        """
+        if self.x.any():
+            raise ValueError("Only operators comprising Z terms are Ising operators.")
+        return self._to_operator(IsingOperator)
+
+    def __len__(self) -> int:
+        return len(self.coefficients)
+
+    def __repr__(self) -> str:
+        return f"PauliSum({self.to_qubit_operator()!r}, n_qubits={self.n_qubits})"
+
+    def _padded_words(self, n_qubits: int) -> Tuple[np.ndarray, np.ndarray]:
+        padding = ((0, 0), (0, _number_of_words(n_qubits) - self.x.shape[1]))
+        return np.pad(self.x, padding), np.pad(self.z, padding)
+
+    @classmethod
+    def _simplified(
+        cls, x: np.ndarray, z: np.ndarray, coefficients: np.ndarray, n_qubits: int
+    ) -> "PauliSum":
+        """Create PauliSum combining coefficients of equal terms.
+
+        As in SymbolicOperator, terms cancelling out exactly are removed.
+        """
+        unique_words, inverse = np.unique(
+            np.concatenate([x, z], axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        combined = np.bincount(
+            inverse, coefficients.real, len(unique_words)
+        ) + 1j * np.bincount(inverse, coefficients.imag, len(unique_words))
+        nonzero = combined != 0
+        n_words = x.shape[1]
+        return cls(
+            unique_words[nonzero, :n_words],
+            unique_words[nonzero, n_words:],
+            combined[nonzero],
+            n_qubits,
+        )
+
+    def __add__(self, other) -> "PauliSum":
+        if isinstance(other, numbers.Number):
+            identity = np.zeros((1, self.x.shape[1]), dtype=np.uint64)
+            other = PauliSum(
+                identity, identity, np.array([other], dtype=complex), self.n_qubits
+            )
+        if not isinstance(other, PauliSum):
+            return NotImplemented
+
+        n_qubits = max(self.n_qubits, other.n_qubits)
+        x_1, z_1 = self._padded_words(n_qubits)
+        x_2, z_2 = other._padded_words(n_qubits)
+        return self._simplified(
+            np.concatenate([x_1, x_2]),
+            np.concatenate([z_1, z_2]),
+            np.concatenate([self.coefficients, other.coefficients]),
+            n_qubits,
+        )
+
+    def __radd__(self, other) -> "PauliSum":
+        return self + other
+
+    def __neg__(self) -> "PauliSum":
+        return PauliSum(self.x, self.z, -self.coefficients, self.n_qubits)
+
+    def __sub__(self, other) -> "PauliSum":
+        return self + (-other)
+
+    def __rsub__(self, other) -> "PauliSum":
+        return (-self) + other
+
+    def __mul__(self, other) -> "PauliSum":
+        """Multiply by a number or another PauliSum.
+
+        Products of all pairs of terms are computed at once. The phase of a product
+        of Pauli strings P_1 = i^(x_1 . z_1) X^x_1 Z^z_1 and P_2 (which accounts
+        for Y = iXZ) is i^(x_1 . z_1 + x_2 . z_2 + 2 z_1 . x_2 - x_3 . z_3), where
+        (x_3, z_3) = (x_1 ^ x_2, z_1 ^ z_2) encodes the resulting Pauli string.
+        """
+        if isinstance(other, numbers.Number):
+            return PauliSum(self.x, self.z, self.coefficients * other, self.n_qubits)
+        if not isinstance(other, PauliSum):
+            return NotImplemented
+
+        n_qubits = max(self.n_qubits, other.n_qubits)
+        x_1, z_1 = (words[:, None, :] for words in self._padded_words(n_qubits))
+        x_2, z_2 = (words[None, :, :] for words in other._padded_words(n_qubits))
+        x_3, z_3 = x_1 ^ x_2, z_1 ^ z_2
+
+        phase_exponents = (
+            _popcount(x_1 & z_1)
+            + _popcount(x_2 & z_2)
+            + 2 * _popcount(z_1 & x_2)
+            - _popcount(x_3 & z_3)
+        )
+        coefficients = (
+            self.coefficients[:, None]
+            * other.coefficients[None, :]
+            * _POWERS_OF_I[phase_exponents % 4]
+        )
+        n_words = x_3.shape[-1]
+        return self._simplified(
+            x_3.reshape(-1, n_words),
+            z_3.reshape(-1, n_words),
+            coefficients.reshape(-1),
+            n_qubits,
+        )
+
+    def __rmul__(self, other) -> "PauliSum":
+        if isinstance(other, numbers.Number):
+            return self * other
+        return NotImplemented
+
+    def compress(self, abs_tol: float = EQ_TOLERANCE) -> "PauliSum":
+        """Eliminate terms with coefficients close to zero and remove small imaginary
+        and real parts.
+
+        Args:
+            abs_tol: Absolute tolerance, must be at least 0.0
+        Returns:
+            Compressed operator. Note that in contrast to
+            `SymbolicOperator.compress`, this operator is not modified.
+        """
+        real = np.where(
+            np.abs(self.coefficients.real) <= abs_tol, 0, self.coefficients.real
+        )
+        imag = np.where(
+            np.abs(self.coefficients.imag) <= abs_tol, 0, self.coefficients.imag
+        )
+        coefficients = real + 1j * imag
+        mask = np.abs(coefficients) > abs_tol
+        return PauliSum(self.x[mask], self.z[mask], coefficients[mask], self.n_qubits)
+
+    def induced_norm(self, order: int = 1) -> float:
+        r"""Compute the induced p-norm of the operator.
+
+        Same as `SymbolicOperator.induced_norm`, i.e.
+        $\left(\sum_{j} \| w_j \|^p \right)^{\frac{1}{p}}$, where $w_j$ are
+        coefficients of terms and $p$ is the order of the norm.
+
+        Args:
+            order: the order of the induced norm.
+        """
+        return float(np.sum(np.abs(self.coefficients) ** order) ** (1.0 / order))
+
+    def commute(self, other: "PauliSum") -> np.ndarray:
+        """Check which pairs of terms of this and other operator commute.
+
+        Returns:
+            Boolean array whose (i, j) entry tells whether i-th term of this operator
+            commutes with j-th term of the other.
+        """
+        n_qubits = max(self.n_qubits, other.n_qubits)
+        x_1, z_1 = (words[:, None, :] for words in self._padded_words(n_qubits))
+        x_2, z_2 = (words[None, :, :] for words in other._padded_words(n_qubits))
+        return _popcount((x_1 & z_2) ^ (z_1 & x_2)) % 2 == 0
+
+    def qubitwise_commute(self, other: "PauliSum") -> np.ndarray:
+        """Check which pairs of terms of this and other operator commute qubit-wise.
+
+        Terms commute qubit-wise (are co-measureable) if on each qubit either one
+        of them acts trivially, or both of them act with the same Pauli operator.
+
+        Returns:
+            Boolean array whose (i, j) entry tells whether i-th term of this operator
+            commutes qubit-wise with j-th term of the other.
+        """
+        n_qubits = max(self.n_qubits, other.n_qubits)
+        x_1, z_1 = (words[:, None, :] for words in self._padded_words(n_qubits))
+        x_2, z_2 = (words[None, :, :] for words in other._padded_words(n_qubits))
+        clashes = (x_1 | z_1) & (x_2 | z_2) & ((x_1 ^ x_2) | (z_1 ^ z_2))
+        return ~clashes.any(axis=-1)
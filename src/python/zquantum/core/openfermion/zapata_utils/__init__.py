@@ -22,6 +22,7 @@ from ._io import (  # noqa: F403
     save_qubit_operator_set,
 )
 from ._utils import (  # noqa: F403
+    apply_qubit_operator,
     change_operator_type,
     create_circuits_from_qubit_operator,
     evaluate_qubit_operator,
@@ -29,8 +30,10 @@ from ._utils import (  # noqa: F403
     generate_random_qubitop,
     get_diagonal_component,
     get_expectation_value,
+    get_expectation_values_of_terms,
     get_fermion_number_operator,
     get_ground_state_rdm_from_qubit_op,
+    get_pauli_masks,
     get_polynomial_tensor,
     get_qubitop_from_coeffs_and_labels,
     get_qubitop_from_matrix,
@@ -1,6 +1,6 @@
 import itertools
 import random
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 from zquantum.core.circuits import Circuit, X, Y, Z
@@ -11,6 +11,7 @@ from zquantum.core.openfermion import (
     InteractionRDM,
     PolynomialTensor,
     QubitOperator,
+    SymbolicOperator,
     count_qubits,
 )
 from zquantum.core.openfermion import expectation as openfermion_expectation
@@ -324,6 +325,142 @@ def get_expectation_value(
     return exp_val
 
 
+def get_pauli_masks(
+    operator: SymbolicOperator, n_qubits: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Encode terms of a qubit or Ising operator as pairs of bitmasks.
+
+    Each term is represented as `coefficient * X(x_mask) Z(z_mask)`, where `X(mask)`
+    (`Z(mask)`) is a product of X (Z) operators acting on qubits whose bits are set
+    in the mask. Y factors contribute to both masks, and their phase (Y = iXZ) is
+    absorbed into the coefficient. Qubit j corresponds to bit `n_qubits - 1 - j`,
+    i.e. the same ordering as the one used by Wavefunction amplitudes.
+
+    Args:
+        operator: operator comprising Pauli terms.
+        n_qubits: number of qubits the operator acts on.
+    Returns:
+        Tuple of arrays (x_masks, z_masks, coefficients) with entries for
+        consecutive terms of the operator.
+    """
+    x_masks = np.zeros(len(operator.terms), dtype=np.int64)
+    z_masks = np.zeros(len(operator.terms), dtype=np.int64)
+    coefficients = np.zeros(len(operator.terms), dtype=complex)
+
+    for i, (term, coefficient) in enumerate(operator.terms.items()):
+        for qubit, pauli in term:
+            if qubit >= n_qubits:
+                raise ValueError("Invalid number of qubits specified.")
+            bit = 1 << (n_qubits - 1 - qubit)
+            if pauli in ("X", "Y"):
+                x_masks[i] |= bit
+            if pauli in ("Y", "Z"):
+                z_masks[i] |= bit
+            if pauli == "Y":
+                coefficient *= 1j
+        coefficients[i] = coefficient
+
+    return x_masks, z_masks, coefficients
+
+
+def _parities(values: np.ndarray, n_bits: int) -> np.ndarray:
+    # After folding, the lowest bit of each value is the XOR of its n_bits bits.
+    shift = 1
+    while shift < n_bits:
+        values = values ^ (values >> shift)
+        shift *= 2
+    return values & 1
+
+
+def _walsh_hadamard_transform(vector: np.ndarray) -> np.ndarray:
+    # result[z] = sum_k vector[k] * (-1) ** popcount(k & z)
+    result = vector
+    stride = 1
+    while stride < len(vector):
+        result = result.reshape(-1, 2, stride)
+        result = np.stack(
+            (result[:, 0] + result[:, 1], result[:, 0] - result[:, 1]), axis=1
+        )
+        stride *= 2
+    return result.reshape(len(vector))
+
+
+def get_expectation_values_of_terms(
+    operator: SymbolicOperator, wavefunction: Wavefunction
+) -> np.ndarray:
+    """Get expectation values of all terms of an operator with respect to a
+    wavefunction.
+
+    In contrast to `get_expectation_value`, no matrices are constructed. Each term
+    is encoded with `get_pauli_masks`, so that P|psi> is obtained by permuting
+    amplitudes (XOR with x_mask) and flipping their signs (parity of bits selected
+    by z_mask). Terms sharing x_mask share the permuted amplitudes, and if there
+    are many of them, their sign sums are computed all at once using the
+    Walsh-Hadamard transform.
+
+    Args:
+        operator: qubit or Ising operator.
+        wavefunction: the wavefunction.
+    Returns:
+        Array of expectation values of consecutive terms, including their
+        coefficients.
+    """
+    amplitudes = np.asarray(wavefunction.amplitudes, dtype=complex)
+    n_qubits = amplitudes.shape[0].bit_length() - 1
+    x_masks, z_masks, coefficients = get_pauli_masks(operator, n_qubits)
+
+    indices = np.arange(len(amplitudes), dtype=np.int64)
+    values = np.zeros(len(coefficients), dtype=complex)
+
+    unique_x_masks, group_indices = np.unique(x_masks, return_inverse=True)
+    for group, x_mask in enumerate(unique_x_masks):
+        terms = np.flatnonzero(group_indices == group)
+        # <psi|X(x)Z(z)|psi> = sum_k conj(psi[k ^ x]) * (-1)^popcount(k & z) * psi[k]
+        products = amplitudes[indices ^ x_mask].conj() * amplitudes
+        if len(terms) > n_qubits:
+            values[terms] = _walsh_hadamard_transform(products)[z_masks[terms]]
+        else:
+            for term in terms:
+                signs = 1 - 2 * _parities(indices & z_masks[term], n_qubits)
+                values[term] = np.dot(products, signs)
+
+    return coefficients * values
+
+
+def apply_qubit_operator(
+    operator: SymbolicOperator, amplitudes: np.ndarray
+) -> np.ndarray:
+    """Apply qubit or Ising operator to a state vector.
+
+    Like `get_expectation_values_of_terms`, this works on Pauli masks and requires
+    no matrices. Terms sharing x_mask are summed into a single diagonal before
+    amplitudes are permuted.
+
+    Args:
+        operator: qubit or Ising operator.
+        amplitudes: amplitudes of the state, using the same ordering of qubits
+            as Wavefunction.
+    Returns:
+        Amplitudes of the (unnormalized) state produced by the operator.
+    """
+    amplitudes = np.asarray(amplitudes, dtype=complex)
+    n_qubits = amplitudes.shape[0].bit_length() - 1
+    x_masks, z_masks, coefficients = get_pauli_masks(operator, n_qubits)
+
+    indices = np.arange(len(amplitudes), dtype=np.int64)
+    result = np.zeros_like(amplitudes)
+
+    for x_mask in np.unique(x_masks):
+        diagonal = np.zeros_like(amplitudes)
+        for term in np.flatnonzero(x_masks == x_mask):
+            signs = 1 - 2 * _parities(indices & z_masks[term], n_qubits)
+            diagonal += coefficients[term] * signs
+        # X(x) maps basis state k to k ^ x.
+        result[indices ^ x_mask] += diagonal * amplitudes
+
+    return result
+
+
 def change_operator_type(operator, operatorType):
     """Take an operator and attempt to cast it to an operator of a different type
 
@@ -4,10 +4,12 @@
 """Serialization module."""
 import json
 import os
+import struct
+import zipfile
 from contextlib import contextmanager
 from numbers import Number
 from operator import attrgetter
-from typing import Any, Callable, Dict, Iterator, Union
+from typing import Any, Callable, Dict, Iterator, Tuple, Union
 
 import numpy as np
 from scipy.optimize import OptimizeResult
@@ -166,3 +168,108 @@ def load_array(file: LoadSource) -> np.ndarray:
         data = json.load(f)
 
     return convert_dict_to_array(data["array"])
+
+
+# Formats of files storing large numerical data, like measurements or wavefunctions.
+# Binary files are uncompressed npz archives, whose members can be memory-mapped.
+FILE_FORMATS = ("json", "npz")
+
+_HEADER_KEY = "header"
+_ZIP_MAGIC = b"PK\x03\x04"
+# Size of fixed part of zip local file header, and offset of lengths of its
+# variable-length fields (file name and extra field).
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_LOCAL_HEADER_LENGTHS_OFFSET = 26
+
+
+def check_file_format(file_format: str) -> None:
+    """Raise ValueError if file_format is not one of FILE_FORMATS."""
+    if file_format not in FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported file format {file_format}. "
+            f"Supported formats are: {', '.join(FILE_FORMATS)}."
+        )
+
+
+def is_binary_file(file: LoadSource) -> bool:
+    """Check if file was saved with `save_arrays_with_header`.
+
+    Only files given by their path can be binary, file-like objects are always
+    considered to hold JSON.
+    """
+    if not isinstance(file, (str, bytes, os.PathLike)):
+        return False
+    with open(file, "rb") as f:
+        return f.read(len(_ZIP_MAGIC)) == _ZIP_MAGIC
+
+
+def save_arrays_with_header(
+    arrays: Dict[str, np.ndarray], header: Dict[str, Any], filename: AnyPath
+) -> None:
+    """Save arrays to an uncompressed npz archive, together with JSON header.
+
+    Args:
+        arrays: mapping of names to arrays to be saved. Arrays can't contain Python
+            objects.
+        header: JSON-serializable dictionary, typically holding the schema.
+        filename: the name of the file. Contrary to `np.savez`, the .npz suffix
+            is not added to it.
+    """
+    if _HEADER_KEY in arrays:
+        raise ValueError(f"Array name {_HEADER_KEY} is reserved for the header.")
+    with open(filename, "wb") as f:
+        np.savez(f, **{_HEADER_KEY: np.array(json.dumps(header))}, **arrays)
+
+
+def _memmap_npz_member(filename: AnyPath, info: zipfile.ZipInfo) -> np.ndarray:
+    with open(filename, "rb") as f:
+        f.seek(info.header_offset + _ZIP_LOCAL_HEADER_LENGTHS_OFFSET)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        shape, fortran_order, dtype = (
+            np.lib.format.read_array_header_1_0(f)
+            if version == (1, 0)
+            else np.lib.format.read_array_header_2_0(f)
+        )
+        offset = f.tell()
+
+    if np.prod(shape) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        filename,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def load_arrays_with_header(
+    filename: AnyPath,
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Load arrays saved with `save_arrays_with_header`.
+
+    The arrays are memory-mapped, i.e. their data is read from disk only when
+    accessed, and they are read-only.
+
+    Args:
+        filename: the name of the file.
+    Returns:
+        Tuple (header, arrays).
+    """
+    with zipfile.ZipFile(os.fsdecode(filename)) as archive:
+        members = {
+            info.filename[: -len(".npy")]: info
+            for info in archive.infolist()
+            if info.filename.endswith(".npy")
+        }
+        with archive.open(members.pop(_HEADER_KEY)) as f:
+            header = json.loads(str(np.lib.format.read_array(f)))
+        if any(info.compress_type != zipfile.ZIP_STORED for info in members.values()):
+            raise ValueError("Only uncompressed archives can be memory-mapped.")
+
+    return header, {
+        name: _memmap_npz_member(filename, info) for name, info in members.items()
+    }
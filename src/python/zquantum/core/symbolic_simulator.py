@@ -1,30 +1,56 @@
 ################################################################################
 # © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, cast
 
+import numpy as np
 from sympy import Symbol
-from zquantum.core.circuits import Circuit, Operation
+from zquantum.core.circuits import Circuit, GateFusionReport, Operation, fuse_gates
+from zquantum.core.circuits._simulation import apply_operations
 from zquantum.core.circuits.layouts import CircuitConnectivity
 from zquantum.core.interfaces.backend import QuantumSimulator, StateVector
-from zquantum.core.measurement import Measurements, sample_from_wavefunction
+from zquantum.core.measurement import Measurements
+from zquantum.core.wavefunction import Wavefunction
 
 
 class SymbolicSimulator(QuantumSimulator):
-    """A simulator computing wavefunction by consecutive gate matrix multiplication.
+    """A simulator computing wavefunction by consecutive application of gates.
+
+    Gates with numeric parameters are applied by contracting their matrices only with
+    the qubits they act on. Runs of consecutive diagonal operations (e.g. RZ, CPHASE
+    or MultiPhaseOperation) are merged and applied as a single elementwise
+    multiplication. Gates with free symbols are applied by multiplying state vector
+    by their matrices lifted to the whole system.
 
     Args:
         seed: the seed of the sampler
+        gate_fusion_max_num_qubits: if provided, consecutive gates without free
+            symbols are fused into gates acting on at most that many qubits before
+            simulation (see `zquantum.core.circuits.fuse_gates`). This reduces the
+            number of passes over the state vector.
+        n_workers: if provided, `run_circuitset_and_measure` distributes circuits
+            over that many processes (see `QuantumSimulator`).
+
+    Attributes:
+        last_gate_fusion_report: report of the gate fusion performed on the most
+            recently simulated circuit, or None if gate fusion is disabled.
     """
 
+    samples_from_exact_wavefunction = True
+
     def __init__(
         self,
         noise_model: Optional[Any] = None,
         device_connectivity: Optional[CircuitConnectivity] = None,
         seed: Optional[int] = None,
+        gate_fusion_max_num_qubits: Optional[int] = None,
+        n_workers: Optional[int] = None,
     ):
         super().__init__(noise_model, device_connectivity)
         self._seed = seed
+        self.n_workers = n_workers
+        self.gate_fusion_max_num_qubits = gate_fusion_max_num_qubits
+        self.last_gate_fusion_report: Optional[GateFusionReport] = None
 
     def run_circuit_and_measure(
         self,
@@ -38,27 +64,55 @@ class SymbolicSimulator(QuantumSimulator):
             circuit: the circuit to prepare the state
             n_samples: the number of bitstrings to sample
         """
-        wavefunction = self.get_wavefunction(
-            circuit if symbol_map is None else circuit.bind(symbol_map)
+        return self._run_circuit_and_measure_with_seed(
+            circuit if symbol_map is None else circuit.bind(symbol_map),
+            n_samples,
+            self._seed,
         )
 
-        if wavefunction.free_symbols:
-            raise ValueError(
-                "Cannot sample from wavefunction with symbolic parameters."
-            )
-
-        bitstrings = sample_from_wavefunction(wavefunction, n_samples, self._seed)
-        return Measurements(bitstrings)
-
     def _get_wavefunction_from_native_circuit(
         self, circuit: Circuit, initial_state: StateVector
     ) -> StateVector:
-        state = initial_state
+        if self.gate_fusion_max_num_qubits is not None:
+            circuit, self.last_gate_fusion_report = fuse_gates(
+                circuit, self.gate_fusion_max_num_qubits
+            )
+
+        return cast(StateVector, apply_operations(circuit.operations, initial_state))
+
+    def get_wavefunctions_batch(
+        self,
+        circuit: Circuit,
+        params_matrix: np.ndarray,
+        symbols_order: Optional[Sequence[Symbol]] = None,
+    ) -> List[Wavefunction]:
+        """Returns wavefunctions produced by a circuit for many parameter vectors.
+
+        All the states are simulated together in a single sweep through the circuit,
+        see `CompiledCircuit.apply_batch`. The whole batch counts as a single job.
+        Gate fusion is not applied in this mode.
+        """
+        compiled_circuit = circuit.compile(
+            circuit.free_symbols if symbols_order is None else symbols_order
+        )
+        params_matrix = np.asarray(params_matrix)
+
+        # Circuits that remain symbolic after binding cannot be simulated numerically.
+        if not set(circuit.free_symbols) <= set(compiled_circuit.symbols):
+            return super().get_wavefunctions_batch(
+                circuit, params_matrix, symbols_order
+            )
+
+        initial_state = np.zeros(2**circuit.n_qubits, dtype=complex)
+        initial_state[0] = 1
 
-        for operation in circuit.operations:
-            state = operation.apply(state)
+        self.number_of_circuits_run += len(params_matrix)
+        self.number_of_jobs_run += 1
 
-        return state
+        return [
+            Wavefunction(amplitudes)
+            for amplitudes in compiled_circuit.apply_batch(params_matrix, initial_state)
+        ]
 
     def is_natively_supported(self, operation: Operation) -> bool:
         return True
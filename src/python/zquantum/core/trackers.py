@@ -82,12 +82,10 @@ class MeasurementTrackingBackend(QuantumBackend):
             "circuit": to_dict(circuit),
             "counts": measurement.get_counts(),
             "number_of_gates": len(circuit.operations),
-            "number_of_shots": len(measurement.bitstrings),
+            "number_of_shots": measurement.number_of_samples,
         }
         if self.record_bitstrings:
-            raw_data_dict["bitstrings"] = [
-                list(map(int, list(bitstring))) for bitstring in measurement.bitstrings
-            ]
+            raw_data_dict["bitstrings"] = measurement.bits.tolist()
         self.raw_data.append(raw_data_dict)
 
     def get_bitstring_distribution(
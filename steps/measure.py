@@ -10,6 +10,11 @@ One can also specify whether or not to keep all the bitstrings for the measureme
 outcomes by adding a key-value pair "record_bitstrings" : True to `backend-specs`.
 However keeping all the bitstrings from an experiment may create a very large
 amount of data so the default behavior is not to save the bitstrings.
+
+Steps producing measurements accept `file_format` argument, which can be either
+"json" (the default) or "npz". The latter is a binary format which is much more
+compact and faster to load for large numbers of samples. Files in both formats
+can be loaded with `Measurements.load_from_file` and `load_measurements_set`.
 """
 
 import json
@@ -29,8 +34,10 @@ from zquantum.core.measurement import (
     Measurements,
     load_expectation_values,
     save_expectation_values,
+    save_measurements_set,
 )
 from zquantum.core.openfermion import (
+    IsingOperator,
     SymbolicOperator,
     change_operator_type,
     load_interaction_rdm,
@@ -43,7 +50,6 @@ from zquantum.core.typing import Specs
 from zquantum.core.utils import (
     create_object,
     load_noise_model,
-    save_list,
     save_nmeas_estimate,
     save_value_estimate,
 )
@@ -55,6 +61,7 @@ def run_circuit_and_measure(
     n_samples: Optional[int] = None,
     noise_model: Optional[str] = None,
     device_connectivity: Optional[str] = None,
+    file_format: str = "json",
 ):
     if isinstance(backend_specs, str):
         backend_specs = json.loads(backend_specs)
@@ -79,7 +86,7 @@ def run_circuit_and_measure(
         circuit = circuits.circuit_from_dict(circuit)
 
     measurements = backend.run_circuit_and_measure(circuit, n_samples=n_samples)
-    measurements.save("measurements.json")
+    measurements.save(f"measurements.{file_format}", file_format=file_format)
 
 
 def run_circuitset_and_measure(
@@ -88,6 +95,7 @@ def run_circuitset_and_measure(
     n_samples: Optional[int] = None,
     noise_model: Optional[str] = None,
     device_connectivity: Optional[str] = None,
+    file_format: str = "json",
 ):
 
     if isinstance(backend_specs, str):
@@ -112,8 +120,9 @@ def run_circuitset_and_measure(
     measurements_set = backend.run_circuitset_and_measure(
         circuit_set, n_samples=n_samples_list
     )
-    list_of_measurements = [measurement.bitstrings for measurement in measurements_set]
-    save_list(list_of_measurements, "measurements-set.json")
+    save_measurements_set(
+        measurements_set, f"measurements-set.{file_format}", file_format=file_format
+    )
 
 
 def get_bitstring_distribution(
@@ -236,7 +245,7 @@ def evaluate_ansatz_based_cost_function(
             cost_function_specs["estimation_preprocessors"].append(
                 create_object(
                     estimation_tasks_transformation_specs,
-                    **estimation_tasks_transformations_kwargs
+                    **estimation_tasks_transformations_kwargs,
                 )
             )
 
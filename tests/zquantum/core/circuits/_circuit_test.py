@@ -205,6 +205,89 @@ class TestBindingParams:
         ]
 
 
+class TestCompilingCircuit:
+    @pytest.fixture
+    def symbols(self):
+        return sympy.symbols("alpha, beta, gamma")
+
+    @pytest.fixture
+    def circuit(self, symbols):
+        alpha, beta, gamma = symbols
+        return Circuit(
+            [
+                H(0),
+                RX(alpha)(1),
+                CNOT(0, 2),
+                RZ(2 * beta + alpha)(2),
+                XX(np.pi / 3)(1, 0),
+                RY(gamma).controlled(1)(2, 0),
+                CPHASE(beta).dagger(0, 1),
+                MultiPhaseOperation((alpha, 0, beta, 0, gamma, 0, 0.5, 0)),
+            ]
+        )
+
+    def test_binding_compiled_circuit_gives_the_same_result_as_binding_circuit(
+        self, circuit, symbols
+    ):
+        parameters = np.array([0.1, -0.5, 2.0])
+        compiled_circuit = circuit.compile(symbols)
+
+        assert compiled_circuit.bind(parameters) == circuit.bind(
+            dict(zip(symbols, parameters))
+        )
+
+    def test_binding_compiled_circuit_leaves_unknown_symbols_free(
+        self, circuit, symbols
+    ):
+        compiled_circuit = circuit.compile(symbols[:2])
+
+        bound_circuit = compiled_circuit.bind(np.array([0.1, -0.5]))
+
+        assert bound_circuit.free_symbols == [symbols[2]]
+
+    def test_applying_compiled_circuit_gives_the_same_result_as_applying_gates(
+        self, circuit, symbols
+    ):
+        parameters = np.array([0.1, -0.5, 2.0])
+        initial_state = np.zeros(8)
+        initial_state[0] = 1
+
+        expected_state = initial_state
+        for operation in circuit.bind(dict(zip(symbols, parameters))).operations:
+            expected_state = operation.apply(expected_state)
+
+        np.testing.assert_allclose(
+            circuit.compile(symbols).apply(parameters, initial_state), expected_state
+        )
+
+    def test_applying_compiled_circuit_to_batch_agrees_with_applying_it_separately(
+        self, circuit, symbols
+    ):
+        parameters_matrix = np.array([[0.1, -0.5, 2.0], [1.2, 0.0, -0.3]])
+        initial_state = np.ones(8) / np.sqrt(8)
+        compiled_circuit = circuit.compile(symbols)
+
+        np.testing.assert_allclose(
+            compiled_circuit.apply_batch(parameters_matrix, initial_state),
+            [
+                compiled_circuit.apply(parameters, initial_state)
+                for parameters in parameters_matrix
+            ],
+        )
+
+    def test_compiled_circuit_cannot_be_applied_to_batch_of_wrong_shape(
+        self, circuit, symbols
+    ):
+        with pytest.raises(ValueError):
+            circuit.compile(symbols).apply_batch(np.zeros((4, 2)), np.ones(8))
+
+    def test_compiled_circuit_cannot_be_bound_with_wrong_number_of_parameters(
+        self, circuit, symbols
+    ):
+        with pytest.raises(ValueError):
+            circuit.compile(symbols).bind(np.array([0.1, 0.2]))
+
+
 def test_splitting_circuits_partitions_it_into_expected_chunks():
     def _predicate(operation):
         return isinstance(operation, GateOperation) and operation.gate.name in (
@@ -0,0 +1,117 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Test cases for _fusion module."""
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.circuits import (
+    CNOT,
+    RX,
+    RY,
+    RZ,
+    SWAP,
+    XX,
+    Circuit,
+    FusedGate,
+    H,
+    MultiPhaseOperation,
+    X,
+    create_layer_of_gates,
+    fuse_gates,
+)
+
+EXAMPLE_CIRCUITS = [
+    Circuit([H(0), RX(0.5)(0), RZ(0.1)(0)]),
+    Circuit([H(0), H(1), CNOT(0, 1), RY(0.3)(1), CNOT(1, 2), RZ(0.2)(2), X(0)]),
+    create_layer_of_gates(4, RY, np.linspace(0, 1, 4).reshape(4, 1))
+    + Circuit([CNOT(i, i + 1) for i in range(3)])
+    + create_layer_of_gates(4, RX, np.linspace(1, 2, 4).reshape(4, 1)),
+    Circuit([XX(0.4)(3, 0), SWAP(1, 2), H(3), CNOT(2, 0), RX(1.5)(1), H(2)]),
+    Circuit(
+        [
+            H(0),
+            H(1),
+            RX(sympy.Symbol("theta"))(1),
+            CNOT(1, 0),
+            MultiPhaseOperation((0.1, 0.2, 0.3, 0.4)),
+            RY(0.5)(0),
+            RY(0.7)(0),
+        ]
+    ),
+]
+
+
+def _simulate(circuit):
+    state = np.zeros(2**circuit.n_qubits)
+    state[0] = 1
+    for operation in circuit.operations:
+        state = operation.apply(state)
+    return state
+
+
+@pytest.mark.parametrize("circuit", EXAMPLE_CIRCUITS)
+@pytest.mark.parametrize("max_num_qubits", [1, 2, 3, 4])
+class TestFusingGates:
+    def test_preserves_action_of_circuit(self, circuit, max_num_qubits):
+        fused_circuit, _ = fuse_gates(circuit, max_num_qubits)
+        symbols_map = {sympy.Symbol("theta"): 0.25}
+
+        np.testing.assert_allclose(
+            _simulate(fused_circuit.bind(symbols_map)),
+            _simulate(circuit.bind(symbols_map)),
+            atol=1e-12,
+        )
+
+    def test_fused_gates_act_on_at_most_max_num_qubits(self, circuit, max_num_qubits):
+        fused_circuit, _ = fuse_gates(circuit, max_num_qubits)
+
+        assert all(
+            len(operation.qubit_indices) <= max_num_qubits
+            for operation in fused_circuit.operations
+            if isinstance(getattr(operation, "gate", None), FusedGate)
+        )
+
+    def test_report_contains_number_of_operations_before_and_after_fusion(
+        self, circuit, max_num_qubits
+    ):
+        fused_circuit, report = fuse_gates(circuit, max_num_qubits)
+
+        assert report.original_number_of_operations == len(circuit.operations)
+        assert report.fused_number_of_operations == len(fused_circuit.operations)
+        assert report.number_of_fused_gates == sum(
+            isinstance(getattr(operation, "gate", None), FusedGate)
+            for operation in fused_circuit.operations
+        )
+
+
+def test_runs_of_gates_on_the_same_qubits_are_fused_into_single_gate():
+    circuit = Circuit([H(0), CNOT(0, 1), RX(0.5)(1), RZ(0.1)(0), CNOT(1, 0)])
+
+    fused_circuit, report = fuse_gates(circuit, 2)
+
+    assert len(fused_circuit.operations) == 1
+    assert report.number_of_fused_gates == 1
+
+
+def test_operations_with_free_symbols_are_not_fused():
+    operation = RX(sympy.Symbol("theta"))(0)
+    circuit = Circuit([H(0), operation, H(0)])
+
+    fused_circuit, report = fuse_gates(circuit, 2)
+
+    assert fused_circuit.operations == circuit.operations
+    assert report.number_of_fused_gates == 0
+
+
+def test_dagger_of_fused_gate_is_inverse_of_its_matrix():
+    gate = FusedGate((H(0), CNOT(0, 1), RX(0.5)(1)), 2)
+
+    np.testing.assert_allclose(
+        gate.dagger.numeric_matrix @ gate.numeric_matrix, np.eye(4), atol=1e-12
+    )
+
+
+def test_fused_gates_cannot_comprise_operations_with_free_symbols():
+    with pytest.raises(ValueError):
+        FusedGate((H(0), RX(sympy.Symbol("theta"))(0)), 1)
@@ -241,3 +241,15 @@ class TestGateOperation:
         state_vector = np.array([0.1 for _ in range(2**gate.num_qubits + 1)])
         with pytest.raises(ValueError):
             GateOperation(gate, tuple(range(gate.num_qubits))).apply(state_vector)
+
+    def test_applying_to_state_vector_is_equivalent_to_multiplying_by_lifted_matrix(
+        self, gate
+    ):
+        gate = gate.bind({symbol: 0.7 for symbol in gate.free_symbols})
+        op = GateOperation(gate, tuple(range(3, 3 - gate.num_qubits, -1)))
+        state_vector = np.random.default_rng(42).normal(size=16) + 0j
+        state_vector /= np.linalg.norm(state_vector)
+
+        np.testing.assert_allclose(
+            op.apply(state_vector), op.lifted_matrix(4) @ state_vector
+        )
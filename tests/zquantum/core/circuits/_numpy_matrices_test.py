@@ -0,0 +1,154 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Test cases for _numpy_matrices module."""
+from typing import Callable, cast
+
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.circuits import _builtin_gates
+from zquantum.core.circuits._gates import (
+    CustomGateDefinition,
+    Gate,
+    _gate_controlled_matrix_numpy,
+    _gate_controlled_permutation,
+    _gate_diagonal_numpy,
+    _gate_matrix_numpy,
+)
+from zquantum.core.circuits._numpy_matrices import (
+    BUILTIN_MATRIX_FACTORIES,
+    DIAGONAL_GATE_NAMES,
+    builtin_gate_matrix,
+)
+
+PARAMETRIC_GATES_PARAMS = {
+    "RX": (0.1,),
+    "RY": (-0.7,),
+    "RZ": (2.5,),
+    "RH": (1.2,),
+    "PHASE": (np.pi / 3,),
+    "U3": (0.1, 1.3, -2.5),
+    "CPHASE": (0.4,),
+    "XX": (-1.1,),
+    "YY": (0.9,),
+    "ZZ": (3.0,),
+    "XY": (0.2,),
+}
+
+
+def _builtin_gate(name: str) -> Gate:
+    gate_ref = _builtin_gates.builtin_gate_by_name(name)
+    if name in PARAMETRIC_GATES_PARAMS:
+        return cast(Callable[..., Gate], gate_ref)(*PARAMETRIC_GATES_PARAMS[name])
+    return cast(Gate, gate_ref)
+
+
+BUILTIN_GATES = [_builtin_gate(name) for name in BUILTIN_MATRIX_FACTORIES]
+
+
+def _sympy_to_numpy(matrix):
+    return np.array(matrix, dtype=complex)
+
+
+@pytest.mark.parametrize("gate", BUILTIN_GATES)
+class TestNumpyMatricesOfBuiltinGates:
+    def test_are_equal_to_sympy_matrices(self, gate):
+        np.testing.assert_allclose(
+            _gate_matrix_numpy(gate), _sympy_to_numpy(gate.matrix), atol=1e-12
+        )
+
+    def test_of_controlled_gates_are_equal_to_sympy_matrices(self, gate):
+        controlled_gate = gate.controlled(2)
+        np.testing.assert_allclose(
+            _gate_matrix_numpy(controlled_gate),
+            _sympy_to_numpy(controlled_gate.matrix),
+            atol=1e-12,
+        )
+
+    def test_of_daggers_are_equal_to_sympy_matrices(self, gate):
+        np.testing.assert_allclose(
+            _gate_matrix_numpy(gate.dagger),
+            _sympy_to_numpy(gate.dagger.matrix),
+            atol=1e-12,
+        )
+
+    def test_are_read_only(self, gate):
+        with pytest.raises(ValueError):
+            _gate_matrix_numpy(gate)[0, 0] = 2
+
+
+def test_matrices_of_builtin_gates_are_cached_by_name_and_params():
+    builtin_gate_matrix.cache_clear()
+
+    _gate_matrix_numpy(_builtin_gates.RX(0.5))
+    _gate_matrix_numpy(_builtin_gates.RX(sympy.Float(0.5)))
+    _gate_matrix_numpy(_builtin_gates.RX(0.25))
+
+    cache_info = builtin_gate_matrix.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 2
+
+
+def test_custom_gates_with_names_of_builtin_ones_are_not_confused_with_them():
+    custom_x = CustomGateDefinition(
+        gate_name="X", matrix=sympy.Matrix([[1, 0], [0, -1]]), params_ordering=()
+    )
+
+    np.testing.assert_array_equal(_gate_matrix_numpy(custom_x()), np.diag([1, -1]))
+
+
+def test_matrices_of_gates_with_free_symbols_cannot_be_computed():
+    with pytest.raises(TypeError):
+        _gate_matrix_numpy(_builtin_gates.RX(sympy.Symbol("theta")))
+
+
+DIAGONAL_GATES = [
+    gate for gate in BUILTIN_GATES if gate.name in DIAGONAL_GATE_NAMES
+] + [_builtin_gates.RZ(0.3).controlled(1), _builtin_gates.CPHASE(-0.2).dagger]
+
+
+@pytest.mark.parametrize("gate", DIAGONAL_GATES)
+def test_diagonals_of_diagonal_gates_are_equal_to_diagonals_of_their_matrices(gate):
+    np.testing.assert_allclose(
+        _gate_diagonal_numpy(gate), np.diag(_sympy_to_numpy(gate.matrix)), atol=1e-12
+    )
+
+
+@pytest.mark.parametrize(
+    "gate",
+    [
+        _builtin_gates.X,
+        _builtin_gates.RX(0.1).controlled(1),
+        _builtin_gates.RZ(sympy.Symbol("theta")),
+    ],
+)
+def test_diagonals_are_not_computed_for_non_diagonal_or_symbolic_gates(gate):
+    assert _gate_diagonal_numpy(gate) is None
+
+
+@pytest.mark.parametrize(
+    "gate, expected_permutation",
+    [
+        (_builtin_gates.X, ("X", 0)),
+        (_builtin_gates.CNOT, ("X", 1)),
+        (_builtin_gates.X.controlled(2), ("X", 2)),
+        (_builtin_gates.CNOT.controlled(1).dagger, ("X", 2)),
+        (_builtin_gates.SWAP.controlled(1), ("SWAP", 1)),
+        (_builtin_gates.Y, None),
+        (_builtin_gates.RX(np.pi), None),
+    ],
+)
+def test_gates_permuting_amplitudes_are_classified_as_controlled_x_or_swap(
+    gate, expected_permutation
+):
+    assert _gate_controlled_permutation(gate) == expected_permutation
+
+
+def test_controlled_gates_are_split_into_controls_and_matrix_of_wrapped_gate():
+    gate = _builtin_gates.RX(0.5).controlled(2).controlled(1)
+
+    num_control_qubits, matrix = _gate_controlled_matrix_numpy(gate)
+
+    assert num_control_qubits == 3
+    np.testing.assert_allclose(matrix, _gate_matrix_numpy(_builtin_gates.RX(0.5)))
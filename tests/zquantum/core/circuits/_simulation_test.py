@@ -0,0 +1,147 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Test cases for _simulation module."""
+import numpy as np
+import pytest
+import sympy
+from zquantum.core.circuits import (
+    CNOT,
+    CPHASE,
+    CZ,
+    PHASE,
+    RX,
+    RY,
+    RZ,
+    SWAP,
+    U3,
+    XX,
+    ZZ,
+    GateOperation,
+    H,
+    MultiPhaseOperation,
+    S,
+    T,
+    X,
+    Z,
+)
+from zquantum.core.circuits._simulation import (
+    _apply_operations_to_tensor,
+    apply_operations,
+)
+
+EXAMPLE_OPERATIONS = [
+    [RZ(0.5)(2), ZZ(0.1)(0, 2), CPHASE(0.3)(2, 1), S(0), T(1)],
+    [H(0), H(1), H(2), ZZ(0.7)(2, 0), RX(0.2)(1), CZ(1, 2), PHASE(-0.4)(0)],
+    [
+        H(0),
+        MultiPhaseOperation(tuple(np.linspace(0, 1, 8))),
+        RZ(0.3).controlled(1)(2, 0),
+        CPHASE(1.1).dagger(1, 2),
+        CNOT(0, 1),
+        Z(2),
+    ],
+    [H(0), RX(0.3)(2), CNOT(0, 1), CNOT(1, 2), X(0), SWAP(2, 0), CNOT(2, 1)],
+    [
+        H(1),
+        RX(0.3)(2),
+        X.controlled(2)(2, 0, 1),
+        SWAP.controlled(1)(1, 2, 0),
+        CNOT.dagger(1, 0),
+        RZ(0.5)(2),
+        X(1),
+    ],
+    [
+        H(0),
+        H(1),
+        RY(0.4).controlled(2)(0, 2, 1),
+        H.controlled(1)(2, 0),
+        U3(0.1, 0.2, 0.3).controlled(1).controlled(1)(1, 2, 0),
+        XX(0.5).controlled(1)(0, 2, 1),
+    ],
+]
+
+
+def _apply_one_by_one(operations, state):
+    for operation in operations:
+        state = (
+            operation.lifted_matrix(3) @ state
+            if isinstance(operation, GateOperation)
+            else operation.apply(state)
+        )
+    return state
+
+
+def _random_state(num_qubits, seed=42):
+    rng = np.random.default_rng(seed)
+    state = rng.normal(size=2**num_qubits) + 1j * rng.normal(size=2**num_qubits)
+    return state / np.linalg.norm(state)
+
+
+@pytest.mark.parametrize("operations", EXAMPLE_OPERATIONS)
+class TestApplyingOperations:
+    def test_gives_the_same_result_as_applying_operations_one_by_one(self, operations):
+        state = _random_state(3)
+
+        np.testing.assert_allclose(
+            apply_operations(operations, state),
+            _apply_one_by_one(operations, state),
+            atol=1e-12,
+        )
+
+    def test_to_batch_gives_the_same_result_as_applying_operations_to_each_state(
+        self, operations
+    ):
+        states = np.stack([_random_state(3, seed) for seed in range(4)], axis=-1)
+
+        result = _apply_operations_to_tensor(
+            operations, states.copy().reshape((2, 2, 2, 4)), 3
+        ).reshape(8, 4)
+
+        np.testing.assert_allclose(
+            result,
+            np.stack(
+                [_apply_one_by_one(operations, state) for state in states.T], axis=-1
+            ),
+            atol=1e-12,
+        )
+
+
+def test_batched_operations_are_applied_to_corresponding_states():
+    angles = [0.1, 0.2, -0.3]
+    operations = [
+        H(0),
+        [ZZ(angle)(0, 1) for angle in angles],
+        RZ(0.4)(1),
+        [RX(angle)(1) for angle in angles],
+        [RY(angle).controlled(1)(1, 0) for angle in angles],
+    ]
+    initial_state = _random_state(2)
+    tensor = np.repeat(initial_state[:, np.newaxis], 3, axis=1).reshape(2, 2, 3)
+
+    result = _apply_operations_to_tensor(operations, tensor, 2).reshape(4, 3)
+
+    for k, angle in enumerate(angles):
+        np.testing.assert_allclose(
+            result[:, k],
+            apply_operations(
+                [
+                    H(0),
+                    ZZ(angle)(0, 1),
+                    RZ(0.4)(1),
+                    RX(angle)(1),
+                    RY(angle).controlled(1)(1, 0),
+                ],
+                initial_state,
+            ),
+            atol=1e-12,
+        )
+
+
+def test_operations_with_free_symbols_are_applied_symbolically():
+    theta = sympy.Symbol("theta")
+    operations = [H(0), RZ(theta)(0)]
+
+    result = apply_operations(operations, np.array([1, 0]))
+
+    assert sympy.Matrix(result).free_symbols == {theta}
@@ -4,7 +4,22 @@
 import numpy as np
 import pytest
 import sympy
-from zquantum.core.circuits import RX, RY, RZ, XX, XY, YY, Circuit, H, I, X, Y, Z
+from zquantum.core.circuits import (
+    RX,
+    RY,
+    RZ,
+    XX,
+    XY,
+    YY,
+    Circuit,
+    H,
+    I,
+    X,
+    Y,
+    Z,
+    _circuit,
+)
+from zquantum.core.circuits._unitary_tools import _lift_matrix_sympy
 
 
 class TestCreatingUnitaryFromCircuit:
@@ -71,3 +86,79 @@ class TestCreatingUnitaryFromCircuit:
         np.testing.assert_array_almost_equal(
             np.array(parameterized_unitary.subs(symbols_map), dtype=complex), unitary
         )
+
+    def test_computed_in_many_batches_of_basis_states_is_the_same_as_in_one(
+        self, monkeypatch
+    ):
+        circuit = Circuit([H(0), XX(0.3)(0, 2), RY(0.2).controlled(1)(2, 1), X(1)])
+        expected_unitary = circuit.to_unitary()
+
+        monkeypatch.setattr(_circuit, "UNITARY_COLUMNS_BATCH_SIZE", 3)
+
+        np.testing.assert_allclose(circuit.to_unitary(), expected_unitary)
+
+    def test_of_circuit_without_free_params_is_product_of_lifted_matrices(self):
+        circuit = Circuit(
+            [H(0), RZ(0.5)(1), XY(0.7)(2, 0), YY(0.1).controlled(1)(0, 1, 2)]
+        )
+
+        np.testing.assert_allclose(
+            circuit.to_unitary(),
+            circuit.operations[3].lifted_matrix(3)
+            @ circuit.operations[2].lifted_matrix(3)
+            @ circuit.operations[1].lifted_matrix(3)
+            @ circuit.operations[0].lifted_matrix(3),
+            atol=1e-12,
+        )
+
+
+class TestCreatingLinearOperatorFromCircuit:
+    def test_applies_unitary_of_circuit_to_vectors_and_matrices(self):
+        circuit = Circuit([H(0), RX(0.5)(1), XX(0.3)(0, 2), Y(2)])
+        unitary = circuit.to_unitary()
+        rng = np.random.default_rng(1234)
+        matrix = rng.normal(size=(8, 3)) + 1j * rng.normal(size=(8, 3))
+
+        linear_operator = circuit.to_linear_operator()
+
+        assert linear_operator.shape == (8, 8)
+        np.testing.assert_allclose(
+            linear_operator @ matrix[:, 0], unitary @ matrix[:, 0]
+        )
+        np.testing.assert_allclose(linear_operator @ matrix, unitary @ matrix)
+
+    def test_cannot_be_created_from_circuit_with_free_symbols(self):
+        circuit = Circuit([RX(sympy.Symbol("theta"))(0)])
+
+        with pytest.raises(ValueError):
+            circuit.to_linear_operator()
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        XX(0.3)(4, 1),
+        RY(0.2).controlled(2)(3, 0, 2),
+        XY(-1.2)(0, 4),
+        H(2),
+    ],
+)
+class TestLiftingGateMatrices:
+    def test_numpy_lifted_matrix_is_equal_to_unitary_of_single_gate_circuit(
+        self, operation
+    ):
+        np.testing.assert_allclose(
+            operation.lifted_matrix(5),
+            Circuit([operation], n_qubits=5).to_unitary(),
+            atol=1e-12,
+        )
+
+    def test_sympy_lifted_matrix_is_equal_to_numpy_one(self, operation):
+        np.testing.assert_allclose(
+            np.array(
+                _lift_matrix_sympy(operation.gate.matrix, operation.qubit_indices, 5),
+                dtype=complex,
+            ),
+            operation.lifted_matrix(5),
+            atol=1e-12,
+        )
@@ -172,6 +172,43 @@ class TestGroundStateCostFunction:
         # to compare arguments, which does not produce boolean value for numpy arrays
 
 
+class TestCostFunctionBatch:
+    @pytest.fixture
+    def estimation_tasks_factory(self):
+        return expectation_value_estimation_tasks_factory(
+            QubitOperator("Z0 Z1") + QubitOperator("X1", 0.5),
+            MockAnsatz(number_of_layers=2, problem_size=2).parametrized_circuit,
+        )
+
+    def test_batch_agrees_with_evaluating_each_row_separately(
+        self, estimation_tasks_factory
+    ):
+        cost_function = create_cost_function(
+            BACKEND,
+            estimation_tasks_factory,
+            calculate_exact_expectation_values,
+            [fix_parameters(np.array([0.7]))],
+        )
+        params_matrix = np.array([[0.1], [1.0], [-1.1]])
+
+        np.testing.assert_allclose(
+            cost_function.batch(params_matrix),
+            [cost_function(params) for params in params_matrix],
+        )
+
+    def test_batch_estimates_all_rows_in_single_call(self, estimation_tasks_factory):
+        estimation_method = mock.Mock(wraps=calculate_exact_expectation_values)
+        cost_function = create_cost_function(
+            BACKEND, estimation_tasks_factory, estimation_method
+        )
+
+        values = cost_function.batch(np.random.default_rng(RNGSEED).random((5, 2)))
+
+        assert len(values) == 5
+        estimation_method.assert_called_once()
+        assert len(estimation_method.call_args[0][1]) == 5
+
+
 class TestSumExpectationValues:
     def test_sum_expectation_values(self):
         expectation_values = ExpectationValues(np.array([5, -2, 1]))
@@ -11,6 +11,7 @@ from zquantum.core.estimation import (
     allocate_shots_proportionally,
     allocate_shots_uniformly,
     calculate_exact_expectation_values,
+    estimate_expectation_values_adaptively,
     estimate_expectation_values_by_averaging,
     evaluate_estimation_circuits,
     evaluate_non_measured_estimation_tasks,
@@ -21,6 +22,7 @@ from zquantum.core.estimation import (
     split_estimation_tasks_to_measure,
 )
 from zquantum.core.interfaces.estimation import EstimationTask
+from zquantum.core.interfaces.estimator_contract import ESTIMATOR_CONTRACTS
 from zquantum.core.interfaces.mock_objects import MockQuantumBackend
 from zquantum.core.measurement import ExpectationValues, Measurements
 from zquantum.core.openfermion import (
@@ -30,6 +32,7 @@ from zquantum.core.openfermion import (
 )
 from zquantum.core.openfermion.zapata_utils._utils import change_operator_type
 from zquantum.core.symbolic_simulator import SymbolicSimulator
+from zquantum.core.utils import RNDSEED
 
 
 class TestEstimatorUtils:
@@ -873,3 +876,92 @@ class TestBasicEstimationMethods:
 
         assert len(expectation_values_list) == 1
         assert expectation_values_list[0] == target[0]
+
+
+class _ShotsRecordingBackend:
+    def __init__(self, backend):
+        self.backend = backend
+        self.shots_per_call = []
+
+    def run_circuitset_and_measure(self, circuits, n_samples):
+        self.shots_per_call.append(list(n_samples))
+        return self.backend.run_circuitset_and_measure(circuits, n_samples)
+
+
+class TestAdaptiveEstimation:
+    @pytest.mark.parametrize("contract", ESTIMATOR_CONTRACTS)
+    def test_satisfies_estimator_contract(self, contract):
+        assert contract(
+            partial(estimate_expectation_values_adaptively, target_precision=0.05)
+        )
+
+    def test_eigenstates_are_measured_beyond_pilot_shots_if_target_is_not_met(self):
+        backend = _ShotsRecordingBackend(SymbolicSimulator(seed=RNDSEED))
+        tasks = [EstimationTask(IsingOperator("Z0 Z1"), Circuit([X(0), I(1)]), 1000)]
+
+        expectation_values = estimate_expectation_values_adaptively(
+            backend, tasks, target_precision=0.01, pilot_number_of_shots=50
+        )
+
+        # Even though all the pilot shots give the same outcome, error estimated
+        # with Laplace's rule after 50 shots is still above the target.
+        assert len(backend.shots_per_call) == 2
+        assert backend.shots_per_call[0] == [50]
+        assert 50 + backend.shots_per_call[1][0] <= 1000
+        np.testing.assert_array_equal(expectation_values[0].values, [-1.0])
+
+    def test_measures_only_pilot_shots_of_eigenstates_if_target_is_loose(self):
+        backend = _ShotsRecordingBackend(SymbolicSimulator(seed=RNDSEED))
+        tasks = [EstimationTask(IsingOperator("Z0 Z1"), Circuit([X(0), I(1)]), 1000)]
+
+        estimate_expectation_values_adaptively(
+            backend, tasks, target_precision=0.1, pilot_number_of_shots=50
+        )
+
+        assert backend.shots_per_call == [[50]]
+
+    def test_measures_tasks_until_target_precision_is_met(self):
+        backend = _ShotsRecordingBackend(SymbolicSimulator(seed=RNDSEED))
+        tasks = [
+            EstimationTask(IsingOperator("Z0"), Circuit([X(0)]), 10000),
+            EstimationTask(IsingOperator("Z0", 2.0), Circuit([H(0)]), 10000),
+        ]
+
+        expectation_values = estimate_expectation_values_adaptively(
+            backend, tasks, target_precision=0.1
+        )
+
+        # Only the second task, whose variance is non-zero, is measured again.
+        assert backend.shots_per_call[0] == [100, 100]
+        assert all(len(shots) == 1 for shots in backend.shots_per_call[1:])
+        assert np.sum(expectation_values[1].estimator_covariances) <= 0.1**2
+        assert sum(shots[-1] for shots in backend.shots_per_call) <= 10000
+
+    def test_never_exceeds_budget_of_a_task(self):
+        backend = _ShotsRecordingBackend(SymbolicSimulator(seed=RNDSEED))
+        tasks = [EstimationTask(IsingOperator("Z0"), Circuit([H(0)]), 500)]
+
+        estimate_expectation_values_adaptively(backend, tasks, target_precision=1e-4)
+
+        assert sum(shots[0] for shots in backend.shots_per_call) == 500
+
+    def test_includes_tasks_that_are_not_measured(self):
+        tasks = [
+            EstimationTask(IsingOperator("[]", 2.5), Circuit([H(0)]), 100),
+            EstimationTask(IsingOperator("Z0"), Circuit([H(0)]), 0),
+        ]
+
+        expectation_values = estimate_expectation_values_adaptively(
+            SymbolicSimulator(), tasks, target_precision=0.1
+        )
+
+        np.testing.assert_array_equal(expectation_values[0].values, [2.5])
+        np.testing.assert_array_equal(expectation_values[1].values, [0.0])
+
+    def test_requires_number_of_shots_of_each_task(self):
+        tasks = [EstimationTask(IsingOperator("Z0"), Circuit([H(0)]), None)]
+
+        with pytest.raises(ValueError):
+            estimate_expectation_values_adaptively(
+                SymbolicSimulator(), tasks, target_precision=0.1
+            )
@@ -2,9 +2,48 @@
 # © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
 """Tests for core.gradients module."""
+from functools import partial
+from unittest.mock import Mock
+
 import numpy as np
 import pytest
-from zquantum.core.gradients import finite_differences_gradient
+import sympy
+from zquantum.core.circuits import (
+    CNOT,
+    CPHASE,
+    PHASE,
+    RH,
+    RX,
+    RY,
+    RZ,
+    U3,
+    XX,
+    XY,
+    YY,
+    ZZ,
+    Circuit,
+    H,
+)
+from zquantum.core.cost_function import (
+    create_cost_function,
+    expectation_value_estimation_tasks_factory,
+    fix_parameters,
+)
+from zquantum.core.estimation import (
+    allocate_shots_uniformly,
+    calculate_exact_expectation_values,
+    estimate_expectation_values_by_averaging,
+    group_greedily,
+    perform_context_selection,
+)
+from zquantum.core.gradients import (
+    adjoint_gradient,
+    finite_differences_gradient,
+    parameter_shift_gradient,
+)
+from zquantum.core.interfaces.mock_objects import MockQuantumBackend
+from zquantum.core.openfermion import QubitOperator
+from zquantum.core.symbolic_simulator import SymbolicSimulator
 
 
 def sum_x_squared(parameters: np.ndarray) -> float:
@@ -42,3 +81,215 @@ def test_finite_differences_gradient_uses_supplied_epsilon_to_compute_gradient_e
     ) / (2 * epsilon)
 
     assert np.array_equal(expected_gradient_value, gradient(parameters))
+
+
+def test_finite_differences_gradient_evaluates_shifted_parameters_in_single_batch():
+    batches = []
+
+    def _batch(parameters_matrix):
+        batches.append(parameters_matrix)
+        return [sum_x_squared(parameters) for parameters in parameters_matrix]
+
+    function = Mock(wraps=sum_x_squared)
+    function.batch = _batch
+    parameters = np.array([-0.5, 0.25, 1])
+
+    gradient = finite_differences_gradient(function, 0.001)(parameters)
+
+    np.testing.assert_allclose(
+        gradient, finite_differences_gradient(sum_x_squared, 0.001)(parameters)
+    )
+    function.assert_not_called()
+    assert len(batches) == 1
+    assert batches[0].shape == (6, 3)
+
+
+ALPHA, BETA, GAMMA, DELTA = sympy.symbols("alpha beta gamma delta")
+
+TARGET_OPERATOR = (
+    QubitOperator("Z0 X1", 0.7)
+    + QubitOperator("Y2", -0.4)
+    + QubitOperator("X0 Y1 Z2", 1.1)
+    + 0.3
+)
+
+
+ROTATION_GATES_CIRCUIT = Circuit(
+    [
+        H(0),
+        RX(2 * ALPHA)(0),
+        RY(BETA)(1),
+        CNOT(0, 1),
+        XX(ALPHA * BETA)(1, 2),
+        RZ(GAMMA).controlled(1)(2, 0),
+        CPHASE(DELTA)(0, 2),
+        RX(GAMMA).dagger(2),
+        PHASE(ALPHA + 1)(1),
+        XY(DELTA)(0, 1),
+        ZZ(GAMMA)(1, 2),
+        YY(BETA)(0, 2),
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "circuit",
+    [
+        # Gates differentiated using their generators.
+        ROTATION_GATES_CIRCUIT,
+        # Gates differentiated using derivatives of their matrices.
+        Circuit(
+            [
+                H(0),
+                H(1),
+                U3(ALPHA, BETA, 0.3)(1),
+                RH(GAMMA)(0),
+                CNOT(1, 2),
+                U3(DELTA, 0.1, ALPHA).controlled(1)(0, 2),
+                RH(BETA).dagger(1),
+            ]
+        ),
+    ],
+)
+def test_adjoint_gradient_agrees_with_finite_differences_gradient(circuit):
+    estimation_tasks_factory = expectation_value_estimation_tasks_factory(
+        TARGET_OPERATOR, circuit
+    )
+    parameters = np.array([0.3, -0.7, 1.1, 0.4])
+
+    cost_function = create_cost_function(
+        SymbolicSimulator(),
+        estimation_tasks_factory,
+        calculate_exact_expectation_values,
+        gradient_function=adjoint_gradient,
+    )
+    reference_cost_function = create_cost_function(
+        SymbolicSimulator(),
+        estimation_tasks_factory,
+        calculate_exact_expectation_values,
+        gradient_function=finite_differences_gradient,
+    )
+
+    np.testing.assert_allclose(
+        cost_function.gradient(parameters),
+        reference_cost_function.gradient(parameters),
+        atol=1e-6,
+    )
+
+
+def test_adjoint_gradient_supports_estimation_tasks_with_grouped_operators():
+    circuit = Circuit([RY(ALPHA)(0), CNOT(0, 1), RX(BETA)(2)])
+    estimation_tasks_factory = expectation_value_estimation_tasks_factory(
+        TARGET_OPERATOR, circuit, [group_greedily, perform_context_selection]
+    )
+    parameters = np.array([0.5, -1.2])
+
+    gradients = [
+        create_cost_function(
+            SymbolicSimulator(),
+            estimation_tasks_factory,
+            calculate_exact_expectation_values,
+            gradient_function=gradient_function,
+        ).gradient(parameters)
+        for gradient_function in [adjoint_gradient, finite_differences_gradient]
+    ]
+
+    np.testing.assert_allclose(gradients[0], gradients[1], atol=1e-6)
+
+
+def test_adjoint_gradient_requires_simulator_backend():
+    with pytest.raises(ValueError):
+        create_cost_function(
+            MockQuantumBackend(),
+            expectation_value_estimation_tasks_factory(
+                TARGET_OPERATOR, Circuit([RX(ALPHA)(0)])
+            ),
+            gradient_function=adjoint_gradient,
+        )
+
+
+def test_adjoint_gradient_does_not_support_parameter_preprocessors():
+    with pytest.raises(ValueError):
+        create_cost_function(
+            SymbolicSimulator(),
+            expectation_value_estimation_tasks_factory(
+                TARGET_OPERATOR, Circuit([RX(ALPHA)(0)])
+            ),
+            parameter_preprocessors=[fix_parameters(np.array([0.1]))],
+            gradient_function=adjoint_gradient,
+        )
+
+
+class _MeasurementsCountingSimulator(SymbolicSimulator):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.circuitset_sizes = []
+
+    def run_circuitset_and_measure(self, circuits, n_samples):
+        self.circuitset_sizes.append(len(circuits))
+        return super().run_circuitset_and_measure(circuits, n_samples)
+
+
+def test_parameter_shift_gradient_agrees_with_finite_differences_gradient():
+    estimation_tasks_factory = expectation_value_estimation_tasks_factory(
+        TARGET_OPERATOR, ROTATION_GATES_CIRCUIT
+    )
+    parameters = np.array([0.3, -0.7, 1.1, 0.4])
+
+    gradients = [
+        create_cost_function(
+            SymbolicSimulator(),
+            estimation_tasks_factory,
+            calculate_exact_expectation_values,
+            gradient_function=gradient_function,
+        ).gradient(parameters)
+        for gradient_function in [parameter_shift_gradient, finite_differences_gradient]
+    ]
+
+    np.testing.assert_allclose(gradients[0], gradients[1], atol=1e-6)
+
+
+def test_parameter_shift_gradient_measures_all_shifted_circuits_in_single_call():
+    circuit = Circuit([RY(ALPHA)(0), CNOT(0, 1), XY(BETA)(1, 2)])
+    # Duplicated tasks produce identical shifted circuits, measured only once.
+    estimation_tasks_factory = expectation_value_estimation_tasks_factory(
+        TARGET_OPERATOR - 0.3,
+        circuit,
+        [
+            group_greedily,
+            perform_context_selection,
+            partial(allocate_shots_uniformly, number_of_shots=20000),
+            lambda estimation_tasks: estimation_tasks + estimation_tasks,
+        ],
+    )
+    backend = _MeasurementsCountingSimulator(seed=1234)
+    parameters = np.array([0.5, -1.2])
+
+    gradient = create_cost_function(
+        backend,
+        estimation_tasks_factory,
+        estimate_expectation_values_by_averaging,
+        gradient_function=parameter_shift_gradient,
+    ).gradient(parameters)
+    reference_gradient = create_cost_function(
+        SymbolicSimulator(),
+        estimation_tasks_factory,
+        calculate_exact_expectation_values,
+        gradient_function=adjoint_gradient,
+    ).gradient(parameters)
+
+    n_groups = len(estimation_tasks_factory.estimation_tasks) // 2
+    # Two-term rule for RY and four-term rule for XY.
+    assert backend.circuitset_sizes == [n_groups * (2 + 4)]
+    np.testing.assert_allclose(gradient, reference_gradient, atol=0.1)
+
+
+def test_parameter_shift_gradient_does_not_support_non_rotation_gates():
+    with pytest.raises(ValueError):
+        create_cost_function(
+            SymbolicSimulator(),
+            expectation_value_estimation_tasks_factory(
+                TARGET_OPERATOR, Circuit([U3(ALPHA, BETA, 0.3)(0)])
+            ),
+            gradient_function=parameter_shift_gradient,
+        )
@@ -152,3 +152,39 @@ def test_recorder_stores_copy_of_parameters(source_function, params_sequence):
     for original_params, entry in zip(params_sequence, function.history):
         np.testing.assert_array_equal(original_params, entry.params)
         assert original_params is not entry.params
+
+
+class _FunctionWithBatch:
+    def __init__(self):
+        self.batch_calls = 0
+
+    def __call__(self, params):
+        return sum_of_squares(params)
+
+    def batch(self, params_matrix):
+        self.batch_calls += 1
+        return [sum_of_squares(params) for params in params_matrix]
+
+
+@pytest.mark.parametrize("source_function", [sum_of_squares, _FunctionWithBatch()])
+def test_recorder_records_batch_evaluations_as_consecutive_calls(source_function):
+    function = recorder(source_function, save_condition=every_nth(2))
+    function(np.array([1, 1]))
+    params_matrix = np.array([[1, 2], [3, 4], [5, 6]])
+
+    values = function.batch(params_matrix)
+
+    assert values == [sum_of_squares(params) for params in params_matrix]
+    assert function.call_number == 4
+    assert [entry.call_number for entry in function.history] == [0, 2]
+    np.testing.assert_array_equal(function.history[1].params, [3, 4])
+
+
+def test_recorder_evaluates_batch_in_single_call_to_batch_of_wrapped_function():
+    source_function = _FunctionWithBatch()
+    function = recorder(source_function)
+
+    function.batch(np.array([[1, 2], [3, 4], [5, 6]]))
+
+    assert source_function.batch_calls == 1
+    assert len(function.history) == 3
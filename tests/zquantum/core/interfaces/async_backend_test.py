@@ -0,0 +1,164 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from zquantum.core.circuits import RX, Circuit, H, X
+from zquantum.core.estimation import (
+    estimate_expectation_values_by_averaging,
+    estimate_expectation_values_by_averaging_async,
+)
+from zquantum.core.interfaces.async_backend import (
+    LocalAsyncSimulator,
+    SyncBackendAdapter,
+)
+from zquantum.core.interfaces.estimation import EstimationTask
+from zquantum.core.openfermion import IsingOperator
+from zquantum.core.symbolic_simulator import SymbolicSimulator
+
+CIRCUITS = [
+    Circuit([X(0)]),
+    Circuit([H(0), X(1)]),
+    Circuit([RX(0.5)(0)]),
+    Circuit([X(0), X(1), X(2)]),
+    Circuit([H(1)]),
+]
+N_SAMPLES = [10, 20, 30, 40, 50]
+
+
+class _JobsRecordingSimulator(SymbolicSimulator):
+    def __init__(self):
+        super().__init__(seed=1234)
+        self.jobs = []
+
+    def run_circuitset_and_measure(self, circuits, n_samples):
+        self.jobs.append(len(circuits))
+        return super().run_circuitset_and_measure(circuits, n_samples)
+
+
+class _ConcurrencyRecordingSimulator(SymbolicSimulator):
+    def __init__(self):
+        super().__init__(seed=1234)
+        self.active_calls = 0
+        self.max_active_calls = 0
+
+    def run_circuitset_and_measure(self, circuits, n_samples):
+        self.active_calls += 1
+        self.max_active_calls = max(self.max_active_calls, self.active_calls)
+        time.sleep(0.01)
+        try:
+            return super().run_circuitset_and_measure(circuits, n_samples)
+        finally:
+            self.active_calls -= 1
+
+
+class TestSyncBackendAdapter:
+    @pytest.mark.parametrize("batch_size", [1, 2, 5, 10])
+    def test_gives_the_same_measurements_as_wrapped_backend(self, batch_size):
+        backend = SymbolicSimulator(seed=1234)
+        adapter = SyncBackendAdapter(backend, batch_size=batch_size)
+
+        measurements_set = asyncio.run(
+            adapter.run_circuitset_and_measure(CIRCUITS, N_SAMPLES)
+        )
+
+        assert [measurements.bitstrings for measurements in measurements_set] == [
+            measurements.bitstrings
+            for measurements in backend.run_circuitset_and_measure(CIRCUITS, N_SAMPLES)
+        ]
+
+    def test_splits_circuits_into_jobs_of_at_most_batch_size_circuits(self):
+        backend = _JobsRecordingSimulator()
+        adapter = SyncBackendAdapter(backend, batch_size=2)
+
+        asyncio.run(adapter.run_circuitset_and_measure(CIRCUITS, N_SAMPLES))
+
+        assert sorted(backend.jobs) == [1, 2, 2]
+
+    def test_counts_all_circuits_run_in_concurrent_jobs(self):
+        backend = SymbolicSimulator(seed=1234)
+        adapter = SyncBackendAdapter(backend, max_concurrent_jobs=8, batch_size=1)
+        circuits = [Circuit([H(0), RX(0.1 * i)(1)]) for i in range(64)]
+
+        asyncio.run(adapter.run_circuitset_and_measure(circuits, [10] * 64))
+        adapter.shutdown()
+
+        assert backend.number_of_circuits_run == 64
+        assert backend.number_of_jobs_run == 64
+
+    def test_serializes_calls_to_wrapped_simulator(self):
+        backend = _ConcurrencyRecordingSimulator()
+        adapter = SyncBackendAdapter(backend, max_concurrent_jobs=4, batch_size=1)
+
+        asyncio.run(adapter.run_circuitset_and_measure(CIRCUITS, N_SAMPLES))
+        adapter.shutdown()
+
+        assert backend.max_active_calls == 1
+
+    def test_cannot_be_created_with_non_positive_number_of_concurrent_jobs(self):
+        with pytest.raises(ValueError):
+            SyncBackendAdapter(SymbolicSimulator(), max_concurrent_jobs=0)
+
+
+class TestLocalAsyncSimulator:
+    def test_executes_jobs_concurrently(self):
+        backend = LocalAsyncSimulator(
+            SymbolicSimulator(), latency=0.2, max_concurrent_jobs=5
+        )
+
+        start = time.perf_counter()
+        asyncio.run(backend.run_circuitset_and_measure(CIRCUITS, N_SAMPLES))
+        elapsed = time.perf_counter() - start
+
+        # Sequential execution would take at least 5 * latency.
+        assert elapsed < 3 * 0.2
+
+    def test_runs_at_most_max_concurrent_jobs_at_the_same_time(self):
+        backend = LocalAsyncSimulator(
+            SymbolicSimulator(), latency=0.1, max_concurrent_jobs=2
+        )
+
+        start = time.perf_counter()
+        asyncio.run(backend.run_circuitset_and_measure(CIRCUITS, N_SAMPLES))
+        elapsed = time.perf_counter() - start
+
+        # 5 jobs, at most 2 of them at the same time.
+        assert elapsed >= 3 * 0.1
+
+    def test_can_execute_jobs_in_processes(self):
+        backend = LocalAsyncSimulator(
+            SymbolicSimulator(seed=1234), max_concurrent_jobs=2, use_processes=True
+        )
+
+        measurements_set = asyncio.run(
+            backend.run_circuitset_and_measure(CIRCUITS, N_SAMPLES)
+        )
+        backend.shutdown()
+
+        assert [
+            measurements.number_of_samples for measurements in measurements_set
+        ] == N_SAMPLES
+
+
+def test_async_estimation_agrees_with_sync_estimation():
+    estimation_tasks = [
+        EstimationTask(IsingOperator("Z0"), Circuit([H(0)]), 100),
+        EstimationTask(IsingOperator("[]", 2.0), Circuit([H(0)]), 100),
+        EstimationTask(IsingOperator("Z0 Z1") + 0.5, Circuit([RX(0.3)(1)]), 200),
+    ]
+    backend = SymbolicSimulator(seed=1234)
+
+    expectation_values = asyncio.run(
+        estimate_expectation_values_by_averaging_async(
+            LocalAsyncSimulator(backend, latency=0.01), estimation_tasks
+        )
+    )
+
+    for actual, expected in zip(
+        expectation_values,
+        estimate_expectation_values_by_averaging(backend, estimation_tasks),
+    ):
+        np.testing.assert_array_equal(actual.values, expected.values)
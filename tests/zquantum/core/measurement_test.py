@@ -8,27 +8,35 @@ from collections import Counter
 
 import numpy as np
 import pytest
+import sympy
 from zquantum.core.distribution import MeasurementOutcomeDistribution
 from zquantum.core.measurement import (
     ExpectationValues,
+    ExpectationValuesAccumulator,
     Measurements,
     Parities,
-    _check_sample_elimination,
+    WavefunctionSampler,
     check_parity,
     check_parity_of_vector,
     concatenate_expectation_values,
+    concatenate_measurements,
     convert_bitstring_to_int,
     expectation_values_to_real,
     get_expectation_value_from_frequencies,
     get_expectation_values_from_parities,
     get_parities_from_measurements,
     load_expectation_values,
+    load_measurements_set,
     load_parities,
     load_wavefunction,
+    sample_counts_from_wavefunction,
     sample_from_wavefunction,
+    sample_packed_outcomes_from_wavefunction,
     save_expectation_values,
+    save_measurements_set,
     save_parities,
     save_wavefunction,
+    unpack_outcomes,
 )
 from zquantum.core.openfermion.ops import IsingOperator
 from zquantum.core.testing import create_random_wavefunction
@@ -127,6 +135,24 @@ def test_sample_from_wavefunction():
         assert np.allclose(sampled_prob, exact_prob, atol=0.01)
 
 
+def test_wavefunction_can_be_saved_in_binary_format(tmp_path):
+    wavefunction = create_random_wavefunction(4, seed=RNDSEED)
+    path = tmp_path / "wavefunction.npz"
+
+    save_wavefunction(wavefunction, path, file_format="npz")
+
+    np.testing.assert_array_equal(
+        load_wavefunction(path).amplitudes, wavefunction.amplitudes
+    )
+
+
+def test_wavefunction_with_free_symbols_cannot_be_saved_in_binary_format(tmp_path):
+    wavefunction = Wavefunction([sympy.Symbol("alpha"), 0])
+
+    with pytest.raises(ValueError):
+        save_wavefunction(wavefunction, tmp_path / "wavefunction.npz", "npz")
+
+
 def test_sample_from_wavefunction_column_vector():
     n_qubits = 4
     expected_bitstring = (0, 0, 0, 1)
@@ -170,6 +196,58 @@ def test_sample_from_wavefunction_fails_for_invalid_n_samples(n_samples):
         sample_from_wavefunction(wavefunction, n_samples)
 
 
+def test_unpacking_outcomes_gives_bits_of_consecutive_qubits():
+    np.testing.assert_array_equal(
+        unpack_outcomes(np.array([0, 1, 6, 5]), 3),
+        [[0, 0, 0], [0, 0, 1], [1, 1, 0], [1, 0, 1]],
+    )
+
+
+def _sampled_frequencies(packed_outcomes, n_outcomes):
+    return np.bincount(packed_outcomes, minlength=n_outcomes) / len(packed_outcomes)
+
+
+class TestSamplingFromWavefunction:
+    @pytest.fixture
+    def wavefunction(self):
+        return create_random_wavefunction(4, seed=RNDSEED)
+
+    def test_sampled_packed_outcomes_follow_probabilities(self, wavefunction):
+        packed_outcomes = sample_packed_outcomes_from_wavefunction(
+            wavefunction, 20000, seed=RNDSEED
+        )
+
+        np.testing.assert_allclose(
+            _sampled_frequencies(packed_outcomes, 16),
+            wavefunction.get_probabilities(),
+            atol=0.01,
+        )
+
+    def test_sampled_counts_follow_probabilities(self, wavefunction):
+        counts = sample_counts_from_wavefunction(wavefunction, 20000, seed=RNDSEED)
+
+        assert counts.sum() == 20000
+        np.testing.assert_allclose(
+            counts / 20000, wavefunction.get_probabilities(), atol=0.01
+        )
+
+    def test_reusable_sampler_follows_probabilities(self, wavefunction):
+        sampler = WavefunctionSampler(wavefunction, seed=RNDSEED)
+
+        for _ in range(2):
+            np.testing.assert_allclose(
+                _sampled_frequencies(sampler.sample_packed_outcomes(20000), 16),
+                wavefunction.get_probabilities(),
+                atol=0.01,
+            )
+
+    def test_reusable_sampler_never_samples_outcomes_with_zero_probability(self):
+        wavefunction = Wavefunction(np.array([0, 1, 0, 1, 0, 0, 1j, 0]) / np.sqrt(3))
+        sampler = WavefunctionSampler(wavefunction, seed=RNDSEED)
+
+        assert set(sampler.sample(1000)) == {(0, 0, 1), (0, 1, 1), (1, 1, 0)}
+
+
 def test_parities_io():
     measurements = [(1, 0), (1, 0), (0, 1), (0, 0)]
     op = IsingOperator("[Z0] + [Z1] + [Z0 Z1]")
@@ -183,6 +261,28 @@ def test_parities_io():
     remove_file_if_exists("parities.json")
 
 
+def test_parities_agree_with_parities_of_individual_bitstrings():
+    measurements = [(1, 0, 1), (1, 1, 0), (0, 1, 1), (1, 0, 1), (0, 0, 0)]
+    op = IsingOperator("[Z0] + [Z1 Z2] + [] + [Z0 Z1 Z2]")
+    terms = list(op.terms)
+
+    parities = get_parities_from_measurements(measurements, op)
+
+    for i, term in enumerate(terms):
+        marked_qubits = [qubit for qubit, _ in term]
+        even = sum(check_parity(bits, marked_qubits) for bits in measurements)
+        np.testing.assert_array_equal(parities.values[i], [even, 5 - even])
+        for j, other_term in enumerate(terms):
+            other_qubits = [qubit for qubit, _ in other_term]
+            equal = sum(
+                check_parity(bits, marked_qubits) == check_parity(bits, other_qubits)
+                for bits in measurements
+            )
+            np.testing.assert_array_equal(
+                parities.correlations[0][i, j], [equal, 5 - equal]
+            )
+
+
 def test_get_expectation_values_from_parities():
     parities = Parities(values=np.array([[18, 50], [120, 113], [75, 26]]))
     expectation_values = get_expectation_values_from_parities(parities)
@@ -275,6 +375,68 @@ def test_get_expectation_value_from_frequencies():
     )
 
 
+ACCUMULATED_OPERATOR = IsingOperator("0.5 [Z0] + [Z1 Z2] - 2.0 [Z0 Z1 Z2] + []")
+
+
+def _assert_expectation_values_equal(actual, expected):
+    np.testing.assert_allclose(actual.values, expected.values, atol=1e-12)
+    np.testing.assert_allclose(
+        actual.correlations[0], expected.correlations[0], atol=1e-12
+    )
+    np.testing.assert_allclose(
+        actual.estimator_covariances[0], expected.estimator_covariances[0], atol=1e-12
+    )
+
+
+class TestExpectationValuesAccumulator:
+    @pytest.fixture
+    def bits(self):
+        return np.random.default_rng(RNDSEED).integers(0, 2, (1000, 3))
+
+    @pytest.mark.parametrize("use_bessel_correction", [False, True])
+    def test_values_accumulated_in_batches_agree_with_values_from_all_measurements(
+        self, bits, use_bessel_correction
+    ):
+        accumulator = ExpectationValuesAccumulator(ACCUMULATED_OPERATOR)
+
+        accumulator.add_bits(bits[:300])
+        accumulator.add_counts(Measurements.from_bits(bits[300:350]).get_counts())
+        accumulator.add_measurements(Measurements.from_bits(bits[350:]))
+
+        assert accumulator.number_of_samples == 1000
+        _assert_expectation_values_equal(
+            accumulator.get_expectation_values(use_bessel_correction),
+            Measurements.from_bits(bits).get_expectation_values(
+                ACCUMULATED_OPERATOR, use_bessel_correction
+            ),
+        )
+
+    def test_merged_accumulators_agree_with_single_accumulator(self, bits):
+        accumulators = [
+            ExpectationValuesAccumulator(ACCUMULATED_OPERATOR) for _ in range(3)
+        ]
+        accumulators[0].add_bits(bits[:100])
+        accumulators[2].add_bits(bits[100:])
+
+        accumulators[0].merge(accumulators[1])
+        accumulators[0].merge(accumulators[2])
+
+        _assert_expectation_values_equal(
+            accumulators[0].get_expectation_values(),
+            Measurements.from_bits(bits).get_expectation_values(ACCUMULATED_OPERATOR),
+        )
+
+    def test_accumulators_of_different_operators_cannot_be_merged(self):
+        accumulator = ExpectationValuesAccumulator(ACCUMULATED_OPERATOR)
+
+        with pytest.raises(ValueError):
+            accumulator.merge(ExpectationValuesAccumulator(IsingOperator("[Z0]")))
+
+    def test_values_cannot_be_estimated_without_measurements(self):
+        with pytest.raises(ValueError):
+            ExpectationValuesAccumulator(ACCUMULATED_OPERATOR).get_expectation_values()
+
+
 def test_concatenate_expectation_values():
     expectation_values_set = [
         ExpectationValues(np.array([1.0, 2.0])),
@@ -389,6 +551,81 @@ class TestMeasurements:
         assert target_measurements.bitstrings == recreated_measurements.bitstrings
         remove_file_if_exists("measurementstest.json")
 
+    @pytest.mark.parametrize(
+        "measurements",
+        [
+            Measurements([(0, 1, 1), (1, 0, 0), (0, 1, 1)]),
+            Measurements.from_counts({"011": 2, "100": 1}),
+            Measurements(),
+        ],
+    )
+    def test_can_be_saved_in_binary_format(self, measurements, tmp_path):
+        path = tmp_path / "measurements.npz"
+
+        measurements.save(path, file_format="npz")
+        loaded_measurements = Measurements.load_from_file(path)
+
+        assert loaded_measurements.bitstrings == measurements.bitstrings
+
+    @pytest.mark.parametrize("file_format", ["json", "npz"])
+    @pytest.mark.parametrize("measurements", [Measurements(), Measurements([])])
+    def test_empty_measurements_can_be_saved_and_loaded(
+        self, measurements, file_format, tmp_path
+    ):
+        path = tmp_path / f"measurements.{file_format}"
+
+        measurements.save(path, file_format=file_format)
+        loaded_measurements = Measurements.load_from_file(str(path))
+
+        assert loaded_measurements.bitstrings == []
+        assert loaded_measurements.get_counts() == {}
+
+    def test_bitstrings_of_different_lengths_are_rejected(self):
+        with pytest.raises(ValueError):
+            Measurements([(0, 1), (1, 0, 1)]).get_counts()
+
+    @pytest.mark.parametrize(
+        "measurements", [Measurements([(0, 1)]), Measurements.from_counts({"01": 1})]
+    )
+    def test_adding_counts_of_different_length_is_rejected(self, measurements):
+        measurements.bitstrings
+
+        with pytest.raises(ValueError):
+            measurements.add_counts({"011": 1})
+
+    def test_outcomes_other_than_bits_are_not_merged(self):
+        measurements = Measurements([(0, 2), (1, 0), (0, 2)])
+
+        assert measurements.get_counts() == {"02": 2, "10": 1}
+        assert measurements.bitstrings == [(0, 2), (1, 0), (0, 2)]
+
+    def test_cannot_be_saved_in_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            Measurements([(0, 1)]).save(tmp_path / "measurements.csv", "csv")
+
+    def test_can_be_split_into_chunks(self):
+        measurements = Measurements.from_bits(np.eye(5, dtype=np.uint8))
+
+        chunks = list(measurements.split(2))
+
+        assert [chunk.number_of_samples for chunk in chunks] == [2, 2, 1]
+        assert concatenate_measurements(chunks).bitstrings == measurements.bitstrings
+
+    @pytest.mark.parametrize("file_format", ["json", "npz"])
+    def test_set_of_measurements_can_be_saved_and_loaded(self, file_format, tmp_path):
+        path = tmp_path / f"measurements-set.{file_format}"
+        measurements_set = [
+            Measurements([(0, 1), (1, 1)]),
+            Measurements.from_counts({"101": 3}),
+        ]
+
+        save_measurements_set(measurements_set, str(path), file_format)
+        loaded_measurements_set = load_measurements_set(str(path))
+
+        assert [
+            measurements.bitstrings for measurements in loaded_measurements_set
+        ] == [measurements.bitstrings for measurements in measurements_set]
+
     def test_intialize_with_bitstrings(self):
         # Given
         bitstrings = [
@@ -577,6 +814,89 @@ class TestMeasurements:
             (1, 1, 1),
         ]
 
+    def test_bits_agree_with_bitstrings(self, counts):
+        measurements = Measurements.from_counts(counts)
+
+        np.testing.assert_array_equal(
+            measurements.bits, np.array(measurements.bitstrings)
+        )
+        assert measurements.number_of_samples == 9
+
+    def test_can_be_created_from_packed_outcomes(self):
+        measurements = Measurements.from_packed_outcomes(np.array([0, 5, 6, 5]), 3)
+
+        assert measurements.bitstrings == [(0, 0, 0), (1, 0, 1), (1, 1, 0), (1, 0, 1)]
+        assert measurements.get_counts() == {"000": 1, "101": 2, "110": 1}
+
+    def test_unique_outcomes_are_sorted_and_counted(self):
+        measurements = Measurements([(1, 1), (0, 1), (1, 1), (0, 1), (1, 1)])
+
+        outcomes, counts = measurements.get_unique_outcomes_and_counts()
+
+        np.testing.assert_array_equal(outcomes, [[0, 1], [1, 1]])
+        np.testing.assert_array_equal(counts, [2, 3])
+
+    def test_unique_outcomes_can_be_found_for_more_than_63_qubits(self):
+        bits = np.zeros((3, 70), dtype=np.uint8)
+        bits[1, 0] = bits[2, 0] = 1
+        measurements = Measurements.from_bits(bits)
+
+        outcomes, counts = measurements.get_unique_outcomes_and_counts()
+
+        np.testing.assert_array_equal(outcomes, bits[:2])
+        np.testing.assert_array_equal(counts, [1, 2])
+
+    def test_modifying_bitstrings_in_place_is_reflected_in_counts(self, counts):
+        measurements = Measurements.from_counts(counts)
+
+        measurements.bitstrings.append((1, 1, 1))
+
+        assert measurements.get_counts()["111"] == 2
+        assert measurements.number_of_samples == 10
+
+    def test_counts_are_ordered_by_first_occurrence(self):
+        measurements = Measurements([(1, 1), (0, 1), (1, 1), (0, 0)])
+
+        assert list(measurements.get_counts()) == ["11", "01", "00"]
+
+    def test_bits_converted_from_bitstrings_are_reused_until_list_is_modified(
+        self, counts
+    ):
+        measurements = Measurements.from_counts(counts)
+        bitstrings = measurements.bitstrings
+
+        assert measurements.bits is measurements.bits
+
+        bits = measurements.bits
+        bitstrings[0] = (1, 1, 1)
+
+        assert measurements.bits is not bits
+        assert measurements.get_counts()["111"] == 2
+
+    def test_adding_counts_to_sampled_measurements_keeps_their_order(self):
+        measurements = Measurements.from_bits(np.array([[1, 0], [0, 0]]))
+
+        measurements.add_counts({"01": 2, "10": 1})
+
+        assert measurements.bitstrings == [(1, 0), (0, 0), (0, 1), (0, 1), (1, 0)]
+
+    def test_adding_counts_with_different_number_of_qubits_raises_error(self):
+        measurements = Measurements.from_counts({"01": 2})
+
+        with pytest.raises(ValueError):
+            measurements.add_counts({"011": 1})
+
+    def test_measurements_are_concatenated_in_order(self):
+        concatenated = concatenate_measurements(
+            [
+                Measurements([(0, 1)]),
+                Measurements(),
+                Measurements.from_counts({"11": 2}),
+            ]
+        )
+
+        assert concatenated.bitstrings == [(0, 1), (1, 1), (1, 1)]
+
     def test_get_expectation_values_from_measurements(self):
         # Given
         measurements = Measurements(
@@ -618,6 +938,29 @@ class TestMeasurements:
             expectation_values.estimator_covariances[0], target_covariances
         )
 
+    def test_expectation_values_agree_with_values_computed_from_frequencies(self):
+        measurements = Measurements.from_bits(
+            np.random.default_rng(RNDSEED).integers(0, 2, (200, 4))
+        )
+        op = IsingOperator("0.5 [Z0] + [Z1 Z3] - 2.0 [Z0 Z1 Z2] + 0.25 []")
+        terms = list(op.terms.items())
+        counts = measurements.get_counts()
+
+        expectation_values = measurements.get_expectation_values(op)
+
+        for i, (term, coefficient) in enumerate(terms):
+            qubits = {qubit for qubit, _ in term}
+            assert expectation_values.values[i] == pytest.approx(
+                coefficient * get_expectation_value_from_frequencies(qubits, counts)
+            )
+            for j, (other_term, other_coefficient) in enumerate(terms):
+                marked_qubits = qubits ^ {qubit for qubit, _ in other_term}
+                assert expectation_values.correlations[0][i, j] == pytest.approx(
+                    coefficient
+                    * other_coefficient
+                    * get_expectation_value_from_frequencies(marked_qubits, counts)
+                )
+
     def test_get_expectation_values_from_measurements_with_bessel_correction(self):
         # Given
         measurements = Measurements(
@@ -791,6 +1134,42 @@ class TestMeasurements:
                 == counts[convert_tuples_to_bitstrings([bitstring])[0]]
             )
 
+    def test_measurements_representing_distribution_use_largest_remainders(self):
+        distribution = MeasurementOutcomeDistribution(
+            {"00": 0.25, "01": 0.33, "10": 0.22, "11": 0.2}
+        )
+
+        measurements = Measurements.get_measurements_representing_distribution(
+            distribution, 10
+        )
+
+        # Expected counts are 2.5, 3.3, 2.2 and 2.0, hence the only missing sample
+        # goes to "00".
+        assert measurements.get_counts() == {"00": 3, "01": 3, "10": 2, "11": 2}
+
+    def test_measurements_representing_distribution_are_stored_as_counts(self):
+        distribution = MeasurementOutcomeDistribution({(0, 1): 0.4, (1, 1): 0.6})
+
+        measurements = Measurements.get_measurements_representing_distribution(
+            distribution, 10**9
+        )
+
+        assert measurements.number_of_samples == 10**9
+        outcomes, counts = measurements.get_unique_outcomes_and_counts()
+        np.testing.assert_array_equal(outcomes, [[0, 1], [1, 1]])
+        np.testing.assert_array_equal(counts, [4 * 10**8, 6 * 10**8])
+
+    def test_get_measurements_representing_distribution_keeps_outcomes_other_than_bits(
+        self,
+    ):
+        distribution = MeasurementOutcomeDistribution({(0, 2): 0.5, (1, 0): 0.5})
+
+        measurements = Measurements.get_measurements_representing_distribution(
+            distribution, 10
+        )
+
+        assert measurements.get_counts() == {"02": 5, "10": 5}
+
     @pytest.mark.parametrize(
         "bitstring_distribution",
         [
@@ -822,48 +1201,3 @@ class TestMeasurements:
             _ = Measurements.get_measurements_representing_distribution(
                 bitstring_distribution, number_of_samples
             )
-
-    @pytest.mark.parametrize(
-        "samples, bitstring_samples, leftover_distribution",
-        [
-            (
-                Counter({"0011": 3, "1100": 1, "0101": 2}),
-                [
-                    (0, 0, 1, 1),
-                    (1, 1, 0, 0),
-                    (0, 1, 0, 1),
-                    (0, 1, 0, 1),
-                    (0, 1, 0, 1),
-                    (1, 1, 0, 0),
-                    (0, 0, 1, 1),
-                ],
-                MeasurementOutcomeDistribution({"0011": 0.3, "1100": 0.3, "0101": 0.3}),
-            ),
-            (
-                Counter({"0011": 3, "1100": 1, "0101": 2, "0001": 1}),
-                [
-                    (0, 0, 1, 1),
-                    (1, 1, 0, 0),
-                    (0, 1, 0, 1),
-                    (0, 1, 0, 1),
-                    (0, 1, 0, 1),
-                    (1, 1, 0, 0),
-                    (0, 0, 1, 1),
-                ],
-                MeasurementOutcomeDistribution(
-                    {"0011": 0.3, "1100": 0.001, "0101": 0.001, "0001": 0.698}
-                ),
-            ),
-        ],
-    )
-    def test_check_sample_elimination(
-        self, samples, bitstring_samples, leftover_distribution
-    ):
-        correct_samples = _check_sample_elimination(
-            samples, bitstring_samples, leftover_distribution
-        )
-
-        bitstring_counts = Counter(bitstring_samples)
-        for sample in correct_samples:
-            bitstring = tuple([int(measurement_value) for measurement_value in sample])
-            assert correct_samples[sample] <= bitstring_counts[bitstring]
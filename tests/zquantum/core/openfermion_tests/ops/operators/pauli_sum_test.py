@@ -0,0 +1,162 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import numpy as np
+import pytest
+from zquantum.core.hamiltonian import is_comeasureable
+from zquantum.core.openfermion.ops.operators import (
+    IsingOperator,
+    PauliSum,
+    QubitOperator,
+)
+
+OPERATOR_1 = (
+    QubitOperator("X0 Y1 Z2", 0.5)
+    + QubitOperator("Y0 Y1", -1.5j)
+    + QubitOperator("Z1 X3", 2.0)
+    + QubitOperator("Z0")
+    + QubitOperator("X70 Y2", 0.25)
+    + 0.75
+)
+OPERATOR_2 = (
+    QubitOperator("Z0 Y1", 1.0)
+    + QubitOperator("X0 X2 Z70", -0.5)
+    + QubitOperator("Y3", 3.0j)
+    + QubitOperator("Z0")
+)
+
+
+def _terms(operator):
+    return list(operator.terms)
+
+
+class TestConversions:
+    @pytest.mark.parametrize(
+        "operator", [OPERATOR_1, OPERATOR_2, QubitOperator(), QubitOperator("")]
+    )
+    def test_qubit_operator_is_preserved_by_round_trip(self, operator):
+        assert PauliSum.from_operator(operator).to_qubit_operator() == operator
+
+    def test_ising_operator_is_preserved_by_round_trip(self):
+        operator = IsingOperator("Z0 Z1", 2.0) + IsingOperator("Z3") + 0.5
+
+        assert PauliSum.from_operator(operator).to_ising_operator() == operator
+
+    def test_operators_with_x_or_y_cannot_be_converted_to_ising_operator(self):
+        with pytest.raises(ValueError):
+            PauliSum.from_operator(QubitOperator("Z0 X1")).to_ising_operator()
+
+    def test_number_of_qubits_defaults_to_highest_index_plus_one(self):
+        assert PauliSum.from_operator(OPERATOR_1).n_qubits == 71
+
+    def test_number_of_qubits_cannot_be_smaller_than_highest_index_plus_one(self):
+        with pytest.raises(ValueError):
+            PauliSum.from_operator(QubitOperator("Z3"), n_qubits=3)
+
+    def test_qubits_are_packed_into_words_of_64_bits(self):
+        pauli_sum = PauliSum.from_operator(QubitOperator("X0 Z1 Y65"))
+
+        np.testing.assert_array_equal(pauli_sum.x, [[0b01, 0b10]])
+        np.testing.assert_array_equal(pauli_sum.z, [[0b10, 0b10]])
+
+
+class TestArithmetic:
+    @pytest.mark.parametrize(
+        "operator_1, operator_2",
+        [
+            (OPERATOR_1, OPERATOR_2),
+            (OPERATOR_2, OPERATOR_1),
+            (OPERATOR_1, OPERATOR_1),
+            (QubitOperator("X0"), QubitOperator("Z0")),
+            (QubitOperator("Y1 Y2"), QubitOperator("X1 Z2")),
+        ],
+    )
+    def test_product_agrees_with_product_of_qubit_operators(
+        self, operator_1, operator_2
+    ):
+        product = PauliSum.from_operator(operator_1) * PauliSum.from_operator(
+            operator_2
+        )
+
+        assert product.to_qubit_operator().isclose(operator_1 * operator_2)
+
+    def test_sum_and_difference_agree_with_ones_of_qubit_operators(self):
+        pauli_sum_1 = PauliSum.from_operator(OPERATOR_1)
+        pauli_sum_2 = PauliSum.from_operator(OPERATOR_2)
+
+        assert (
+            (pauli_sum_1 + pauli_sum_2)
+            .to_qubit_operator()
+            .isclose(OPERATOR_1 + OPERATOR_2)
+        )
+        assert (
+            (pauli_sum_1 - pauli_sum_2)
+            .to_qubit_operator()
+            .isclose(OPERATOR_1 - OPERATOR_2)
+        )
+
+    def test_scalars_are_added_to_identity_term(self):
+        pauli_sum = 2 + PauliSum.from_operator(OPERATOR_1) * 3.0 - 1j
+
+        assert pauli_sum.to_qubit_operator().isclose(2 + OPERATOR_1 * 3.0 - 1j)
+
+    def test_equal_terms_are_combined_and_removed_if_they_cancel_out(self):
+        pauli_sum = PauliSum.from_operator(OPERATOR_1)
+
+        assert len(pauli_sum + pauli_sum) == len(pauli_sum)
+        assert len(pauli_sum - pauli_sum) == 0
+
+    def test_compress_removes_small_terms_and_small_parts_of_coefficients(self):
+        operator = (
+            QubitOperator("X0", 1e-10)
+            + QubitOperator("Z1", 1.0 + 1e-10j)
+            + QubitOperator("Y2", 1e-10 + 2j)
+        )
+
+        compressed = PauliSum.from_operator(operator).compress(1e-8)
+
+        assert compressed.to_qubit_operator() == QubitOperator(
+            "Z1", 1.0
+        ) + QubitOperator("Y2", 2j)
+
+    @pytest.mark.parametrize("order", [1, 2, 3])
+    def test_induced_norm_agrees_with_one_of_qubit_operator(self, order):
+        assert np.isclose(
+            PauliSum.from_operator(OPERATOR_1).induced_norm(order),
+            OPERATOR_1.induced_norm(order),
+        )
+
+
+class TestCommutation:
+    def test_qubitwise_commutation_agrees_with_comeasureability(self):
+        commute = PauliSum.from_operator(OPERATOR_1).qubitwise_commute(
+            PauliSum.from_operator(OPERATOR_2)
+        )
+
+        np.testing.assert_array_equal(
+            commute,
+            [
+                [is_comeasureable(term_1, term_2) for term_2 in _terms(OPERATOR_2)]
+                for term_1 in _terms(OPERATOR_1)
+            ],
+        )
+
+    def test_commutation_agrees_with_commutators_of_qubit_operators(self):
+        def _commute(term_1, term_2):
+            commutator = QubitOperator(term_1) * QubitOperator(term_2) - QubitOperator(
+                term_2
+            ) * QubitOperator(term_1)
+            commutator.compress()
+            return commutator == QubitOperator()
+
+        commute = PauliSum.from_operator(OPERATOR_1).commute(
+            PauliSum.from_operator(OPERATOR_2)
+        )
+
+        np.testing.assert_array_equal(
+            commute,
+            [
+                [_commute(term_1, term_2) for term_2 in _terms(OPERATOR_2)]
+                for term_1 in _terms(OPERATOR_1)
+            ],
+        )
@@ -382,3 +382,83 @@ def test_hf_rdm_energy(hamiltonian, ref_energy, nalpha):
 
     rdm = hf_rdm(nalpha, 1, 2)
     assert np.isclose(ref_energy, rdm.expectation(hamiltonian))
+
+
+def _random_wavefunction(n_qubits, seed):
+    rng = np.random.default_rng(seed)
+    amplitudes = rng.normal(size=2**n_qubits) + 1j * rng.normal(size=2**n_qubits)
+    return Wavefunction(amplitudes / np.linalg.norm(amplitudes))
+
+
+class TestExpectationValuesOfTerms:
+    def test_pauli_masks_use_wavefunction_ordering_of_qubits(self):
+        from zquantum.core.openfermion.zapata_utils._utils import get_pauli_masks
+
+        operator = QubitOperator("X0 Y2", 2.0) + QubitOperator("Z1", -1.0)
+
+        x_masks, z_masks, coefficients = get_pauli_masks(operator, 3)
+
+        np.testing.assert_array_equal(x_masks, [0b101, 0b000])
+        np.testing.assert_array_equal(z_masks, [0b001, 0b010])
+        np.testing.assert_array_equal(coefficients, [2.0j, -1.0])
+
+    def test_pauli_masks_cannot_be_computed_for_too_few_qubits(self):
+        from zquantum.core.openfermion.zapata_utils._utils import get_pauli_masks
+
+        with pytest.raises(ValueError):
+            get_pauli_masks(QubitOperator("Z3"), 3)
+
+    @pytest.mark.parametrize(
+        "operator",
+        [
+            QubitOperator("X0 Y1 Z3", 0.5) + QubitOperator("Y2 Y3", -1.5) + 0.25,
+            # Many terms sharing x_mask are evaluated by Walsh-Hadamard transform.
+            QubitOperator("X0 X1")
+            * sum(
+                (
+                    QubitOperator(f"Z{i} Z{j}", i - j)
+                    for i in range(4)
+                    for j in range(i)
+                ),
+                QubitOperator("Z0"),
+            ),
+            IsingOperator("Z0 Z1", 2.0) + IsingOperator("Z2") + IsingOperator("Z3"),
+        ],
+    )
+    def test_agree_with_expectation_values_computed_from_sparse_matrices(
+        self, operator
+    ):
+        from zquantum.core.openfermion.zapata_utils._utils import (
+            get_expectation_value,
+            get_expectation_values_of_terms,
+        )
+
+        wavefunction = _random_wavefunction(4, 1234)
+
+        np.testing.assert_allclose(
+            get_expectation_values_of_terms(operator, wavefunction),
+            [
+                get_expectation_value(QubitOperator(term, coefficient), wavefunction)
+                for term, coefficient in operator.terms.items()
+            ],
+            atol=1e-12,
+        )
+
+
+def test_applying_operator_agrees_with_multiplication_by_sparse_matrix():
+    from zquantum.core.openfermion.zapata_utils._utils import apply_qubit_operator
+
+    operator = (
+        QubitOperator("X0 Y1 Z3", 0.5)
+        + QubitOperator("Y2 Y3", -1.5j)
+        + QubitOperator("X0 Z1")
+        + QubitOperator("X0 Z2", 2.0)
+        + 0.25
+    )
+    amplitudes = _random_wavefunction(4, 1234).amplitudes
+
+    np.testing.assert_allclose(
+        apply_qubit_operator(operator, amplitudes),
+        get_sparse_operator(operator, 4) @ amplitudes,
+        atol=1e-12,
+    )
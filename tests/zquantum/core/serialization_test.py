@@ -18,7 +18,10 @@ from zquantum.core.serialization import (
     OrquestraDecoder,
     OrquestraEncoder,
     ensure_open,
+    is_binary_file,
+    load_arrays_with_header,
     load_optimization_results,
+    save_arrays_with_header,
     save_optimization_results,
 )
 from zquantum.core.utils import ValueEstimate, convert_array_to_dict
@@ -357,3 +360,38 @@ def test_ensure_open_with_write_flag_and_read_only_file_raises_error(tmp_path: s
         with pytest.raises(ValueError):
             with ensure_open(open_file, "w"):
                 pass
+
+
+class TestArraysWithHeader:
+    def test_can_be_saved_and_loaded(self, tmp_path):
+        arrays = {
+            "bits": np.array([[0, 1], [1, 1]], dtype=np.uint8),
+            "amplitudes": np.array([0.5j, 0.5, -0.5, 0.5]),
+            "empty": np.zeros((0, 3)),
+        }
+
+        save_arrays_with_header(arrays, {"schema": "test"}, tmp_path)
+        header, loaded_arrays = load_arrays_with_header(tmp_path)
+
+        assert is_binary_file(tmp_path)
+        assert header == {"schema": "test"}
+        assert loaded_arrays.keys() == arrays.keys()
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded_arrays[name], array)
+            assert loaded_arrays[name].dtype == array.dtype
+
+    def test_are_memory_mapped_and_read_only(self, tmp_path):
+        save_arrays_with_header({"array": np.arange(10)}, {}, tmp_path)
+
+        _, arrays = load_arrays_with_header(tmp_path)
+
+        assert isinstance(arrays["array"], np.memmap)
+        with pytest.raises(ValueError):
+            arrays["array"][0] = 1
+
+    def test_json_files_are_not_binary(self, tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump({"schema": "test"}, f)
+
+        assert not is_binary_file(tmp_path)
+        assert not is_binary_file(io.StringIO("{}"))
@@ -1,13 +1,18 @@
 ################################################################################
 # © Copyright 2021 Zapata Computing Inc.
 ################################################################################
+import numpy as np
 import pytest
 import sympy
 from zquantum.core import circuits
+from zquantum.core.estimation import calculate_exact_expectation_values
 from zquantum.core.interfaces.backend_test import (
     QuantumSimulatorGatesTest,
     QuantumSimulatorTests,
 )
+from zquantum.core.interfaces.estimation import EstimationTask
+from zquantum.core.measurement import ExpectationValues, Measurements
+from zquantum.core.openfermion import QubitOperator
 from zquantum.core.symbolic_simulator import SymbolicSimulator
 
 
@@ -69,3 +74,256 @@ class TestSymbolicSimulator(QuantumSimulatorTests):
 
 class TestSymbolicSimulatorGates(QuantumSimulatorGatesTest):
     pass
+
+
+class TestSymbolicSimulatorWithGateFusion:
+    def test_gives_the_same_wavefunction_as_simulator_without_fusion(self):
+        circuit = circuits.Circuit(
+            [
+                circuits.H(0),
+                circuits.RX(0.3)(1),
+                circuits.CNOT(0, 1),
+                circuits.RZ(0.5)(1),
+                circuits.CNOT(1, 2),
+                circuits.RY(-0.2)(2),
+                circuits.SWAP(0, 2),
+            ]
+        )
+        simulator = SymbolicSimulator(gate_fusion_max_num_qubits=2)
+
+        np.testing.assert_allclose(
+            simulator.get_wavefunction(circuit).amplitudes,
+            SymbolicSimulator().get_wavefunction(circuit).amplitudes,
+        )
+        assert simulator.last_gate_fusion_report == circuits.GateFusionReport(
+            original_number_of_operations=7,
+            fused_number_of_operations=3,
+            number_of_fused_gates=2,
+        )
+
+
+class _NoisySimulator(SymbolicSimulator):
+    """Simulator whose measurements are not sampled from exact wavefunctions."""
+
+    samples_from_exact_wavefunction = False
+
+    def run_circuit_and_measure(self, circuit, n_samples):
+        return Measurements([(0,) * circuit.n_qubits] * n_samples)
+
+
+class TestSymbolicSimulatorInParallelMode:
+    @pytest.fixture
+    def circuitset(self):
+        return [
+            circuits.Circuit([circuits.H(0), circuits.RX(0.1 * i)(1)]) for i in range(6)
+        ]
+
+    def test_results_do_not_depend_on_number_of_workers(self, circuitset):
+        n_samples = [100 + i for i in range(len(circuitset))]
+
+        results = [
+            [
+                measurements.bitstrings
+                for measurements in SymbolicSimulator(
+                    seed=1234, n_workers=n_workers
+                ).run_circuitset_and_measure(circuitset, n_samples)
+            ]
+            for n_workers in [1, 2, 4]
+        ]
+
+        assert results[0] == results[1] == results[2]
+        assert [len(bitstrings) for bitstrings in results[0]] == n_samples
+
+    def test_circuits_in_circuitset_use_different_random_streams(self):
+        circuitset = [circuits.Circuit([circuits.H(0)])] * 2
+
+        measurements_set = SymbolicSimulator(
+            seed=1234, n_workers=2
+        ).run_circuitset_and_measure(circuitset, [100, 100])
+
+        assert measurements_set[0].bitstrings != measurements_set[1].bitstrings
+
+    def test_updates_counters_of_circuits_and_jobs(self, circuitset):
+        simulator = SymbolicSimulator(n_workers=2)
+
+        simulator.run_circuitset_and_measure(circuitset, [10] * len(circuitset))
+
+        assert simulator.number_of_circuits_run == len(circuitset)
+        assert simulator.number_of_jobs_run == len(circuitset)
+
+    @pytest.mark.parametrize("n_workers", [1, 2])
+    def test_noisy_simulators_have_to_override_seeded_runs(self, circuitset, n_workers):
+        simulator = _NoisySimulator(n_workers=n_workers)
+
+        with pytest.raises(NotImplementedError):
+            simulator.run_circuitset_and_measure(circuitset, [10] * len(circuitset))
+
+    def test_requires_positive_number_of_workers(self, circuitset):
+        with pytest.raises(ValueError):
+            SymbolicSimulator(n_workers=0).run_circuitset_and_measure(
+                circuitset, [10] * len(circuitset)
+            )
+
+
+class _OperationsCountingSimulator(SymbolicSimulator):
+    def __init__(self):
+        super().__init__(seed=1234)
+        self.number_of_operations_simulated = 0
+
+    def _get_wavefunction_from_native_circuit(self, circuit, initial_state):
+        self.number_of_operations_simulated += len(circuit.operations)
+        return super()._get_wavefunction_from_native_circuit(circuit, initial_state)
+
+
+class _NativeExpectationValuesSimulator(SymbolicSimulator):
+    def get_exact_expectation_values(self, circuit, operator):
+        return ExpectationValues(np.full(len(operator.terms), 42.0))
+
+
+class _ConcurrentlyUsedSimulator(SymbolicSimulator):
+    """Simulates another caller running circuits during each native simulation."""
+
+    def __init__(self):
+        super().__init__()
+        self.number_of_concurrent_circuits = 0
+
+    def _get_wavefunction_from_native_circuit(self, circuit, initial_state):
+        self.number_of_circuits_run += 1
+        self.number_of_concurrent_circuits += 1
+        return super()._get_wavefunction_from_native_circuit(circuit, initial_state)
+
+
+class TestSymbolicSimulatorWithSharedPrefixes:
+    @pytest.fixture
+    def circuitset(self):
+        ansatz = circuits.Circuit(
+            [circuits.H(0), circuits.CNOT(0, 1), circuits.RY(0.3)(2), circuits.X(1)]
+        )
+        return [
+            ansatz + circuits.Circuit([circuits.H(0)]),
+            ansatz + circuits.Circuit([circuits.RX(np.pi / 2)(1)]),
+            ansatz,
+            ansatz + circuits.Circuit([circuits.H(0)]),
+            circuits.Circuit([circuits.H(0), circuits.RZ(0.5)(1)]),
+            circuits.Circuit([circuits.H(0), circuits.X(1)]),
+        ]
+
+    def test_gives_the_same_wavefunctions_as_simulating_circuits_separately(
+        self, circuitset
+    ):
+        simulator = SymbolicSimulator()
+
+        for actual, circuit in zip(simulator.get_wavefunctions(circuitset), circuitset):
+            np.testing.assert_allclose(
+                actual.amplitudes, simulator.get_wavefunction(circuit).amplitudes
+            )
+
+    def test_simulates_shared_prefixes_only_once(self, circuitset):
+        simulator = _OperationsCountingSimulator()
+
+        simulator.get_wavefunctions(circuitset)
+
+        # Ansatz with 2 distinct suffixes, then H(0) shared by 2-qubit circuits with
+        # their distinct suffixes. Prefixes of circuits of different sizes are not
+        # shared.
+        assert simulator.number_of_operations_simulated == 4 + 2 + 1 + 2
+
+    def test_shares_prefixes_of_separately_bound_circuits_without_comparing_gates(
+        self, monkeypatch
+    ):
+        alpha, beta = sympy.symbols("alpha beta")
+        ansatz = circuits.Circuit(
+            [
+                circuits.H(0),
+                circuits.RY(alpha)(1),
+                circuits.RX(beta).controlled(1)(0, 1),
+                circuits.RZ(alpha).dagger(1),
+            ]
+        )
+        circuitset = [
+            ansatz.bind({alpha: 0.1, beta: 0.2}) + circuits.Circuit([circuits.H(1)]),
+            ansatz.bind({alpha: 0.1, beta: 0.2}) + circuits.Circuit([circuits.X(0)]),
+            ansatz.bind({alpha: 0.1, beta: 0.3}),
+        ]
+        expected = [
+            SymbolicSimulator().get_wavefunction(circuit).amplitudes
+            for circuit in circuitset
+        ]
+        simulator = _OperationsCountingSimulator()
+
+        def _fail_comparison(self, other):
+            raise AssertionError("Gates should not be compared.")
+
+        monkeypatch.setattr(circuits.MatrixFactoryGate, "__eq__", _fail_comparison)
+        wavefunctions = simulator.get_wavefunctions(circuitset)
+
+        for actual, amplitudes in zip(wavefunctions, expected):
+            np.testing.assert_allclose(actual.amplitudes, amplitudes)
+        # First two gates shared by all circuits, then the rest of the bound ansatz
+        # shared by the first two circuits.
+        assert simulator.number_of_operations_simulated == 2 + (2 + 1 + 1) + 2
+
+    def test_gives_the_same_measurements_as_running_circuits_separately(
+        self, circuitset
+    ):
+        simulator = SymbolicSimulator(seed=1234)
+        n_samples = [100 + i for i in range(len(circuitset))]
+
+        measurements_set = simulator.run_circuitset_and_measure(circuitset, n_samples)
+
+        assert [measurements.bitstrings for measurements in measurements_set] == [
+            simulator.run_circuit_and_measure(circuit, n).bitstrings
+            for circuit, n in zip(circuitset, n_samples)
+        ]
+
+    def test_counts_each_circuit_as_a_single_circuit_and_job(self, circuitset):
+        simulator = SymbolicSimulator()
+
+        simulator.run_circuitset_and_measure(circuitset, [10] * len(circuitset))
+
+        assert simulator.number_of_circuits_run == len(circuitset)
+        assert simulator.number_of_jobs_run == len(circuitset)
+
+    def test_exact_expectation_values_agree_with_ones_computed_separately(
+        self, circuitset
+    ):
+        simulator = SymbolicSimulator()
+        operators = [QubitOperator("Z0 X1") + QubitOperator("Y0", 0.5)] * len(
+            circuitset
+        )
+
+        for actual, circuit, operator in zip(
+            simulator.get_exact_expectation_values_for_circuitset(
+                circuitset, operators
+            ),
+            circuitset,
+            operators,
+        ):
+            np.testing.assert_allclose(
+                actual.values,
+                simulator.get_exact_expectation_values(circuit, operator).values,
+                atol=1e-12,
+            )
+
+    def test_circuits_run_concurrently_are_not_lost_from_counters(self, circuitset):
+        simulator = _ConcurrentlyUsedSimulator()
+
+        simulator.get_wavefunctions(circuitset)
+
+        assert simulator.number_of_circuits_run == (
+            simulator.number_of_concurrent_circuits + len(circuitset)
+        )
+
+    def test_overridden_exact_expectation_values_are_used_for_circuitset(
+        self, circuitset
+    ):
+        simulator = _NativeExpectationValuesSimulator()
+        estimation_tasks = [
+            EstimationTask(QubitOperator("Z0") + QubitOperator("X1"), circuit, None)
+            for circuit in circuitset
+        ]
+
+        for expectation_values in calculate_exact_expectation_values(
+            simulator, estimation_tasks
+        ):
+            np.testing.assert_array_equal(expectation_values.values, [42.0, 42.0])